@@ -0,0 +1,42 @@
+from flask.ext.sqlalchemy import SQLAlchemy
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.pool import QueuePool
+
+# Engine options only understood by pools that limit their connections
+QUEUE_POOL_OPTIONS = ['max_overflow', 'pool_timeout']
+
+
+def ping_connection(dbapi_connection, connection_record, connection_proxy):
+    """Test each connection as it is checked out, so that the pool replaces it if the server has closed it"""
+    try:
+        cursor = dbapi_connection.cursor()
+        cursor.execute('SELECT 1')
+        cursor.close()
+    except Exception:
+        raise DisconnectionError()
+
+
+class Database(SQLAlchemy):
+    """
+    SQLAlchemy extension that connects with DATABASE_CONNECT_OPTIONS, pings connections on checkout when
+    DATABASE_POOL_PRE_PING is set, and records the checkouts of pools that limit their connections in the
+    instrumentation.
+    """
+
+    def apply_driver_hacks(self, app, info, options):
+        super(Database, self).apply_driver_hacks(app, info, options)
+
+        if app.config.get('DATABASE_CONNECT_OPTIONS'):
+            options['connect_args'] = dict(app.config.get('DATABASE_CONNECT_OPTIONS'))
+
+        if app.config.get('DATABASE_POOL_PRE_PING'):
+            options['pool_events'] = [(ping_connection, 'checkout')]
+
+        pool_class = options.get('poolclass') or info.get_dialect().get_pool_class(info)
+        if issubclass(pool_class, QueuePool):
+            # Imported here, since the instrumentation registers its request hooks on import
+            from application.instrumentation.InstrumentedQueuePool import InstrumentedQueuePool
+            options['poolclass'] = InstrumentedQueuePool
+        else:
+            for name in QUEUE_POOL_OPTIONS:
+                options.pop(name, None)
@@ -2,13 +2,17 @@ import logging
 
 # Import flask and template operators
 from flask import Flask
+from werkzeug.utils import import_string
 
-# Import SQLAlchemy
-from flask.ext.sqlalchemy import SQLAlchemy
+# Import SQLAlchemy, configured with the connection pool settings
+from application.Database import Database
 
 # Import configurations
 from config import env_config
 
+# Import the in-process cache
+from application.cache.LRUCache import LRUCache
+
 # Define the WSGI application object
 app = Flask(__name__)
 
@@ -17,35 +21,73 @@ app.config.from_object('config.base')
 app.config.from_object(env_config)
 
 # Define the database object which is imported by model and controllers
-db = SQLAlchemy(app)
-
-# Import view rendering
-from application.controllers import render_view
-
-# Specify 404 error handling
-@app.errorhandler(404)
-def not_found(error):
-    return render_view('404', 404, errors={error.__class__.__name__: [error.message]})
-
-# Import a module / component using its blueprint handler variable
-from application.controllers.Players import players_module
-from application.controllers.Games import games_module
-from application.controllers.Matches import matches_module
-from application.controllers.Words import words_module
-from application.controllers.DefinitionTemplates import definition_templates_module
-from application.controllers.DefinitionFillers import definition_fillers_module
-
-# Register blueprints
-app.register_blueprint(players_module)
-app.register_blueprint(games_module)
-app.register_blueprint(matches_module)
-app.register_blueprint(words_module)
-app.register_blueprint(definition_templates_module)
-app.register_blueprint(definition_fillers_module)
-
-# Build the database:
-# This will create the database using SQLAlchemy
-db.create_all()
+db = Database(app)
+
+# Define the cache of authenticated players, keyed by auth token, which is used by the before_request lookup
+auth_token_cache = LRUCache(app.config.get('AUTH_TOKEN_CACHE_SIZE'), app.config.get('AUTH_TOKEN_CACHE_TTL'))
+
+# Define the cache of current signed auth token generations, keyed by player id, used to reject revoked signed tokens
+auth_token_generation_cache = LRUCache(
+    app.config.get('AUTH_TOKEN_CACHE_SIZE'), app.config.get('AUTH_TOKEN_GENERATION_CACHE_TTL')
+)
+
+# Define the cache of serialized catalog records, keyed by class name and id
+serialization_cache = LRUCache(app.config.get('SERIALIZATION_CACHE_SIZE'), app.config.get('SERIALIZATION_CACHE_TTL'))
+
+# Define the cache of compiled definition templates, keyed by template id. Definitions are never edited in place,
+# so the entries do not expire
+definition_segments_cache = LRUCache(app.config.get('DEFINITION_SEGMENTS_CACHE_SIZE'), 0)
+
+# Blueprints registered by create_app, as import strings, so that importing the application does not import
+# every controller
+BLUEPRINTS = [
+    'application.controllers.Players:players_module',
+    'application.controllers.Games:games_module',
+    'application.controllers.Matches:matches_module',
+    'application.controllers.Words:words_module',
+    'application.controllers.DefinitionTemplates:definition_templates_module',
+    'application.controllers.DefinitionFillers:definition_fillers_module'
+]
+
+# Serves the aggregated request metrics of this process, if enabled
+STATS_BLUEPRINT = 'application.controllers.Stats:stats_module'
+
+# Whether create_app has registered the request hooks and blueprints
+is_app_created = False
+
+
+def create_app():
+    """
+    Register the request hooks, error handlers and blueprints on the application, the first time it is called, and
+    return the application. Nothing here connects to the database.
+    """
+    global is_app_created
+    if is_app_created:
+        return app
+
+    # Record the statement count and timings of each request, ahead of every other request hook
+    from application import instrumentation
+
+    # Import view rendering, which also registers the index route and the authentication hook
+    from application.controllers import render_view
+
+    # Specify 404 error handling
+    @app.errorhandler(404)
+    def not_found(error):
+        return render_view('404', 404, errors={error.__class__.__name__: [error.message]})
+
+    blueprints = list(BLUEPRINTS)
+    if app.config.get('INSTRUMENTATION_STATS_ENDPOINT_ENABLED'):
+        blueprints.append(STATS_BLUEPRINT)
+
+    for blueprint in blueprints:
+        app.register_blueprint(import_string(blueprint))
+
+    is_app_created = True
+    return app
+
+# The schema is not built here. It is created and upgraded by applying the migrations in application.migrations,
+# with `python migrate.py`
 
 logging.basicConfig()
 logging.getLogger('werkzeug').setLevel(logging.INFO)
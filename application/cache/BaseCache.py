@@ -0,0 +1,38 @@
+import abc
+
+
+class BaseCache(object):
+    """
+    Interface for the caches used by the application. Values should be plain data, such as record snapshots,
+    so that a cache shared between processes can store them as well as the in-process caches.
+    """
+    __metaclass__ = abc.ABCMeta
+
+    def __init__(self, max_size=1024, ttl=300):
+        self._max_size = max_size
+        self._ttl = ttl
+
+    def get_max_size(self):
+        return self._max_size
+
+    def get_ttl(self):
+        return self._ttl
+
+    @abc.abstractmethod
+    def get(self, key, default=None):
+        pass
+
+    @abc.abstractmethod
+    def set(self, key, value, ttl=None):
+        """Store the value for the ttl in seconds, defaulting to the cache's ttl, where a falsy ttl never expires"""
+
+    @abc.abstractmethod
+    def delete(self, key):
+        """Remove the key, returning True if it was cached"""
+
+    @abc.abstractmethod
+    def clear(self):
+        pass
+
+    def __contains__(self, key):
+        return self.get(key) is not None
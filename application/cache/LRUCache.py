@@ -0,0 +1,56 @@
+import time
+import threading
+
+from collections import OrderedDict
+
+from application.cache.BaseCache import BaseCache
+
+
+class LRUCache(BaseCache):
+    """
+    Thread safe in-process cache that expires entries after a time to live and
+    evicts the least recently used entry once the maximum size is reached.
+    """
+
+    def __init__(self, max_size=1024, ttl=300):
+        super(LRUCache, self).__init__(max_size, ttl)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                return default
+
+            # Re-insert the entry so that it becomes the most recently used
+            self._entries[key] = entry
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = ttl if ttl is not None else self._ttl
+        expires_at = time.time() + ttl if ttl else None
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, expires_at)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -12,7 +12,8 @@ from application.services.DefinitionFillersService import DefinitionFillersServi
 from application.services.DefinitionTemplatesService import DefinitionTemplatesService
 
 # Import view rendering
-from application.controllers import get_inputs, render_view, get_mixed_dict_from_multidict
+from application.controllers import get_inputs, render_view, get_mixed_dict_from_multidict, get_page_bounds, \
+    get_next_cursor_headers, is_stream_requested, render_stream
 
 # Define the blueprint
 definition_fillers_module = Blueprint('definition_fillers', __name__, url_prefix='/definition_fillers')
@@ -32,6 +33,9 @@ def index():
     {
         "offset": "offset",
         "limit": "limit",
+        "after_id": "after_id",
+        "before_id": "before_id",
+        "cursor": "cursor",
         "word_id": "word_id",
         "definition_template_id": "definition_template_id"
     }
@@ -49,12 +53,15 @@ def index():
         "inputs": {
             "offset": "value passed in. empty string if missing",
             "limit": "value passed in. empty string if missing",
+            "after_id": "value passed in. empty string if missing",
+            "before_id": "value passed in. empty string if missing",
+            "cursor": "value passed in. empty string if missing",
             "word_id": "value passed in. empty string if missing",
             "definition_template_id": "value passed in. empty string if missing"
         }
     }
 
-    Response [200] (success):
+    Response [200] (success, with an X-Next-Cursor header for the next page when the page is full):
     [
         {
             "id": "current value",
@@ -76,6 +83,9 @@ def index():
         },
         ...
     ]
+
+    Response [200] (success, when the Accept header prefers application/x-ndjson):
+    One definition filler per line, in the same form as above, written as the records are loaded
     """
     # Get the input validator
     inputs = ListInputs(get_inputs())
@@ -83,20 +93,33 @@ def index():
     # Verify the list inputs
     if inputs.validate():
 
+        after_id, before_id = get_page_bounds(inputs)
+        stream = is_stream_requested()
+
         if inputs.word_id.data:
             definition_fillers = DefinitionFillersService.get_instance().get_list_by_word(
-                inputs.word_id.data, inputs.limit.data, inputs.offset.data
+                inputs.word_id.data, inputs.limit.data, inputs.offset.data, after_id, before_id,
+                load_profile=DefinitionFillersService.LOAD_SERIALIZED, stream=stream
             )
         elif inputs.definition_template_id.data:
             definition_fillers = DefinitionFillersService.get_instance().get_list_by_definition_template(
-                inputs.definition_template_id.data, inputs.limit.data, inputs.offset.data
+                inputs.definition_template_id.data, inputs.limit.data, inputs.offset.data, after_id, before_id,
+                load_profile=DefinitionFillersService.LOAD_SERIALIZED, stream=stream
             )
         else:
-            definition_fillers = DefinitionFillersService.get_instance().get_list(inputs.limit.data, inputs.offset.data)
+            definition_fillers = DefinitionFillersService.get_instance().get_list(
+                inputs.limit.data, inputs.offset.data, after_id, before_id,
+                load_profile=DefinitionFillersService.LOAD_SERIALIZED, stream=stream
+            )
+
+        # Write each definition filler as a line of JSON as it is loaded
+        if stream:
+            return render_stream(definition_fillers)
 
         return render_view(
             'definition_fillers/index',
             200,
+            headers=get_next_cursor_headers(definition_fillers, inputs.limit.data),
             definition_fillers={
                 definition_filler.get_id(): definition_filler.serialized
                 for definition_filler in definition_fillers
@@ -242,7 +265,9 @@ def show(definition_filler_id):
     }
     """
     # Get the definition_filler
-    definition_filler = DefinitionFillersService.get_instance().get(definition_filler_id)
+    definition_filler = DefinitionFillersService.get_instance().get(
+        definition_filler_id, load_profile=DefinitionFillersService.LOAD_SERIALIZED
+    )
 
     if definition_filler:
         return render_view('definition_fillers/show', 200, definition_filler=definition_filler.serialized)
@@ -12,7 +12,8 @@ from application.services.WordsService import WordsService
 from application.services.DefinitionTemplatesService import DefinitionTemplatesService
 
 # Import view rendering
-from application.controllers import get_inputs, render_view, get_mixed_dict_from_multidict
+from application.controllers import get_inputs, render_view, get_mixed_dict_from_multidict, get_page_bounds, \
+    get_next_cursor_headers, is_stream_requested, render_stream
 
 # Define the blueprint
 definition_templates_module = Blueprint('definition_templates', __name__, url_prefix='/definition_templates')
@@ -30,6 +31,9 @@ def index():
     {
         "offset": "offset",
         "limit": "limit",
+        "after_id": "after_id",
+        "before_id": "before_id",
+        "cursor": "cursor",
         "word_id": "word_id"
     }
 
@@ -46,11 +50,14 @@ def index():
         "inputs": {
             "offset": "value passed in. empty string if missing",
             "limit": "value passed in. empty string if missing",
+            "after_id": "value passed in. empty string if missing",
+            "before_id": "value passed in. empty string if missing",
+            "cursor": "value passed in. empty string if missing",
             "word_id": "value passed in. empty string if missing"
         }
     }
 
-    Response [200] (success):
+    Response [200] (success, with an X-Next-Cursor header for the next page when the page is full):
     [
         {
             "id": "current value",
@@ -72,6 +79,9 @@ def index():
         },
         ...
     ]
+
+    Response [200] (success, when the Accept header prefers application/x-ndjson):
+    One definition template per line, in the same form as above, written as the records are loaded
     """
     # Get the input validator
     inputs = ListInputs(get_inputs())
@@ -79,18 +89,28 @@ def index():
     # Verify the list inputs
     if inputs.validate():
 
+        after_id, before_id = get_page_bounds(inputs)
+        stream = is_stream_requested()
+
         if inputs.word_id.data:
             definition_templates = DefinitionTemplatesService.get_instance().get_list_by_word(
-                inputs.word_id.data, inputs.limit.data, inputs.offset.data
+                inputs.word_id.data, inputs.limit.data, inputs.offset.data, after_id, before_id,
+                load_profile=DefinitionTemplatesService.LOAD_SERIALIZED, stream=stream
             )
         else:
             definition_templates = DefinitionTemplatesService.get_instance().get_list(
-                inputs.limit.data, inputs.offset.data
+                inputs.limit.data, inputs.offset.data, after_id, before_id,
+                load_profile=DefinitionTemplatesService.LOAD_SERIALIZED, stream=stream
             )
 
+        # Write each definition template as a line of JSON as it is loaded
+        if stream:
+            return render_stream(definition_templates)
+
         return render_view(
             'definition_templates/index',
             200,
+            headers=get_next_cursor_headers(definition_templates, inputs.limit.data),
             definition_templates={
                 definition_template.get_id(): definition_template.serialized
                 for definition_template in definition_templates
@@ -246,7 +266,9 @@ def show(definition_template_id):
     }
     """
     # Get the definition_template
-    definition_template = DefinitionTemplatesService.get_instance().get(definition_template_id)
+    definition_template = DefinitionTemplatesService.get_instance().get(
+        definition_template_id, load_profile=DefinitionTemplatesService.LOAD_SERIALIZED
+    )
 
     if definition_template:
         return render_view('definition_templates/show', 200, definition_template=definition_template.serialized)
@@ -11,7 +11,8 @@ from application.models.Game import Game
 from application.services.GamesService import GamesService
 
 # Import view rendering
-from application.controllers import get_inputs, render_view, get_mixed_dict_from_multidict
+from application.controllers import get_inputs, render_view, get_mixed_dict_from_multidict, get_page_bounds, \
+    get_next_cursor_headers
 
 # Define the blueprint
 games_module = Blueprint('games', __name__, url_prefix='/games')
@@ -27,7 +28,10 @@ def index():
     Request:
     {
         "offset": "offset",
-        "limit": "limit"
+        "limit": "limit",
+        "after_id": "after_id",
+        "before_id": "before_id",
+        "cursor": "cursor"
     }
 
     Response [422] (invalid parameters):
@@ -42,11 +46,14 @@ def index():
         },
         "inputs": {
             "offset": "value passed in. empty string if missing",
-            "limit": "value passed in. empty string if missing"
+            "limit": "value passed in. empty string if missing",
+            "after_id": "value passed in. empty string if missing",
+            "before_id": "value passed in. empty string if missing",
+            "cursor": "value passed in. empty string if missing"
         }
     }
 
-    Response [200] (success):
+    Response [200] (success, with an X-Next-Cursor header for the next page when the page is full):
     [
         {
             "id": "current value",
@@ -77,9 +84,15 @@ def index():
     # Verify the list inputs
     if inputs.validate():
 
-        games = GamesService.get_instance().get_list(inputs.limit.data, inputs.offset.data)
+        after_id, before_id = get_page_bounds(inputs)
+        games = GamesService.get_instance().get_list(inputs.limit.data, inputs.offset.data, after_id, before_id)
 
-        return render_view('games/index', 200, games={game.get_id(): game.serialized for game in games})
+        return render_view(
+            'games/index',
+            200,
+            headers=get_next_cursor_headers(games, inputs.limit.data),
+            games={game.get_id(): game.serialized for game in games}
+        )
 
     return render_view('422', 422, errors=inputs.errors, inputs=inputs.serialized())
 
@@ -12,11 +12,10 @@ from application.services.GamesService import GamesService
 from application.services.PlayersService import PlayersService
 from application.services.MatchesService import MatchesService
 from application.services.TurnsService import TurnsService
-from application.services.TurnPlayersService import TurnPlayersService
-from application.services.TurnDefinitionFillersService import TurnDefinitionFillersService
 
 # Import view rendering
-from application.controllers import get_inputs, render_view, authenticate, get_current_user
+from application.controllers import get_inputs, render_view, authenticate, get_current_user, get_current_user_id, \
+    get_page_bounds, get_next_cursor_headers, UNAUTHORIZED_ERROR
 
 # Define the blueprint
 matches_module = Blueprint('matches', __name__, url_prefix='/matches')
@@ -37,11 +36,18 @@ def index():
 
     # Verify the list inputs
     if inputs.validate():
+        after_id, before_id = get_page_bounds(inputs)
         matches = MatchesService.get_instance().get_list_by_game_for_player(
-            inputs.game_id.data, get_current_user().get_id(), inputs.limit.data, inputs.offset.data
+            inputs.game_id.data, get_current_user_id(), inputs.limit.data, inputs.offset.data, after_id, before_id,
+            load_profile=MatchesService.LOAD_SERIALIZED
         )
 
-        return render_view('matches/index', 200, matches={match.get_id(): match.serialized for match in matches})
+        return render_view(
+            'matches/index',
+            200,
+            headers=get_next_cursor_headers(matches, inputs.limit.data),
+            matches={match.get_id(): match.serialized for match in matches}
+        )
 
     return render_view('422', 422, errors=inputs.errors, inputs=inputs.serialized())
 
@@ -55,43 +61,46 @@ def create():
 
     # Verify the match creation inputs
     if inputs.validate_on_submit():
+        # Load the current player along with the opponent, if one is specified, in one query
+        player_ids = [get_current_user_id()]
+        if inputs.opponent_id.data:
+            player_ids.append(inputs.opponent_id.data)
+        players, missing_player_ids = PlayersService.get_instance().get_many(player_ids)
+
+        # The current player is checked against its auth token, which may have been revoked since it was issued
+        player = get_current_user()
+        if not player:
+            return render_view('422', 422, errors=UNAUTHORIZED_ERROR)
+
         # Ensure we have a valid game
         game = GamesService.get_instance().get(inputs.game_id.data)
         if game:
             # If an opponent is specified, match with that opponent
             if inputs.opponent_id.data:
                 # Ensure that the opponent is a valid user
-                opponent = PlayersService.get_instance().get(inputs.opponent_id.data)
-                if not opponent:
+                if inputs.opponent_id.data in missing_player_ids:
                     return render_view('422', 422, errors=OPPONENT_NOT_FOUND_ERROR, inputs=inputs.serialized())
+                opponent = {record.get_id(): record for record in players}[inputs.opponent_id.data]
 
-                # First attempt to find a match already requested by the desired opponent
-                match = MatchesService.get_instance().get_opponent_match(
-                    game.get_id(), get_current_user(), opponent.get_id()
-                )
-
-                # If the match is found, add the player to it and start the match if it's full
-                if match:
-                    match.add_player(get_current_user())
+                # First attempt to claim a seat in a match already requested by the desired opponent,
+                # which also starts the match if it's now full
+                match = MatchesService.get_instance().join_opponent_match(game.get_id(), player, opponent.get_id())
 
-                # If no match is found, create one that is assigned to the desired opponent,
+                # If no match has an open seat, create one that is assigned to the desired opponent,
                 # but leave it in the waiting state
-                else:
-                    match = Match(game, get_current_user())
+                if not match:
+                    match = Match(game, player)
                     match.add_player(opponent, should_start=False)
 
             # Otherwise, match with a random opponent
             else:
-                # First, attempt to find a match that is looking for an opponent
-                match = MatchesService.get_instance().get_random_match(game.get_id(), get_current_user())
+                # First, attempt to claim a seat in a match that is looking for an opponent,
+                # which also starts the match if it's now full
+                match = MatchesService.get_instance().join_random_match(game.get_id(), player)
 
-                # If the match is found, add the player to it and start the match if it's full
-                if match:
-                    match.add_player(get_current_user())
-
-                # If no match is found, create one that is waiting for an opponent
-                else:
-                    match = Match(game, get_current_user())
+                # If no match has an open seat, create one that is waiting for an opponent
+                if not match:
+                    match = Match(game, player)
 
             try:
                 match.save()
@@ -108,16 +117,12 @@ def create():
 @matches_module.route('/<int:match_id>', methods=['GET'])
 @authenticate
 def show(match_id):
-    # Get the current turn
-    turn, errors = TurnsService.get_instance().get_player_turn(match_id, get_current_user().get_id())
+    # Get the current turn, along with this player's turn_player and the turn_definition_fillers for the turn
+    turn_state, errors = TurnsService.get_instance().get_player_turn(match_id, get_current_user_id())
 
     if not errors:
-        turn_player = TurnPlayersService.get_instance().get_for_turn_by_player(
-            turn.get_id(), get_current_user().get_id()
-        )
-
-        # Get the turn_definition_fillers for this turn
-        turn_definition_fillers = TurnDefinitionFillersService.get_instance().get_list_by_turn(turn.get_id())
+        turn, turn_player, turn_definition_fillers = turn_state
+        match = turn.get_match()
 
         # If this player is the selector for this turn
         if turn_player.get_is_selector():
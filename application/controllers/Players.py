@@ -15,7 +15,7 @@ from application.services.PlayersService import PlayersService
 
 # Import view rendering
 from application.controllers import get_inputs, render_view, authenticate, \
-    get_current_user, get_mixed_dict_from_multidict
+    get_current_user, get_mixed_dict_from_multidict, get_page_bounds, get_next_cursor_headers
 
 # Define the blueprint
 players_module = Blueprint('players', __name__, url_prefix='/players')
@@ -34,7 +34,10 @@ def index():
     Request:
     {
         "offset": "offset",
-        "limit": "limit"
+        "limit": "limit",
+        "after_id": "after_id",
+        "before_id": "before_id",
+        "cursor": "cursor"
     }
 
     Response [422] (invalid parameters):
@@ -49,11 +52,14 @@ def index():
         },
         "inputs": {
             "offset": "value passed in. empty string if missing",
-            "limit": "value passed in. empty string if missing"
+            "limit": "value passed in. empty string if missing",
+            "after_id": "value passed in. empty string if missing",
+            "before_id": "value passed in. empty string if missing",
+            "cursor": "value passed in. empty string if missing"
         }
     }
 
-    Response [200] (success):
+    Response [200] (success, with an X-Next-Cursor header for the next page when the page is full):
     [
         {
             "id": "current value",
@@ -82,9 +88,15 @@ def index():
     # Verify the list inputs
     if inputs.validate():
 
-        players = PlayersService.get_instance().get_list(inputs.limit.data, inputs.offset.data)
+        after_id, before_id = get_page_bounds(inputs)
+        players = PlayersService.get_instance().get_list(inputs.limit.data, inputs.offset.data, after_id, before_id)
 
-        return render_view('players/index', 200, players={player.get_id(): player.serialized for player in players})
+        return render_view(
+            'players/index',
+            200,
+            headers=get_next_cursor_headers(players, inputs.limit.data),
+            players={player.get_id(): player.serialized for player in players}
+        )
 
     return render_view('422', 422, errors=inputs.errors, inputs=inputs.obfuscated())
 
@@ -0,0 +1,86 @@
+# Import flask dependencies
+from flask import Blueprint
+
+# Import the database and its connection pool
+from application import db
+
+# Import the instrumentation aggregates
+from application.instrumentation import endpoint_stats, pool_stats
+
+# Import view rendering
+from application.controllers import render_view, authenticate
+
+# Define the blueprint
+stats_module = Blueprint('stats', __name__, url_prefix='/stats')
+
+
+# Set the route and accepted methods
+@stats_module.route('', methods=['GET'])
+def index():
+    """
+    Request:
+    {}
+
+    Response [200] (success, aggregated over every request served by this process since it started or was reset):
+    {
+        "METHOD /url/rule": {
+            "requests": "number of requests served",
+            "mean_queries": "mean number of SQL statements per request",
+            "max_queries": "largest number of SQL statements issued by one request",
+            "mean_db_ms": "mean time spent executing SQL statements per request",
+            "max_db_ms": "longest time spent executing SQL statements by one request",
+            "mean_pool_ms": "mean time spent waiting for a database connection per request",
+            "max_pool_ms": "longest time spent waiting for a database connection by one request",
+            "mean_serialize_ms": "mean time spent encoding JSON per request",
+            "max_serialize_ms": "longest time spent encoding JSON by one request",
+            "mean_template_ms": "mean time spent rendering templates per request",
+            "max_template_ms": "longest time spent rendering templates by one request",
+            "mean_total_ms": "mean time spent serving a request",
+            "max_total_ms": "longest time spent serving one request"
+        },
+        ...
+    }
+    """
+    return render_view('stats/index', 200, stats=endpoint_stats.get_stats())
+
+
+# Set the route and accepted methods
+@stats_module.route('/pool', methods=['GET'])
+def pool():
+    """
+    Request:
+    {}
+
+    Response [200] (success, aggregated over every connection checked out by this process since it started or was
+    reset, along with the current state of the pool, if it limits its connections):
+    {
+        "checkouts": "number of connections checked out of the pool",
+        "mean_wait_ms": "mean time spent waiting for a connection per checkout",
+        "max_wait_ms": "longest time spent waiting for a connection",
+        "max_checked_out": "most connections in use at once",
+        "overflows": "number of checkouts that opened a connection beyond the pool size",
+        "timeouts": "number of checkouts that gave up waiting for a connection",
+        "size": "number of connections the pool keeps",
+        "checked_out": "number of connections in use",
+        "overflow": "number of connections open beyond the pool size"
+    }
+    """
+    return render_view('stats/pool', 200, stats=pool_stats.get_stats(db.engine.pool))
+
+
+# Set the route and accepted methods
+@stats_module.route('', methods=['DELETE'])
+@authenticate
+def delete():
+    """
+    Request:
+    {
+        "auth_token": "auth_token"
+    }
+
+    Response [200] (success, the request and connection pool aggregates are reset):
+    {}
+    """
+    endpoint_stats.clear()
+    pool_stats.clear()
+    return render_view('stats/index', 200, stats={})
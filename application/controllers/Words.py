@@ -1,5 +1,5 @@
 # Import flask dependencies
-from flask import Blueprint
+from flask import Blueprint, request
 
 # Import input validators
 from application.inputs.Words import ListInputs, CreateInputs, UpdateInputs
@@ -9,9 +9,11 @@ from application.models.Word import Word
 
 # Import services
 from application.services.WordsService import WordsService
+from application.services.DictionaryImportService import DictionaryImportService
 
 # Import view rendering
-from application.controllers import get_inputs, render_view, get_mixed_dict_from_multidict
+from application.controllers import get_inputs, render_view, authenticate, get_mixed_dict_from_multidict, \
+    get_page_bounds, get_next_cursor_headers, is_stream_requested, render_stream, CSV_MIMETYPE
 
 # Define the blueprint
 words_module = Blueprint('words', __name__, url_prefix='/words')
@@ -29,9 +31,22 @@ def index():
     # Verify the list inputs
     if inputs.validate():
 
-        words = WordsService.get_instance().get_list(inputs.limit.data, inputs.offset.data)
+        after_id, before_id = get_page_bounds(inputs)
 
-        return render_view('words/index', 200, words={word.get_id(): word.serialized for word in words})
+        # Write each word as a line of JSON as it is loaded
+        if is_stream_requested():
+            return render_stream(WordsService.get_instance().get_list(
+                inputs.limit.data, inputs.offset.data, after_id, before_id, stream=True
+            ))
+
+        words = WordsService.get_instance().get_list(inputs.limit.data, inputs.offset.data, after_id, before_id)
+
+        return render_view(
+            'words/index',
+            200,
+            headers=get_next_cursor_headers(words, inputs.limit.data),
+            words={word.get_id(): word.serialized for word in words}
+        )
 
     return render_view('422', 422, errors=inputs.errors, inputs=inputs.serialized())
 
@@ -55,6 +70,23 @@ def create():
     return render_view('422', 422, errors=inputs.errors, inputs=inputs.serialized())
 
 
+# Set the route and accepted methods
+@words_module.route('/import', methods=['POST'])
+@authenticate
+def bulk_import():
+    # Read the entries straight from the request body, as CSV if it is labelled as such and NDJSON otherwise
+    input_format = DictionaryImportService.FORMAT_CSV \
+        if request.mimetype == CSV_MIMETYPE else DictionaryImportService.FORMAT_NDJSON
+
+    try:
+        # Each batch is committed as it is written, so if a batch fails, the batches before it are reported as imported
+        imported, errors = DictionaryImportService.get_instance().import_lines(request.stream, input_format)
+        status = 422 if DictionaryImportService.has_failed_batch(errors) else 201
+        return render_view('words/import', status, imported=imported, errors=errors)
+    except Exception as e:
+        return render_view('422', 422, errors={e.__class__.__name__: [e.message]})
+
+
 # Set the route and accepted methods
 @words_module.route('/<int:word_id>', methods=['GET'])
 def show(word_id):
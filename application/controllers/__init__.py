@@ -1,14 +1,42 @@
-from flask import render_template, request, g
+from flask import render_template, request, g, json, Response, stream_with_context
 from functools import wraps
 
+# Use the faster JSON encoder for API responses when it is installed
+try:
+    import ujson as json_encoder
+except ImportError:
+    import json as json_encoder
+
 from werkzeug.datastructures import MultiDict, ImmutableMultiDict, CombinedMultiDict
 
+from application.instrumentation import timed
+from application.models.Player import Player
+from application.services.BaseService import BaseService
 from application.services.PlayersService import PlayersService
 from application import app
 
 
 UNAUTHORIZED_ERROR = {'UnauthorizedAccess': ['Attempted to access data without an authenticated player']}
 
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+# Index views stream one record per line of JSON when this is the preferred response type
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+CSV_MIMETYPE = 'text/csv'
+
+# Request bodies of the dictionary imports, which are answered with JSON views like JSON requests
+IMPORT_MIMETYPES = [NDJSON_MIMETYPE, CSV_MIMETYPE]
+
+# JSON views that are an object built from several view variables, mapped to their (required, optional) variables.
+# Optional variables are left out when empty, and every other JSON view is the value of its only variable.
+JSON_OBJECT_VIEWS = {
+    'index': ([], []),
+    '404': (['errors'], []),
+    '422': (['errors'], ['inputs']),
+    'words/import': (['imported', 'errors'], [])
+}
+
 
 def is_json_input_valid():
     return request.mimetype == 'application/json' and request.method != 'GET'
@@ -68,23 +96,95 @@ def get_mixed_dict_from_multidict(multidict, inputs=None):
         return result
 
 
-def render_view(template, code, **variables):
-    if request.content_type == 'application/json':
-        return render_template_type(template, 'json', code, 'application/json', variables)
+def get_page_bounds(inputs):
+    """
+    Returns the (after_id, before_id) keyset bounds requested through the list inputs,
+    where an opaque cursor from a previous page takes the place of after_id.
+    """
+    after_id = inputs.after_id.data
+    if inputs.cursor.data:
+        after_id = BaseService.decode_cursor(inputs.cursor.data)
+
+    return after_id, inputs.before_id.data
+
+
+def get_next_cursor_headers(records, limit):
+    # Only a full page can be followed by another one
+    if limit and len(records) == limit:
+        return {NEXT_CURSOR_HEADER: BaseService.encode_cursor(records[-1].get_id())}
+
+    return {}
+
+
+def render_view(template, code, headers=None, **variables):
+    if request.content_type == 'application/json' or request.mimetype in IMPORT_MIMETYPES:
+        return render_json(template, code, variables, headers)
+    else:
+        variables['user_logged_in'] = get_user_logged_in()
+        return render_template_type(template, 'html', code, 'text/html', variables, headers)
+
+
+def render_json(template, code, variables, headers=None):
+    """Encode the view variables directly, skipping the lookup and rendering of the template's JSON form"""
+    if template in JSON_OBJECT_VIEWS:
+        required_variables, optional_variables = JSON_OBJECT_VIEWS.get(template)
+        payload = {name: variables.get(name) for name in required_variables}
+        payload.update({name: variables.get(name) for name in optional_variables if variables.get(name)})
+    elif len(variables) == 1:
+        payload = variables.values()[0]
     else:
-        variables['user_logged_in'] = g.user_logged_in
-        return render_template_type(template, 'html', code, 'text/html', variables)
+        # Views without a direct JSON form still go through their template
+        return render_template_type(template, 'json', code, 'application/json', variables, headers)
+
+    return encode_json(payload), code, get_response_headers('application/json', headers)
+
+
+def encode_json(payload):
+    with timed('serialize'):
+        try:
+            return json_encoder.dumps(payload)
+        except (TypeError, ValueError, OverflowError):
+            # Fall back to Flask's encoder for values the plain encoders do not support, such as UUID auth tokens
+            return json.dumps(payload)
+
 
+def render_template_type(template, extension, code, content_type, variables, headers=None):
+    with timed('template'):
+        body = render_template('{}.{}'.format(template, extension), **variables)
 
-def render_template_type(template, extension, code, content_type, variables):
-    return (
-        render_template('{}.{}'.format(template, extension), **variables),
-        code,
-        {'Content-Type': '{}; charset=utf-8'.format(content_type)}
-    )
+    return body, code, get_response_headers(content_type, headers)
+
+
+def get_response_headers(content_type, headers=None):
+    response_headers = {'Content-Type': '{}; charset=utf-8'.format(content_type)}
+    if headers:
+        response_headers.update(headers)
+
+    return response_headers
+
+
+def is_stream_requested():
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def render_stream(records, headers=None):
+    """
+    Write each record as a line of JSON as soon as it is loaded, rather than rendering the whole list in one piece.
+    The records should come from a streaming service list, so they are fetched from the database as they are written.
+    """
+    def generate():
+        for record in records:
+            yield encode_json(record.serialized) + '\n'
+
+    # Keep the request context, and with it the database session, open until the last record is written
+    return Response(stream_with_context(generate()), 200, get_response_headers(NDJSON_MIMETYPE, headers))
 
 
 def get_current_user():
+    # Players authenticated with a signed auth token are only loaded once a handler needs the record
+    if not hasattr(g, 'current_user') and hasattr(g, 'signed_auth_payload'):
+        set_current_user(PlayersService.get_instance().get_from_signed_auth_payload(g.signed_auth_payload))
+
     if hasattr(g, 'current_user'):
         return g.current_user
     return None
@@ -94,6 +194,20 @@ def set_current_user(current_user):
     g.current_user = current_user
 
 
+def get_current_user_id():
+    if hasattr(g, 'current_user_id'):
+        return g.current_user_id
+    return None
+
+
+def set_current_user_id(current_user_id):
+    g.current_user_id = current_user_id
+
+
+def set_signed_auth_payload(signed_auth_payload):
+    g.signed_auth_payload = signed_auth_payload
+
+
 def get_user_logged_in():
     if hasattr(g, 'user_logged_in'):
         return g.user_logged_in
@@ -115,17 +229,26 @@ def index():
 def before_request():
     params = get_inputs()
     if params.get('auth_token'):
-        player = PlayersService.get_instance().get_from_auth(params.get('auth_token'))
-        if player:
-            set_current_user(player)
-            set_user_logged_in(True)
-            unset_input('auth_token')
+        if Player.is_signed_auth_token_mode():
+            payload = PlayersService.get_instance().get_signed_auth_payload(params.get('auth_token'))
+            if payload:
+                set_signed_auth_payload(payload)
+                set_current_user_id(payload.get('id'))
+                set_user_logged_in(True)
+                unset_input('auth_token')
+        else:
+            player = PlayersService.get_instance().get_from_auth(params.get('auth_token'))
+            if player:
+                set_current_user(player)
+                set_current_user_id(player.get_id())
+                set_user_logged_in(True)
+                unset_input('auth_token')
 
 
 def authenticate(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
-        if not get_current_user():
+        if not get_current_user_id():
             return render_view('422', 422, errors=UNAUTHORIZED_ERROR)
 
         return f(*args, **kwargs)
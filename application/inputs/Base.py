@@ -1,6 +1,24 @@
 # Import Form for input validation
 from flask.ext.wtf import Form
 
+# Import validation error for custom validators
+from wtforms.validators import ValidationError
+
+# Import the Base service for cursor decoding
+from application.services.BaseService import BaseService
+
+
+# Define the validator for opaque pagination cursors
+class ValidCursor(object):
+    def __init__(self, message=None):
+        self.message = message if message else 'Invalid pagination cursor'
+
+    def __call__(self, form, field):
+        try:
+            BaseService.decode_cursor(field.data)
+        except ValueError:
+            raise ValidationError(self.message)
+
 
 class Base(Form):
     def obfuscated(self):
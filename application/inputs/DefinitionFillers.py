@@ -1,11 +1,11 @@
 # Import input types such as TextField
-from wtforms import IntegerField, BooleanField, SelectMultipleField
+from wtforms import StringField, IntegerField, BooleanField, SelectMultipleField
 
 # Import input validators
 from wtforms.validators import InputRequired, NumberRange, Optional
 
 # Import Base inputs class
-from application.inputs.Base import Base
+from application.inputs.Base import Base, ValidCursor
 
 
 # Define the definition filler list inputs
@@ -20,6 +20,21 @@ class ListInputs(Base):
         [Optional(), NumberRange(min=0)]
     )
 
+    after_id = IntegerField(
+        'After ID',
+        [Optional(), NumberRange(min=1)]
+    )
+
+    before_id = IntegerField(
+        'Before ID',
+        [Optional(), NumberRange(min=1)]
+    )
+
+    cursor = StringField(
+        'Cursor',
+        [Optional(), ValidCursor()]
+    )
+
     word_id = IntegerField(
         'Word ID',
         [Optional(), NumberRange(min=1)]
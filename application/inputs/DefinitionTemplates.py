@@ -5,7 +5,7 @@ from wtforms import StringField, IntegerField, BooleanField, SelectMultipleField
 from wtforms.validators import InputRequired, Length, NumberRange, Optional
 
 # Import Base inputs class
-from application.inputs.Base import Base
+from application.inputs.Base import Base, ValidCursor
 
 # Import the Definition Template and Word models
 from application.models.DefinitionTemplate import DefinitionTemplate
@@ -24,6 +24,21 @@ class ListInputs(Base):
         [Optional(), NumberRange(min=0)]
     )
 
+    after_id = IntegerField(
+        'After ID',
+        [Optional(), NumberRange(min=1)]
+    )
+
+    before_id = IntegerField(
+        'Before ID',
+        [Optional(), NumberRange(min=1)]
+    )
+
+    cursor = StringField(
+        'Cursor',
+        [Optional(), ValidCursor()]
+    )
+
     word_id = IntegerField(
         'Word ID',
         [Optional(), NumberRange(min=1)]
@@ -5,7 +5,7 @@ from wtforms import StringField, IntegerField, BooleanField
 from wtforms.validators import InputRequired, Length, NumberRange, Optional
 
 # Import Base inputs class
-from application.inputs.Base import Base
+from application.inputs.Base import Base, ValidCursor
 
 # Import the Game model
 from application.models.Game import Game
@@ -23,6 +23,21 @@ class ListInputs(Base):
         [Optional(), NumberRange(min=0)]
     )
 
+    after_id = IntegerField(
+        'After ID',
+        [Optional(), NumberRange(min=1)]
+    )
+
+    before_id = IntegerField(
+        'Before ID',
+        [Optional(), NumberRange(min=1)]
+    )
+
+    cursor = StringField(
+        'Cursor',
+        [Optional(), ValidCursor()]
+    )
+
 
 # Define the game creation inputs
 class CreateInputs(Base):
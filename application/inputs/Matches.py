@@ -1,11 +1,11 @@
 # Import input types such as TextField
-from wtforms import IntegerField
+from wtforms import StringField, IntegerField
 
 # Import input validators
 from wtforms.validators import InputRequired, NumberRange, Optional
 
 # Import Base inputs class
-from application.inputs.Base import Base
+from application.inputs.Base import Base, ValidCursor
 
 
 # Define the match list inputs
@@ -28,6 +28,21 @@ class ListInputs(Base):
         [Optional(), NumberRange(min=0)]
     )
 
+    after_id = IntegerField(
+        'After ID',
+        [Optional(), NumberRange(min=1)]
+    )
+
+    before_id = IntegerField(
+        'Before ID',
+        [Optional(), NumberRange(min=1)]
+    )
+
+    cursor = StringField(
+        'Cursor',
+        [Optional(), ValidCursor()]
+    )
+
 
 # Define the match creation inputs
 class CreateInputs(Base):
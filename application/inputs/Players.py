@@ -5,7 +5,7 @@ from wtforms import StringField, PasswordField, IntegerField, BooleanField
 from wtforms.validators import InputRequired, EqualTo, Length, NumberRange, Optional, Email, URL
 
 # Import Base inputs class
-from application.inputs.Base import Base
+from application.inputs.Base import Base, ValidCursor
 
 # Import the Player model
 from application.models.Player import Player
@@ -23,6 +23,21 @@ class ListInputs(Base):
         [Optional(), NumberRange(min=0)]
     )
 
+    after_id = IntegerField(
+        'After ID',
+        [Optional(), NumberRange(min=1)]
+    )
+
+    before_id = IntegerField(
+        'Before ID',
+        [Optional(), NumberRange(min=1)]
+    )
+
+    cursor = StringField(
+        'Cursor',
+        [Optional(), ValidCursor()]
+    )
+
 
 # Define the player creation inputs
 class CreateInputs(Base):
@@ -0,0 +1,59 @@
+import threading
+
+
+class EndpointStats(object):
+    """
+    Thread safe in-process aggregate of the query counts and timings recorded for each endpoint. Times are
+    recorded in seconds and reported in milliseconds.
+    """
+
+    TIMINGS = ['db', 'pool', 'serialize', 'template', 'total']
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, query_count, timings):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {
+                    'requests': 0,
+                    'queries': 0,
+                    'max_queries': 0,
+                    'times': {name: 0.0 for name in self.TIMINGS},
+                    'max_times': {name: 0.0 for name in self.TIMINGS}
+                }
+
+            stats['requests'] += 1
+            stats['queries'] += query_count
+            stats['max_queries'] = max(stats['max_queries'], query_count)
+            for name in self.TIMINGS:
+                stats['times'][name] += timings.get(name, 0.0)
+                stats['max_times'][name] = max(stats['max_times'][name], timings.get(name, 0.0))
+
+    def get_stats(self):
+        """Return the per request means and maximums for each endpoint that has served a request"""
+        with self._lock:
+            return {endpoint: self._summarize(stats) for endpoint, stats in self._endpoints.iteritems()}
+
+    @staticmethod
+    def _summarize(stats):
+        requests = stats['requests']
+        summary = {
+            'requests': requests,
+            'mean_queries': float(stats['queries']) / requests,
+            'max_queries': stats['max_queries']
+        }
+        for name, total in stats['times'].iteritems():
+            summary['mean_{}_ms'.format(name)] = round(total / requests * 1000, 3)
+            summary['max_{}_ms'.format(name)] = round(stats['max_times'][name] * 1000, 3)
+
+        return summary
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def __len__(self):
+        return len(self._endpoints)
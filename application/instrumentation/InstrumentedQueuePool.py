@@ -0,0 +1,38 @@
+import threading
+import time
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+
+from application.instrumentation import is_enabled, pool_stats, record_time
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waited for a connection, in the pool aggregate and in the
+    current request's timings, along with the connections in use and whether the pool had to overflow.
+    """
+
+    def __init__(self, creator, **kwargs):
+        super(InstrumentedQueuePool, self).__init__(creator, **kwargs)
+        self._checkout = threading.local()
+
+    def _do_get(self):
+        # The queue retries by calling _do_get again, which is part of the same checkout
+        if getattr(self._checkout, 'started_at', None) is not None or not is_enabled():
+            return super(InstrumentedQueuePool, self)._do_get()
+
+        started_at = self._checkout.started_at = time.time()
+        overflow = self._overflow
+        try:
+            connection = super(InstrumentedQueuePool, self)._do_get()
+        except TimeoutError:
+            pool_stats.record_timeout(time.time() - started_at)
+            raise
+        finally:
+            self._checkout.started_at = None
+
+        wait = time.time() - started_at
+        record_time('pool', wait)
+        pool_stats.record_checkout(wait, self.checkedout(), self._overflow > max(overflow, 0))
+        return connection
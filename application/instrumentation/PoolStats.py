@@ -0,0 +1,58 @@
+import threading
+
+
+class PoolStats(object):
+    """
+    Thread safe in-process aggregate of the connections checked out of the database connection pool: how long each
+    checkout waited for a connection, the most connections in use at once, and how often the pool had to overflow or
+    gave up waiting. Times are recorded in seconds and reported in milliseconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._checkouts = 0
+        self._wait = 0.0
+        self._max_wait = 0.0
+        self._max_checked_out = 0
+        self._overflows = 0
+        self._timeouts = 0
+
+    def record_checkout(self, wait, checked_out, overflowed):
+        with self._lock:
+            self._checkouts += 1
+            self._wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._max_checked_out = max(self._max_checked_out, checked_out)
+            if overflowed:
+                self._overflows += 1
+
+    def record_timeout(self, wait):
+        with self._lock:
+            self._timeouts += 1
+            self._max_wait = max(self._max_wait, wait)
+
+    def get_stats(self, pool=None):
+        """Return the aggregate, along with the current state of the pool if it limits its connections"""
+        with self._lock:
+            stats = {
+                'checkouts': self._checkouts,
+                'mean_wait_ms': round(self._wait / self._checkouts * 1000, 3) if self._checkouts else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 3),
+                'max_checked_out': self._max_checked_out,
+                'overflows': self._overflows,
+                'timeouts': self._timeouts
+            }
+
+        if hasattr(pool, 'checkedout'):
+            stats['size'] = pool.size()
+            stats['checked_out'] = pool.checkedout()
+            stats['overflow'] = max(pool.overflow(), 0)
+
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._reset()
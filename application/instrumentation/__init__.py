@@ -0,0 +1,116 @@
+import time
+
+from contextlib import contextmanager
+
+from flask import g, request, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from application import app
+from application.instrumentation.EndpointStats import EndpointStats
+from application.instrumentation.PoolStats import PoolStats
+
+SERVER_TIMING_HEADER = 'Server-Timing'
+
+# Requests that did not match a route are aggregated together under this endpoint
+UNMATCHED_ENDPOINT = '<unmatched>'
+
+# Aggregate of every instrumented request served by this process
+endpoint_stats = EndpointStats()
+
+# Aggregate of every connection this process checked out of its database connection pool
+pool_stats = PoolStats()
+
+
+def is_enabled():
+    return app.config.get('INSTRUMENTATION_ENABLED', False)
+
+
+def get_request_metrics():
+    """Return the metrics of the current request, or None outside of an instrumented request"""
+    if not has_request_context():
+        return None
+
+    return getattr(g, 'request_metrics', None)
+
+
+def record_time(name, seconds):
+    metrics = get_request_metrics()
+    if metrics is not None:
+        metrics['timings'][name] += seconds
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the named timing of the current request"""
+    started_at = time.time()
+    try:
+        yield
+    finally:
+        record_time(name, time.time() - started_at)
+
+
+def get_endpoint():
+    if request.url_rule is None:
+        return UNMATCHED_ENDPOINT
+
+    return '{} {}'.format(request.method, request.url_rule.rule)
+
+
+def get_server_timing(metrics):
+    timings = metrics['timings']
+    return ', '.join([
+        'db;dur={:.3f};desc="{} queries"'.format(timings['db'] * 1000, metrics['queries']),
+        'pool;dur={:.3f}'.format(timings['pool'] * 1000),
+        'serialize;dur={:.3f}'.format(timings['serialize'] * 1000),
+        'template;dur={:.3f}'.format(timings['template'] * 1000),
+        'total;dur={:.3f}'.format((time.time() - metrics['started_at']) * 1000)
+    ])
+
+
+# Time every statement issued while serving a request. The start times are kept on the connection as a stack,
+# following the SQLAlchemy recipe, since a statement is always finished on the connection that started it.
+@event.listens_for(Engine, 'before_cursor_execute')
+def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    if get_request_metrics() is not None:
+        connection.info.setdefault('query_started_at', []).append(time.time())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+    metrics = get_request_metrics()
+    started_at = connection.info.get('query_started_at')
+    if metrics is not None and started_at:
+        metrics['queries'] += 1
+        metrics['timings']['db'] += time.time() - started_at.pop()
+
+
+# Registered ahead of the controllers' hooks, so the authentication lookup is counted too
+@app.before_request
+def start_request_metrics():
+    if is_enabled():
+        g.request_metrics = {
+            'started_at': time.time(),
+            'queries': 0,
+            'timings': {name: 0.0 for name in EndpointStats.TIMINGS if name != 'total'}
+        }
+
+
+@app.after_request
+def add_server_timing_header(response):
+    """Report the request's metrics up to the point the response is returned, which excludes streamed bodies"""
+    metrics = get_request_metrics()
+    if metrics is not None:
+        response.headers[SERVER_TIMING_HEADER] = get_server_timing(metrics)
+
+    return response
+
+
+@app.teardown_request
+def record_request_metrics(exception=None):
+    # Streamed responses keep the request open until their last line is written, so they are recorded in full here
+    metrics = get_request_metrics()
+    if metrics is not None:
+        timings = dict(metrics['timings'], total=time.time() - metrics['started_at'])
+        endpoint_stats.record(get_endpoint(), metrics['queries'], timings)
+        g.request_metrics = None
@@ -0,0 +1,88 @@
+import importlib
+
+from sqlalchemy import MetaData, Table, Column, String, DateTime, func, inspect
+
+from application import db
+
+# Import every model, so that the metadata the migrations work from describes the whole schema
+from application.models import (
+    DefinitionFiller, DefinitionTemplate, Game, Match, Player, Turn, TurnDefinitionFiller, TurnPlayer, Word
+)
+
+# The migrations in the order they are applied. Each one is a module in this package with an upgrade function,
+# which returns a description of each change it made, and its name is the version recorded in the
+# schema_migrations table once it has been applied.
+MIGRATIONS = [
+    'v001_create_schema',
+    'v002_create_indexes',
+    'v003_add_auth_token_generation',
+    'v004_add_match_seats_open',
+    'v005_reencode_fillers'
+]
+
+# Kept apart from the models' metadata, so that creating and dropping the models' tables leaves it alone
+schema_migrations = Table(
+    'schema_migrations',
+    MetaData(),
+    Column('version', String(128), primary_key=True),
+    Column('date_applied', DateTime, default=func.current_timestamp())
+)
+
+
+def get_applied_versions():
+    schema_migrations.create(db.engine, checkfirst=True)
+    return set(row[0] for row in db.session.execute(schema_migrations.select().with_only_columns(
+        [schema_migrations.c.version]
+    )))
+
+
+def get_pending_versions():
+    applied_versions = get_applied_versions()
+    return [version for version in MIGRATIONS if version not in applied_versions]
+
+
+def upgrade():
+    """Apply the pending migrations in order, returning the version of each one applied with the changes it made"""
+    applied = []
+    for version in get_pending_versions():
+        changes = importlib.import_module('{}.{}'.format(__name__, version)).upgrade() or []
+        db.session.execute(schema_migrations.insert().values(version=version))
+        db.session.commit()
+        applied.append((version, changes))
+
+    return applied
+
+
+def get_index_names(table_name):
+    return set(index.get('name') for index in inspect(db.engine).get_indexes(table_name))
+
+
+def get_column_names(table_name):
+    return set(column.get('name') for column in inspect(db.engine).get_columns(table_name))
+
+
+def add_missing_column(table, column_name, column_definition):
+    """Add the column to the table if the database does not have it yet, returning the changes made"""
+    if column_name in get_column_names(table.name):
+        return []
+
+    db.session.execute('ALTER TABLE {} ADD COLUMN {} {}'.format(table.name, column_name, column_definition))
+    db.session.commit()
+    return ['Added column {}.{}'.format(table.name, column_name)]
+
+
+def create_missing_indexes(table):
+    """
+    Create the indexes declared on the table that the database does not have yet, returning their names. Indexes on
+    columns the database does not have yet are left to the migration that adds those columns.
+    """
+    index_names = get_index_names(table.name)
+    column_names = get_column_names(table.name)
+
+    created = []
+    for index in sorted(table.indexes, key=lambda index: index.name):
+        if index.name not in index_names and all(column.name in column_names for column in index.columns):
+            index.create(db.engine)
+            created.append(index.name)
+
+    return created
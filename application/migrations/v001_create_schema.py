@@ -0,0 +1,7 @@
+# Create every table that does not exist yet, which on a new database is the whole schema as the models declare it.
+# Tables that already exist are left as they are, so changes to them belong in the migrations that follow.
+from application import db
+
+
+def upgrade():
+    db.create_all()
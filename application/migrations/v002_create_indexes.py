@@ -0,0 +1,12 @@
+# Create the indexes on the hot lookup columns for databases created before the models declared them.
+from application import db
+from application.migrations import create_missing_indexes
+
+
+def upgrade():
+    changes = []
+    for table in db.Model.metadata.sorted_tables:
+        for index_name in create_missing_indexes(table):
+            changes.append('Created index {} on {}'.format(index_name, table.name))
+
+    return changes
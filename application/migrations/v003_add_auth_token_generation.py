@@ -0,0 +1,8 @@
+# Add the signed auth token generation to players created before it existed. Every existing token is of the first
+# generation.
+from application.migrations import add_missing_column
+from application.models.Player import Player
+
+
+def upgrade():
+    return add_missing_column(Player.__table__, '_auth_token_generation', 'INTEGER NOT NULL DEFAULT 0')
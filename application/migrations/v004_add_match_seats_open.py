@@ -0,0 +1,26 @@
+# Add the open seat counter to matches created before it existed, backfill it for the matches still waiting for
+# players from their game's match size and their players, and create the index used to find open matches.
+from application import db
+from application.migrations import add_missing_column, create_missing_indexes
+from application.models.Match import Match
+
+
+def upgrade():
+    changes = add_missing_column(Match.__table__, '_seats_open', 'SMALLINT NOT NULL DEFAULT 0')
+
+    result = db.session.execute(
+        'UPDATE matches SET _seats_open = ('
+        'SELECT games._match_size FROM games WHERE games._id = matches._game_id'
+        ') - ('
+        'SELECT COUNT(*) FROM match_players WHERE match_players.match_id = matches._id'
+        ') WHERE _state = :state',
+        {'state': Match.STATE_WAITING[0]}
+    )
+    db.session.execute('UPDATE matches SET _seats_open = 0 WHERE _seats_open < 0')
+    db.session.commit()
+    changes.append('Backfilled the open seats of {} waiting matches'.format(result.rowcount))
+
+    for index_name in create_missing_indexes(Match.__table__):
+        changes.append('Created index {} on {}'.format(index_name, Match.__tablename__))
+
+    return changes
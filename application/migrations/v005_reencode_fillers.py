@@ -0,0 +1,75 @@
+# Re-encode the filler columns that were stored with PickleType in to their compact encodings, then change the
+# column types to match. The models read pickled values until this has been applied everywhere, so it can run while
+# the application is serving requests.
+from sqlalchemy import inspect, select
+from sqlalchemy.types import _Binary
+
+from application import db
+from application.models.ColumnTypes import is_pickled
+from application.models.DefinitionTemplate import DefinitionTemplate
+from application.models.DefinitionFiller import DefinitionFiller
+from application.models.TurnDefinitionFiller import TurnDefinitionFiller
+
+BATCH_SIZE = 1000
+
+COLUMNS = [
+    (DefinitionTemplate.__table__, '_filler_lexical_classes', 'VARCHAR({}) NOT NULL'.format(
+        DefinitionTemplate.DEFINITION_MAX_LENGTH
+    )),
+    (DefinitionFiller.__table__, '_filler', 'TEXT NOT NULL'),
+    (TurnDefinitionFiller.__table__, '_filler', 'TEXT NULL')
+]
+
+
+def reencode_column(table, column_name):
+    """Re-encode the pickled values of the column, returning how many were re-encoded"""
+    id_column = table.c._id
+    column = table.c[column_name]
+    # Read the raw stored values, bypassing the column type so pickled rows can be recognised
+    raw_column = db.literal_column('{}.{}'.format(table.name, column_name))
+
+    reencoded = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select([id_column, raw_column]).where(id_column > last_id).order_by(id_column).limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        for record_id, value in rows:
+            # Some drivers return binary columns as buffers
+            value = str(value) if isinstance(value, buffer) else value
+            if is_pickled(value):
+                db.session.execute(
+                    table.update().where(id_column == record_id).values(
+                        {column: column.type.process_result_value(value, db.engine.dialect)}
+                    )
+                )
+                reencoded += 1
+
+        db.session.commit()
+        last_id = rows[-1][0]
+
+    return reencoded
+
+
+def is_binary_column(table, column_name):
+    columns = inspect(db.engine).get_columns(table.name)
+    return any(column.get('name') == column_name and isinstance(column.get('type'), _Binary) for column in columns)
+
+
+def upgrade():
+    changes = []
+    for table, column_name, column_definition in COLUMNS:
+        reencoded = reencode_column(table, column_name)
+        changes.append('Re-encoded {} rows of {}.{}'.format(reencoded, table.name, column_name))
+
+        # Columns still declared as the pickled binary type take the type of their new encoding. Only MySQL, which
+        # the application runs on, can change the type of a column in place.
+        if db.engine.dialect.name == 'mysql' and is_binary_column(table, column_name):
+            db.session.execute('ALTER TABLE {} MODIFY {} {}'.format(table.name, column_name, column_definition))
+            db.session.commit()
+            changes.append('Changed the type of {}.{}'.format(table.name, column_name))
+
+    return changes
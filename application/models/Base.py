@@ -1,4 +1,44 @@
-from application import db
+from functools import wraps
+
+from sqlalchemy import inspect
+from sqlalchemy.orm.session import make_transient_to_detached
+
+from application import db, serialization_cache
+from application.models.UnitOfWork import UnitOfWork
+
+
+def copy_serialized(properties):
+    """Copy the dicts and lists of a serialized form, so a cached form is never changed through a caller's copy"""
+    if isinstance(properties, dict):
+        return {key: copy_serialized(value) for key, value in properties.iteritems()}
+    if isinstance(properties, list):
+        return [copy_serialized(value) for value in properties]
+    return properties
+
+
+def cached_serialization(serialized):
+    """
+    Cache the serialized form built by the decorated property per record, for as long as the record's serialization
+    version stays the same and the record is not saved. Every caller is given its own copy of the cached form.
+    """
+    @wraps(serialized)
+    def wrapper(self):
+        version = self.get_serialization_version()
+
+        # Records that have not been saved yet, or whose nested records are not loaded, have no version to cache against
+        if self.get_id() is None or None in version:
+            return serialized(self)
+
+        key = self.get_serialization_cache_key(self.get_id())
+        cached = serialization_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return copy_serialized(cached[1])
+
+        properties = serialized(self)
+        serialization_cache.set(key, (version, copy_serialized(properties)))
+        return properties
+
+    return wrapper
 
 
 # Base model for other database tables to inherit
@@ -8,7 +48,11 @@ class Base(db.Model):
 
     PROTECTED_ATTRIBUTES = ['id', 'date_created', 'date_modified']
 
-    _id = db.Column(db.BigInteger, primary_key=True)
+    # Cache of record snapshots by id, assigned by the service for the model when it caches reads
+    _record_cache = None
+
+    # SQLite only assigns ids to integer primary keys, so the test suite can run against it
+    _id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True)
     _date_created = db.Column(db.DateTime, default=db.func.current_timestamp())
     _date_modified = db.Column(
         db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp()
@@ -26,9 +70,20 @@ class Base(db.Model):
     def get_date_modified(self):
         return self._date_modified
 
-    def save(self):
+    def save(self, commit=True):
+        """Add the record to the session, committing it unless asked not to or a unit of work is open"""
+        # Read the id from the record's identity, which is known without loading the record's attributes
+        identity = inspect(self).identity
+
         db.session.add(self)
-        db.session.commit()
+        if commit and not UnitOfWork.is_active():
+            db.session.commit()
+
+        # Drop the cached copies of the record, since the modification date only changes once a second
+        if identity is not None:
+            serialization_cache.delete(self.get_serialization_cache_key(identity[0]))
+            if self._record_cache is not None:
+                self._record_cache.delete(identity[0])
 
     def update(self, **updates):
         protected_attributes = []
@@ -51,6 +106,58 @@ class Base(db.Model):
 
         self.save()
 
+    @classmethod
+    def get_record_cache(cls):
+        return cls._record_cache
+
+    @classmethod
+    def set_record_cache(cls, record_cache):
+        cls._record_cache = record_cache
+
+    def get_snapshot(self):
+        """Return the column values of the record, suitable for caching outside of the session"""
+        return {column.key: getattr(self, column.key) for column in self.__mapper__.column_attrs}
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Attach a record rebuilt from a snapshot to the current session without querying the database"""
+        instance = cls.__mapper__.class_manager.new_instance()
+        for key, value in snapshot.iteritems():
+            setattr(instance, key, value)
+
+        make_transient_to_detached(instance)
+        return db.session.merge(instance, load=False)
+
+    @classmethod
+    def get_serialization_cache_key(cls, record_id):
+        return cls.__name__, record_id
+
+    def get_serialization_version(self):
+        """Return the modification dates of the record and of any records nested in its serialized form"""
+        return self.get_date_modified(),
+
+    def get_nested_serialization_version(self, relationship_name):
+        """
+        Return the serialization version of the record related through the many to one relationship, if it can be
+        read without a query, i.e. it is loaded on this record, or is in the session with its columns loaded.
+        Otherwise return (None,), so the serialization is not cached, since loading the related record just to
+        compare versions would cost the query the cache is meant to save.
+        """
+        state = inspect(self)
+        if relationship_name in state.unloaded:
+            relationship = state.mapper.relationships[relationship_name]
+            foreign_key = [
+                getattr(self, state.mapper.get_property_by_column(column).key) for column in relationship.local_columns
+            ]
+            related = db.session.identity_map.get(relationship.mapper.identity_key_from_primary_key(foreign_key))
+        else:
+            related = getattr(self, relationship_name)
+
+        if related is None or '_date_modified' in inspect(related).unloaded:
+            return None,
+
+        return related.get_serialization_version()
+
     # Define serialized form of the model
     @property
     def serialized(self):
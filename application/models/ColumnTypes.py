@@ -0,0 +1,69 @@
+import json
+import pickle
+
+from sqlalchemy.types import TypeDecorator
+
+from application import db
+
+# Pickled values all start with the protocol marker, which neither of the encodings below can start with
+PICKLE_PROTOCOL_MARKER = '\x80'
+
+# The pickled values are only read until every database has applied v005_reencode_fillers, which re-encodes them.
+# Once it has, the fallbacks below and the migration can be removed together.
+
+
+def is_pickled(value):
+    # Some drivers return the old binary columns as buffers
+    return isinstance(value, (str, buffer)) and value[:1] == PICKLE_PROTOCOL_MARKER
+
+
+class JSONEncodedList(TypeDecorator):
+    """
+    Stores a list as compact JSON text, so equal lists are stored as equal strings and can be
+    compared in SQL. Values still pickled by the old PickleType column are read transparently.
+    """
+
+    impl = db.Text
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return json.dumps(value, separators=(',', ':'))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if is_pickled(value):
+            return pickle.loads(str(value))
+        return json.loads(value)
+
+
+class CodedList(TypeDecorator):
+    """
+    Stores a list of values drawn from a fixed set of choices as the comma delimited indexes of those
+    choices, so new choices must only ever be appended. Values still pickled by the old PickleType
+    column are read transparently.
+    """
+
+    impl = db.String
+
+    DELIMITER = ','
+
+    def __init__(self, choices, *args, **kwargs):
+        self.choices = list(choices)
+        self.codes = {choice: code for code, choice in enumerate(self.choices)}
+        super(CodedList, self).__init__(*args, **kwargs)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self.DELIMITER.join(str(self.codes[choice]) for choice in value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if is_pickled(value):
+            return pickle.loads(str(value))
+        if not value:
+            return []
+        return [self.choices[int(code)] for code in value.split(self.DELIMITER)]
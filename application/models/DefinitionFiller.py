@@ -1,5 +1,6 @@
 from application import db
-from application.models.Base import Base
+from application.models.Base import Base, cached_serialization
+from application.models.ColumnTypes import JSONEncodedList
 from application.models.DefinitionTemplate import DefinitionTemplate
 
 
@@ -10,7 +11,7 @@ class DefinitionFiller(Base):
     PROTECTED_ATTRIBUTES = ['definition_template_id', 'definition_template', 'filler', 'is_dictionary']
 
     _definition_template_id = db.Column(db.BigInteger, db.ForeignKey('definition_templates._id'), nullable=False)
-    _filler = db.Column(db.PickleType(), nullable=False)
+    _filler = db.Column(JSONEncodedList(), nullable=False)
     _is_dictionary = db.Column(db.Boolean, nullable=False, default=False)
     _is_active = db.Column(db.Boolean, nullable=False, default=True)
 
@@ -30,24 +31,29 @@ class DefinitionFiller(Base):
         return self._filler
 
     def _set_filler(self, filler):
+        if not isinstance(self.get_definition_template(), DefinitionTemplate):
+            raise AttributeError('The definition filler must be assigned to a definition template')
+
+        self._filler = self.validate_filler(filler, self.get_definition_template().get_filler_lexical_classes())
+        return self
+
+    @staticmethod
+    def validate_filler(filler, filler_lexical_classes):
+        """Return the filler for a template's filler lexical classes, raising AttributeError if it is invalid"""
         filler = filler if filler is not None else list()
 
         if not isinstance(filler, list):
             raise AttributeError('The filler must be a list.')
 
-        if not isinstance(self.get_definition_template(), DefinitionTemplate):
-            raise AttributeError('The definition filler must be assigned to a definition template')
-
-        if len(filler) != len(self.get_definition_template().get_filler_lexical_classes()):
+        if len(filler) != len(filler_lexical_classes):
             raise AttributeError(
                 'There are {} filler but {} filler lexical classes. These values must be the same.'.format(
                     len(filler),
-                    len(self.get_definition_template().get_filler_lexical_classes())
+                    len(filler_lexical_classes)
                 )
             )
 
-        self._filler = filler
-        return self
+        return filler
 
     def get_is_dictionary(self):
         return self._is_dictionary
@@ -63,12 +69,18 @@ class DefinitionFiller(Base):
         self._is_active = is_active
         return self
 
-    def save(self):
+    def save(self, commit=True):
         # TODO Add check that only one filler is the dictionary definition
-        super(DefinitionFiller, self).save()
+        super(DefinitionFiller, self).save(commit)
+
+    def get_serialization_version(self):
+        # Include the version of the nested definition template, so its changes are picked up too
+        return super(DefinitionFiller, self).get_serialization_version() + \
+            self.get_nested_serialization_version('_definition_template')
 
     # Define serialized form of the model
     @property
+    @cached_serialization
     def serialized(self):
         base_properties = super(DefinitionFiller, self).serialized
         definition_filler_properties = {
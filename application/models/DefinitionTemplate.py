@@ -1,19 +1,30 @@
-from application import db
-from application.models.Base import Base
+from itertools import chain, izip
+
+from application import db, definition_segments_cache
+from application.models.Base import Base, cached_serialization
+from application.models.ColumnTypes import CodedList
 from application.models.Word import Word
 
 
 class DefinitionTemplate(Base):
 
     __tablename__ = 'definition_templates'
+    __table_args__ = (
+        # The templates of a word are listed, and filtered to the active ones, by word
+        db.Index('ix_definition_templates_word_active', '_word_id', '_is_active'),
+    )
 
     PROTECTED_ATTRIBUTES = ['definition', 'filler_lexical_classes', 'definition_fillers']
 
     DEFINITION_MAX_LENGTH = 512
 
+    # Marks where each filler goes in a definition
+    FILLER_PLACEHOLDER = '{}'
+
     _word_id = db.Column(db.BigInteger, db.ForeignKey('words._id'), nullable=False)
     _definition = db.Column(db.String(DEFINITION_MAX_LENGTH), nullable=False)
-    _filler_lexical_classes = db.Column(db.PickleType(), nullable=False)
+    # Stored as the comma delimited indexes of the classes in Word.LEXICAL_CLASSES
+    _filler_lexical_classes = db.Column(CodedList(Word.LEXICAL_CLASSES, DEFINITION_MAX_LENGTH), nullable=False)
     _definition_fillers = db.relationship('DefinitionFiller', backref='_definition_template', lazy='dynamic')
     _is_active = db.Column(db.Boolean, nullable=False, default=True)
 
@@ -40,16 +51,25 @@ class DefinitionTemplate(Base):
         return self._filler_lexical_classes
 
     def _set_filler_lexical_classes(self, filler_lexical_classes):
+        self._filler_lexical_classes = self.validate_filler_lexical_classes(
+            self.get_definition(), filler_lexical_classes
+        )
+        return self
+
+    @staticmethod
+    def validate_filler_lexical_classes(definition, filler_lexical_classes):
+        """Return the filler lexical classes for the definition, raising AttributeError if they are invalid"""
         filler_lexical_classes = filler_lexical_classes if filler_lexical_classes is not None else list()
 
         if not isinstance(filler_lexical_classes, list):
             raise AttributeError('The filler lexical classes must be a list.')
 
-        if len(filler_lexical_classes) != self.get_definition().count('{}'):
+        filler_count = len(DefinitionTemplate.compile_definition(definition)) - 1
+        if len(filler_lexical_classes) != filler_count:
             raise AttributeError(
                 'There are {} filler lexical classes but {} fillers. These values must be the same.'.format(
                     len(filler_lexical_classes),
-                    self.get_definition().count('{}')
+                    filler_count
                 )
             )
 
@@ -60,8 +80,38 @@ class DefinitionTemplate(Base):
                 )
             )
 
-        self._filler_lexical_classes = filler_lexical_classes
-        return self
+        return filler_lexical_classes
+
+    def get_definition_segments(self):
+        """Return the compiled definition, which is cached per template since definitions are never edited"""
+        if self.get_id() is None:
+            return self.compile_definition(self.get_definition())
+
+        segments = definition_segments_cache.get(self.get_id())
+        if segments is None:
+            segments = definition_segments_cache.set(self.get_id(), self.compile_definition(self.get_definition()))
+
+        return segments
+
+    def render_definition(self, filler):
+        return self.render_segments(self.get_definition_segments(), filler)
+
+    @staticmethod
+    def compile_definition(definition):
+        """Split the definition in to the literal text before, between and after its filler placeholders"""
+        return tuple(definition.split(DefinitionTemplate.FILLER_PLACEHOLDER))
+
+    @staticmethod
+    def render_segments(segments, filler):
+        """Render a compiled definition, placing each value of the filler between its literal segments"""
+        if len(filler) != len(segments) - 1:
+            raise AttributeError(
+                'There are {} filler but {} fillers in the definition. These values must be the same.'.format(
+                    len(filler), len(segments) - 1
+                )
+            )
+
+        return ''.join(chain(chain.from_iterable(izip(segments, filler)), segments[-1:]))
 
     def get_is_active(self):
         return self._is_active
@@ -70,8 +120,14 @@ class DefinitionTemplate(Base):
         self._is_active = is_active
         return self
 
+    def get_serialization_version(self):
+        # Include the version of the nested word, so its changes are picked up too
+        return super(DefinitionTemplate, self).get_serialization_version() + \
+            self.get_nested_serialization_version('_word')
+
     # Define serialized form of the model
     @property
+    @cached_serialization
     def serialized(self):
         base_properties = super(DefinitionTemplate, self).serialized
         definition_template_properties = {
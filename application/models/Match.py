@@ -7,15 +7,25 @@ match_players = db.Table(
     Base.metadata,
     db.Column('match_id', db.BigInteger, db.ForeignKey('matches._id')),
     db.Column('player_id', db.BigInteger, db.ForeignKey('players._id')),
-    db.Column('date_joined', db.DateTime, default=db.func.current_timestamp())
+    db.Column('date_joined', db.DateTime, default=db.func.current_timestamp()),
+    # Checking whether a player is in a match is a lookup on both columns
+    db.Index('ix_match_players_match_player', 'match_id', 'player_id')
 )
 
 
 class Match(Base):
 
     __tablename__ = 'matches'
+    __table_args__ = (
+        # Finding an open match for a game is a range scan over this index
+        db.Index('ix_matches_open_seats', '_game_id', '_state', '_seats_open', '_date_created'),
+        # Matches of a game in a given state are read oldest first
+        db.Index('ix_matches_game_state', '_game_id', '_state', '_date_created'),
+    )
 
-    PROTECTED_ATTRIBUTES = ['game_id', 'date_started', 'date_canceled', 'date_completed', 'players', 'state', 'game']
+    PROTECTED_ATTRIBUTES = [
+        'game_id', 'date_started', 'date_canceled', 'date_completed', 'players', 'state', 'game', 'seats_open'
+    ]
 
     STATE_WAITING = (0, 'waiting')
     STATE_STARTED = (1, 'stared')
@@ -31,6 +41,8 @@ class Match(Base):
         order_by=match_players.c.date_joined
     )
     _state = db.Column(db.SmallInteger, default=STATE_WAITING[0], nullable=False)
+    # Number of players still needed to start the match, which lets a player claim a seat with a single update
+    _seats_open = db.Column(db.SmallInteger, default=0, nullable=False)
     _date_started = db.Column(db.DateTime)
     _date_canceled = db.Column(db.DateTime)
     _date_completed = db.Column(db.DateTime)
@@ -68,6 +80,13 @@ class Match(Base):
         self._state = state_id
         return self
 
+    def get_seats_open(self):
+        return self._seats_open
+
+    def _set_seats_open(self, seats_open):
+        self._seats_open = seats_open
+        return self
+
     def get_date_started(self):
         return self._date_started
 
@@ -121,7 +140,11 @@ class Match(Base):
         return [] if self._players is None else self._players
 
     def add_player(self, player, should_start=True):
+        if len(self.get_players()) >= self.get_game().get_match_size():
+            raise AttributeError('Match {} does not have an open seat.'.format(self.get_id()))
+
         self._players.append(player)
+        self._set_seats_open(self.get_game().get_match_size() - len(self.get_players()))
 
         if should_start and len(self.get_players()) == self.get_game().get_match_size():
             self.start()
@@ -136,6 +159,7 @@ class Match(Base):
             'date_started': self.dump_datetime(self.get_date_started()),
             'date_canceled': self.dump_datetime(self.get_date_canceled()),
             'date_completed': self.dump_datetime(self.get_date_completed()),
+            'seats_open': self.get_seats_open(),
             'game': self.get_game().serialized,
             'players': {player.get_id(): player.serialized for player in self.get_players()}
         }
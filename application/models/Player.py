@@ -1,16 +1,26 @@
 import uuid
 
+from itsdangerous import URLSafeTimedSerializer, BadSignature
 from werkzeug.security import generate_password_hash
 
-from application import db, app
+from application import db, app, auth_token_cache, auth_token_generation_cache
 from application.models.Base import Base
 
 
 class Player(Base):
 
     __tablename__ = 'players'
+    __table_args__ = (
+        # Authenticated requests and facebook sign ins look the player up by these
+        db.Index('ix_players_auth_token', '_auth_token'),
+        db.Index('ix_players_facebook_id', '_facebook_id'),
+    )
 
-    PROTECTED_ATTRIBUTES = ['auth_token']
+    PROTECTED_ATTRIBUTES = ['auth_token', 'auth_token_generation']
+
+    AUTH_TOKEN_MODE_DATABASE = 'database'
+    AUTH_TOKEN_MODE_SIGNED = 'signed'
+    AUTH_TOKEN_SALT = 'auth_token'
 
     USERNAME_MAX_LENGTH = 128
     EMAIL_MAX_LENGTH = 128
@@ -24,6 +34,8 @@ class Player(Base):
     _password = db.Column(db.String(PASSWORD_MAX_LENGTH), nullable=False)
     _is_active = db.Column(db.Boolean, nullable=False, default=True)
     _auth_token = db.Column(db.String(AUTH_TOKEN_LENGTH))
+    # Incremented on sign out so that every signed auth token issued before then is revoked
+    _auth_token_generation = db.Column(db.Integer, nullable=False, default=0)
     _avatar_url = db.Column(db.String(AVATAR_URL_MAX_LENGTH))
     _facebook_id = db.Column(db.String(FB_ID_MAX_LENGTH))
 
@@ -32,7 +44,9 @@ class Player(Base):
         self.set_password(password)
         self.set_email(email)
         self.set_avatar_url(avatar_url)
-        self._set_auth_token(self.generate_auth_token())
+        self._set_auth_token_generation(0)
+        if not self.is_signed_auth_token_mode():
+            self._set_auth_token(self.generate_auth_token())
         self.set_facebook_id(facebook_id)
 
     def get_username(self):
@@ -64,12 +78,21 @@ class Player(Base):
         return self
 
     def get_auth_token(self):
+        if self.is_signed_auth_token_mode():
+            return self.generate_signed_auth_token()
         return self._auth_token
 
     def _set_auth_token(self, auth_token):
         self._auth_token = auth_token
         return self
 
+    def get_auth_token_generation(self):
+        return self._auth_token_generation
+
+    def _set_auth_token_generation(self, auth_token_generation):
+        self._auth_token_generation = auth_token_generation
+        return self
+
     def get_avatar_url(self):
         return self._avatar_url
 
@@ -84,10 +107,22 @@ class Player(Base):
         self._facebook_id = facebook_id
         return self
 
+    def save(self, commit=True):
+        auth_token = self._auth_token
+        super(Player, self).save(commit)
+
+        # Drop the cached copy of this player so the next authenticated request sees the saved data
+        self.invalidate_auth_token(auth_token)
+
     def login(self):
         if not self.get_is_active():
             return False
 
+        # Signed auth tokens are generated on demand from the player id and generation, so there is nothing to save
+        if self.is_signed_auth_token_mode():
+            return True
+
+        auth_token = self._auth_token
         self._set_auth_token(self.generate_auth_token())
 
         try:
@@ -96,9 +131,14 @@ class Player(Base):
             app.logger.error('Failed to save auth token with error: {}'.format(e.message))
             return False
 
+        self.invalidate_auth_token(auth_token)
         return True
 
     def logout(self):
+        if self.is_signed_auth_token_mode():
+            return self.revoke_signed_auth_tokens()
+
+        auth_token = self._auth_token
         self._set_auth_token(None)
 
         try:
@@ -107,8 +147,30 @@ class Player(Base):
             app.logger.error('Failed to remove auth token with error: {}'.format(e.message))
             return False
 
+        self.invalidate_auth_token(auth_token)
+        return True
+
+    def revoke_signed_auth_tokens(self):
+        self._set_auth_token_generation(self.get_auth_token_generation() + 1)
+
+        try:
+            self.save()
+        except Exception as e:
+            app.logger.error('Failed to revoke signed auth tokens with error: {}'.format(e.message))
+            return False
+
+        auth_token_generation_cache.set(self.get_id(), self.get_auth_token_generation())
         return True
 
+    def generate_signed_auth_token(self):
+        if self.get_id() is None:
+            return None
+
+        return self.get_auth_token_serializer().dumps({
+            'id': self.get_id(),
+            'generation': self.get_auth_token_generation()
+        })
+
     # Define serialized form of the model
     @property
     def serialized(self):
@@ -124,4 +186,26 @@ class Player(Base):
 
     @staticmethod
     def generate_auth_token():
-        return uuid.uuid4()
+        # Stored as text, which is how MySQL stores it anyway, so every database driver can bind it
+        return str(uuid.uuid4())
+
+    @staticmethod
+    def is_signed_auth_token_mode():
+        return app.config.get('AUTH_TOKEN_MODE') == Player.AUTH_TOKEN_MODE_SIGNED
+
+    @staticmethod
+    def get_auth_token_serializer():
+        return URLSafeTimedSerializer(app.config.get('SECRET_KEY'), salt=Player.AUTH_TOKEN_SALT)
+
+    @staticmethod
+    def load_signed_auth_token(auth_token):
+        """Return the payload of a signed auth token, or None if the signature is invalid or expired"""
+        try:
+            return Player.get_auth_token_serializer().loads(auth_token, max_age=app.config.get('AUTH_TOKEN_MAX_AGE'))
+        except BadSignature:
+            return None
+
+    @staticmethod
+    def invalidate_auth_token(auth_token):
+        if auth_token is not None:
+            auth_token_cache.delete(str(auth_token))
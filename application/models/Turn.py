@@ -6,6 +6,10 @@ from application.models.TurnPlayer import TurnPlayer
 class Turn(Base):
 
     __tablename__ = 'turns'
+    __table_args__ = (
+        # The active turns of a match are filtered by state and read oldest first
+        db.Index('ix_turns_match_state', '_match_id', '_state', '_date_created'),
+    )
 
     PROTECTED_ATTRIBUTES = ['match_id', 'match', 'word_id', 'word']
 
@@ -16,8 +20,10 @@ class Turn(Base):
     STATES = [STATE_SUPPLYING, STATE_SELECTING, STATE_CANCELED, STATE_COMPLETED]
 
     _match_id = db.Column(db.BigInteger, db.ForeignKey('matches._id'), nullable=False)
+    _match = db.relationship('Match')
     _players = db.relationship('TurnPlayer', backref='turn', lazy='dynamic')
     _word_id = db.Column(db.BigInteger, db.ForeignKey('words._id'), nullable=False)
+    _word = db.relationship('Word')
     _state = db.Column(db.SmallInteger, default=STATE_SUPPLYING[0], nullable=False)
     _date_canceled = db.Column(db.DateTime)
     _date_completed = db.Column(db.DateTime)
@@ -1,10 +1,16 @@
-from application import db
+from application import db, definition_segments_cache
 from application.models.Base import Base
+from application.models.ColumnTypes import JSONEncodedList
+from application.models.DefinitionTemplate import DefinitionTemplate
 
 
 class TurnDefinitionFiller(Base):
 
     __tablename__ = 'turn_definition_fillers'
+    __table_args__ = (
+        # The fillers of a turn are always read together
+        db.Index('ix_turn_definition_fillers_turn', '_turn_id'),
+    )
 
     PROTECTED_ATTRIBUTES = [
         'turn_id', 'turn', 'definition_template_id', 'definition_template',
@@ -12,8 +18,10 @@ class TurnDefinitionFiller(Base):
     ]
 
     _turn_id = db.Column(db.BigInteger, db.ForeignKey('turns._id'), nullable=False)
+    turn = db.relationship('Turn')
     _definition_template_id = db.Column(db.BigInteger, db.ForeignKey('definition_templates._id'), nullable=False)
-    _filler = db.Column(db.PickleType())
+    definition_template = db.relationship('DefinitionTemplate')
+    _filler = db.Column(JSONEncodedList())
     # True if this is the filler used to generate the dictionary definition
     _is_dictionary = db.Column(db.Boolean, nullable=False, default=False)
     # This is the ID of the opponent who supplied this filler, NULL for game-generated filler
@@ -21,6 +29,8 @@ class TurnDefinitionFiller(Base):
     # This is the ID of the player who selected the definition generated from this filler,
     # NULL for all the other fillers assigned to this turn
     _selector_id = db.Column(db.BigInteger, db.ForeignKey('players._id'))
+    supplier = db.relationship('Player', foreign_keys=[_supplier_id])
+    selector = db.relationship('Player', foreign_keys=[_selector_id])
 
     def __init__(self, turn, definition_template, filler, is_dictionary, supplier=None):
         self._set_turn(turn)
@@ -32,6 +42,9 @@ class TurnDefinitionFiller(Base):
     def get_turn(self):
         return self.turn
 
+    def get_turn_id(self):
+        return self._turn_id
+
     def _set_turn(self, turn):
         self.turn = turn
         return self
@@ -77,18 +90,26 @@ class TurnDefinitionFiller(Base):
         self.selector = selector
         return self
 
+    def get_definition_template_id(self):
+        return self._definition_template_id
+
     def get_definition(self):
-        definition_template = self.get_definition_template()
-        if not definition_template:
-            raise AttributeError(
-                'Turn definition filler {} does not have a definition_template assigned'.format(self.get_id())
-            )
+        # Use the compiled definition of the template when it is cached, without loading the template
+        segments = definition_segments_cache.get(self.get_definition_template_id())
 
-        definition_text = definition_template.get_definition()
-        if not definition_text:
-            raise AttributeError(
-                'Defintion template {} does not have definition text'.format(definition_template.get_id())
-            )
+        if segments is None:
+            definition_template = self.get_definition_template()
+            if not definition_template:
+                raise AttributeError(
+                    'Turn definition filler {} does not have a definition_template assigned'.format(self.get_id())
+                )
+
+            if not definition_template.get_definition():
+                raise AttributeError(
+                    'Defintion template {} does not have definition text'.format(definition_template.get_id())
+                )
+
+            segments = definition_template.get_definition_segments()
 
         filler = self.get_filler()
         if not filler:
@@ -96,7 +117,7 @@ class TurnDefinitionFiller(Base):
                 'Turn definition filler {} does not have filler defined'.format(self.get_id())
             )
 
-        return definition_text.format(**filler)
+        return DefinitionTemplate.render_segments(segments, filler)
 
     # Define serialized form of the model
     @property
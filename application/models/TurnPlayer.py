@@ -5,11 +5,16 @@ from application.models.Base import Base
 class TurnPlayer(Base):
 
     __tablename__ = 'turn_player'
+    __table_args__ = (
+        # A player's turn players are found from the turns of a match
+        db.Index('ix_turn_player_turn_player', '_turn_id', '_player_id'),
+    )
 
     PROTECTED_ATTRIBUTES = ['turn_id', 'turn', 'player_id', 'player', 'is_selector']
 
     _turn_id = db.Column(db.BigInteger, db.ForeignKey('turns._id'), nullable=False)
     _player_id = db.Column(db.BigInteger, db.ForeignKey('players._id'), nullable=False)
+    player = db.relationship('Player')
     # True if this is the player selecting a definition filler this turn
     _is_selector = db.Column(db.Boolean, nullable=False, default=False)
     # This players score from this turn
@@ -20,7 +25,7 @@ class TurnPlayer(Base):
     def __init__(self, turn, player, is_selector=False):
         self._set_turn(turn)
         self._set_player(player)
-        self._set_is_selectorr(is_selector)
+        self._set_is_selector(is_selector)
 
     def get_turn(self):
         return self.turn
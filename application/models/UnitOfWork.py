@@ -0,0 +1,53 @@
+from application import db
+
+
+class UnitOfWork(object):
+    """
+    Groups the records saved inside it in to a single transaction, which is committed when the outermost unit of work
+    exits and rolled back if it raises. Units of work opened inside another one join the outer transaction.
+
+        with UnitOfWork():
+            word.save()
+            definition_template.save()
+    """
+
+    DEPTH_KEY = 'unit_of_work_depth'
+
+    def __enter__(self):
+        info = db.session().info
+        info[self.DEPTH_KEY] = info.get(self.DEPTH_KEY, 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        info = db.session().info
+        info[self.DEPTH_KEY] -= 1
+
+        # Leave the transaction to the outermost unit of work
+        if info[self.DEPTH_KEY]:
+            return False
+
+        if exc_type is not None:
+            db.session.rollback()
+            return False
+
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return False
+
+    def add(self, *records):
+        for record in records:
+            record.save(commit=False)
+        return self
+
+    def flush(self):
+        """Send the pending inserts and updates to the database, e.g. to have ids assigned, without committing"""
+        db.session.flush()
+        return self
+
+    @classmethod
+    def is_active(cls):
+        return db.session().info.get(cls.DEPTH_KEY, 0) > 0
@@ -1,10 +1,14 @@
 from application import db
-from application.models.Base import Base
+from application.models.Base import Base, cached_serialization
 
 
 class Word(Base):
 
     __tablename__ = 'words'
+    __table_args__ = (
+        # New turn words are picked by seeking in to the active words from a random id
+        db.Index('ix_words_active', '_is_active', '_id'),
+    )
 
     PROTECTED_ATTRIBUTES = ['lexeme_form', 'lexical_class', 'definition_templates']
 
@@ -33,12 +37,16 @@ class Word(Base):
         return self._lexical_class
 
     def _set_lexical_class(self, lexical_class):
-        if lexical_class not in self.LEXICAL_CLASSES:
+        self._lexical_class = self.validate_lexical_class(lexical_class)
+        return self
+
+    @classmethod
+    def validate_lexical_class(cls, lexical_class):
+        if lexical_class not in cls.LEXICAL_CLASSES:
             raise AttributeError(
-                'Cannot set the lexical class to a value other than one of: {}'.format(', '.join(self.LEXICAL_CLASSES))
+                'Cannot set the lexical class to a value other than one of: {}'.format(', '.join(cls.LEXICAL_CLASSES))
             )
-        self._lexical_class = lexical_class
-        return self
+        return lexical_class
 
     def get_is_active(self):
         return self._is_active
@@ -49,6 +57,7 @@ class Word(Base):
 
     # Define serialized form of the model
     @property
+    @cached_serialization
     def serialized(self):
         base_properties = super(Word, self).serialized
         game_properties = {
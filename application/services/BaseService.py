@@ -1,18 +1,168 @@
+import base64
+
+from sqlalchemy import inspect
+from werkzeug.utils import import_string
+
+from application import app, db
+
+
 class BaseService(object):
 
     _instance = None
 
+    # Every record cache created by a service, so they can be cleared together
+    _record_caches = []
+
+    # Name of the loading profile used when records are going to be serialized
+    LOAD_SERIALIZED = 'serialized'
+
+    # Maps a loading profile name to the loader options eagerly fetching the relationships it needs
+    LOAD_PROFILES = {}
+
+    # Number of records built at a time when streaming a list
+    STREAM_BATCH_SIZE = 500
+
     def __init__(self, serviced_class):
         self._serviced_class = serviced_class
 
+        # Cache the records fetched by id through the service, when it is configured to
+        cache_config = app.config.get('SERVICE_CACHES', {}).get(self.__class__.__name__)
+        if cache_config and serviced_class.get_record_cache() is None:
+            cache_class = import_string(app.config.get('SERVICE_CACHE_BACKEND'))
+            record_cache = cache_class(cache_config.get('size'), cache_config.get('ttl'))
+            serviced_class.set_record_cache(record_cache)
+            BaseService._record_caches.append(record_cache)
+
     def get_class(self):
         return self._serviced_class
 
-    def get(self, record_id):
-        return self.get_class().query.filter_by(_id=record_id).first()
+    def get_query(self, load_profile=None):
+        query = self.get_class().query
+
+        if load_profile is not None:
+            if load_profile not in self.LOAD_PROFILES:
+                raise ValueError('{} does not define the loading profile {}'.format(
+                    self.__class__.__name__, load_profile
+                ))
+            query = query.options(*self.LOAD_PROFILES.get(load_profile))
+
+        return query
+
+    def get_record_cache(self):
+        return self.get_class().get_record_cache()
+
+    def get(self, record_id, load_profile=None):
+        records, missing_ids = self.get_many([record_id], load_profile)
+        return records[0] if records else None
+
+    def get_many(self, record_ids, load_profile=None):
+        """
+        Returns (records, missing_ids) for the requested ids, with the records in the requested order. Records
+        already in the session or in the record cache are used first, and the rest are fetched with one IN query.
+        Eagerly loaded relationships are not part of either, so reads with a loading profile always query.
+        """
+        records = {}
+        record_cache = self.get_record_cache()
+
+        if load_profile is None:
+            mapper = inspect(self.get_class())
+            for record_id in set(record_ids):
+                record = db.session.identity_map.get(mapper.identity_key_from_primary_key([record_id]))
+
+                if record is None and record_cache is not None:
+                    snapshot = record_cache.get(record_id)
+                    if snapshot is not None:
+                        record = self.get_class().from_snapshot(snapshot)
+
+                if record is not None:
+                    records[record_id] = record
+
+        unloaded_ids = [record_id for record_id in set(record_ids) if record_id not in records]
+        if unloaded_ids:
+            for record in self.get_query(load_profile).filter(self.get_class()._id.in_(unloaded_ids)).all():
+                records[record.get_id()] = record
+                if record_cache is not None:
+                    record_cache.set(record.get_id(), record.get_snapshot())
+
+        missing_ids = []
+        for record_id in record_ids:
+            if record_id not in records and record_id not in missing_ids:
+                missing_ids.append(record_id)
+
+        return [records[record_id] for record_id in record_ids if record_id in records], missing_ids
+
+    def get_list(self, limit=None, offset=None, after_id=None, before_id=None, load_profile=None, stream=False):
+        return self.get_page(self.get_query(load_profile), limit, offset, after_id, before_id, stream)
+
+    def get_page(self, query, limit=None, offset=None, after_id=None, before_id=None, stream=False):
+        """
+        Return a page of the query ordered by id. The after_id and before_id bounds seek
+        directly in to the primary key index, so deep pages cost the same as the first.
+
+        When streaming, the records are returned as an iterator that loads STREAM_BATCH_SIZE records at a time, each
+        batch seeking past the last id of the one before, so neither the process nor the driver ever holds more than
+        a batch. A server side cursor is not used, since it would leave the session's connection unusable until it
+        was drained, and MySQLdb fails with "Commands out of sync" on any other query, such as a lazy load, made while
+        the records are written. Pages seeking backwards from before_id with a limit or offset are bounded, and are
+        loaded as usual before being reversed.
+        """
+        id_column = self.get_class()._id
+
+        if stream and (before_id is None or (limit is None and offset is None)):
+            if before_id is not None:
+                query = query.filter(id_column < before_id)
+
+            return self._stream_page(query, limit, offset, after_id)
+
+        if after_id is not None:
+            query = query.filter(id_column > after_id)
+
+        # Seek backwards from before_id so the page ends just before it, then restore the ascending order
+        if before_id is not None:
+            records = query.filter(id_column < before_id).order_by(id_column.desc()).limit(limit).offset(offset).all()
+            return list(reversed(records))
+
+        return query.order_by(id_column).limit(limit).offset(offset).all()
+
+    def _stream_page(self, query, limit=None, offset=None, after_id=None):
+        """Yield the page of the query in batches of STREAM_BATCH_SIZE records, until a batch comes back short"""
+        remaining = limit
+        while remaining is None or remaining > 0:
+            batch_size = self.STREAM_BATCH_SIZE if remaining is None else min(self.STREAM_BATCH_SIZE, remaining)
+            records = self.get_page(query, batch_size, offset, after_id)
+            for record in records:
+                yield record
+
+            if len(records) < batch_size:
+                return
+
+            # The offset only skips records ahead of the first batch, the rest seek past the last id streamed
+            offset = None
+            after_id = records[-1].get_id()
+            if remaining is not None:
+                remaining -= len(records)
+
+    @staticmethod
+    def encode_cursor(record_id):
+        return base64.urlsafe_b64encode(str(record_id))
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Return the record id encoded in the cursor, raising ValueError if the cursor is invalid"""
+        try:
+            record_id = int(base64.urlsafe_b64decode(str(cursor)))
+        except TypeError:
+            raise ValueError('Invalid cursor')
+
+        if record_id < 1:
+            raise ValueError('Invalid cursor')
+
+        return record_id
 
-    def get_list(self, limit=None, offset=None):
-        return self.get_class().query.order_by(self.get_class()._id).limit(limit).offset(offset).all()
+    @staticmethod
+    def clear_record_caches():
+        for record_cache in BaseService._record_caches:
+            record_cache.clear()
 
     @classmethod
     def get_instance(cls):
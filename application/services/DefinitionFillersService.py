@@ -1,22 +1,36 @@
+from sqlalchemy.orm import joinedload
+
 from application.models.DefinitionFiller import DefinitionFiller
 from application.models.DefinitionTemplate import DefinitionTemplate
 from application.services.BaseService import BaseService
 
 
 class DefinitionFillersService(BaseService):
+    # Serialized fillers include their definition template, which includes its word
+    LOAD_PROFILES = {
+        BaseService.LOAD_SERIALIZED: [joinedload('_definition_template').joinedload('_word')]
+    }
+
     def __init__(self):
         super(DefinitionFillersService, self).__init__(DefinitionFiller)
 
-    def get_list_by_word(self, word_id, limit=None, offset=None):
-        return self.get_class().query.join(
+    def get_list_by_word(
+            self, word_id, limit=None, offset=None, after_id=None, before_id=None, load_profile=None, stream=False
+    ):
+        query = self.get_query(load_profile).join(
             DefinitionTemplate
         ).filter(
             DefinitionTemplate._word_id == word_id
-        ).order_by(self.get_class()._id).limit(limit).offset(offset).all()
+        )
 
-    def get_list_by_definition_template(self, definition_template_id, limit=None, offset=None):
-        return self.get_class().query.join(
-            DefinitionTemplate
-        ).filter(
-            DefinitionTemplate._id == definition_template_id
-        ).order_by(self.get_class()._id).limit(limit).offset(offset).all()
+        return self.get_page(query, limit, offset, after_id, before_id, stream)
+
+    def get_list_by_definition_template(
+            self, definition_template_id, limit=None, offset=None, after_id=None, before_id=None, load_profile=None,
+            stream=False
+    ):
+        query = self.get_query(load_profile).filter(
+            self.get_class()._definition_template_id == definition_template_id
+        )
+
+        return self.get_page(query, limit, offset, after_id, before_id, stream)
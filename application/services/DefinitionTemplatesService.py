@@ -1,12 +1,23 @@
+from sqlalchemy.orm import joinedload
+
 from application.models.DefinitionTemplate import DefinitionTemplate
 from application.services.BaseService import BaseService
 
 
 class DefinitionTemplatesService(BaseService):
+    # Serialized templates include their word
+    LOAD_PROFILES = {
+        BaseService.LOAD_SERIALIZED: [joinedload('_word')]
+    }
+
     def __init__(self):
         super(DefinitionTemplatesService, self).__init__(DefinitionTemplate)
 
-    def get_list_by_word(self, word_id, limit=None, offset=None):
-        return self.get_class().query.filter(
+    def get_list_by_word(
+            self, word_id, limit=None, offset=None, after_id=None, before_id=None, load_profile=None, stream=False
+    ):
+        query = self.get_query(load_profile).filter(
             self.get_class()._word_id == word_id
-        ).order_by(self.get_class()._id).limit(limit).offset(offset).all()
+        )
+
+        return self.get_page(query, limit, offset, after_id, before_id, stream)
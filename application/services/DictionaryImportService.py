@@ -0,0 +1,299 @@
+import csv
+import json
+
+from application import db
+from application.models.UnitOfWork import UnitOfWork
+from application.models.Word import Word
+from application.models.DefinitionTemplate import DefinitionTemplate
+from application.models.DefinitionFiller import DefinitionFiller
+
+
+class DictionaryImportService(object):
+    """
+    Bulk loads words along with their definition templates and definition fillers. Entries are validated with the
+    same rules as the models, then each batch of entries is written with one multi-row insert per table and a single
+    commit, instead of a request, lookup and commit per row. Each batch is its own unit of work, so a large import
+    never holds its locks for longer than a batch, and an import run inside another unit of work is committed as a
+    whole.
+    """
+
+    _instance = None
+
+    FORMAT_NDJSON = 'ndjson'
+    FORMAT_CSV = 'csv'
+    FORMATS = [FORMAT_NDJSON, FORMAT_CSV]
+
+    DEFAULT_BATCH_SIZE = 500
+
+    # CSV files have one row per definition filler, with list values separated by CSV_LIST_DELIMITER.
+    # Consecutive rows for the same word and definition are grouped in to a single word and definition template,
+    # and rows without a definition or filler add a word without templates or a template without fillers.
+    CSV_COLUMNS = ['lexeme_form', 'lexical_class', 'definition', 'filler_lexical_classes', 'filler', 'is_dictionary']
+    CSV_LIST_DELIMITER = '|'
+
+    # Flags may be given as booleans, or as numbers or strings in either format, where a missing flag is false
+    TRUE_VALUES = ['1', 'true', 'yes']
+    FALSE_VALUES = ['', '0', 'false', 'no']
+
+    def import_lines(self, lines, input_format=FORMAT_NDJSON, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Import the entries read from an iterable of NDJSON or CSV lines, e.g. an open file or request stream.
+        Returns the number of imported records by type and a list of the entries that failed validation. If a batch
+        fails to be written, the import stops there, with the lines of the batch and its error added to the list,
+        and the counts of the batches committed before it.
+        """
+        if input_format not in self.FORMATS:
+            raise ValueError('The import format must be one of: {}'.format(', '.join(self.FORMATS)))
+
+        entries = self.read_csv(lines) if input_format == self.FORMAT_CSV else self.read_ndjson(lines)
+        sequential_ids = self.has_sequential_multi_row_ids()
+
+        counts = {'words': 0, 'definition_templates': 0, 'definition_fillers': 0}
+        errors = []
+        batch = []
+        batch_line_numbers = []
+        for line_number, entry, entry_errors in entries:
+            if not entry_errors:
+                try:
+                    batch.append(self.validate_entry(entry))
+                    batch_line_numbers.append(line_number)
+                except (AttributeError, TypeError, ValueError) as e:
+                    entry_errors = {e.__class__.__name__: [e.message]}
+
+            if entry_errors:
+                errors.append({'line': line_number, 'errors': entry_errors})
+                continue
+
+            if len(batch) >= batch_size:
+                if not self.try_insert_batch(batch, batch_line_numbers, counts, errors, batch_size, sequential_ids):
+                    return counts, errors
+                batch = []
+                batch_line_numbers = []
+
+        if batch:
+            self.try_insert_batch(batch, batch_line_numbers, counts, errors, batch_size, sequential_ids)
+
+        return counts, errors
+
+    def try_insert_batch(self, batch, line_numbers, counts, errors, batch_size, sequential_ids):
+        """
+        Insert the batch, returning False with the batch's lines and error added to the errors if it is rolled back.
+        Inside another unit of work the error is raised instead, since the whole import is rolled back with it.
+        """
+        try:
+            self.insert_batch(batch, counts, batch_size, sequential_ids)
+        except Exception as e:
+            if UnitOfWork.is_active():
+                raise
+
+            errors.append({'lines': [line_numbers[0], line_numbers[-1]], 'errors': {e.__class__.__name__: [e.message]}})
+            return False
+
+        return True
+
+    @staticmethod
+    def has_failed_batch(errors):
+        """Whether the import stopped at a batch that could not be written"""
+        return any('lines' in error for error in errors)
+
+    def read_ndjson(self, lines):
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+
+            try:
+                yield line_number, json.loads(line), None
+            except ValueError as e:
+                yield line_number, None, {e.__class__.__name__: [e.message]}
+
+    def read_csv(self, lines):
+        entry = None
+        entry_line_number = None
+        template = None
+        for line_number, row in enumerate(csv.reader(lines), 1):
+            row = [value.decode('utf-8').strip() for value in row]
+            if not any(row) or (line_number == 1 and row == self.CSV_COLUMNS):
+                continue
+
+            if len(row) != len(self.CSV_COLUMNS):
+                yield line_number, None, {'ValueError': [
+                    'Each row must have the columns: {}'.format(', '.join(self.CSV_COLUMNS))
+                ]}
+                continue
+
+            values = dict(zip(self.CSV_COLUMNS, row))
+
+            # Start a new entry whenever the word changes
+            if entry is None or \
+                    (entry['lexeme_form'], entry['lexical_class']) != (values['lexeme_form'], values['lexical_class']):
+                if entry is not None:
+                    yield entry_line_number, entry, None
+
+                entry = {
+                    'lexeme_form': values['lexeme_form'],
+                    'lexical_class': values['lexical_class'],
+                    'definition_templates': []
+                }
+                entry_line_number = line_number
+                template = None
+
+            if not values['definition']:
+                continue
+
+            filler_lexical_classes = self.split_csv_list(values['filler_lexical_classes'])
+            if template is None or \
+                    (template['definition'], template['filler_lexical_classes']) != \
+                    (values['definition'], filler_lexical_classes):
+                template = {
+                    'definition': values['definition'],
+                    'filler_lexical_classes': filler_lexical_classes,
+                    'definition_fillers': []
+                }
+                entry['definition_templates'].append(template)
+
+            if values['filler']:
+                template['definition_fillers'].append({
+                    'filler': self.split_csv_list(values['filler']),
+                    'is_dictionary': values['is_dictionary']
+                })
+
+        if entry is not None:
+            yield entry_line_number, entry, None
+
+    def split_csv_list(self, value):
+        return [item.strip() for item in value.split(self.CSV_LIST_DELIMITER)] if value else []
+
+    def parse_flag(self, value, name):
+        """Return the boolean the flag is set to, raising ValueError if it is neither true nor false"""
+        if value is None or isinstance(value, bool):
+            return bool(value)
+
+        normalized_value = unicode(value).strip().lower()
+        if normalized_value in self.TRUE_VALUES:
+            return True
+        if normalized_value in self.FALSE_VALUES:
+            return False
+
+        raise ValueError('The {} flag must be one of: true, false'.format(name))
+
+    def validate_entry(self, entry):
+        """
+        Return the word, definition template and definition filler column values for an entry,
+        raising AttributeError, TypeError or ValueError if any part of the entry is invalid
+        """
+        if not isinstance(entry, dict):
+            raise ValueError('Each entry must be an object')
+
+        lexeme_form = entry.get('lexeme_form')
+        if not lexeme_form:
+            raise ValueError('Must provide a lexeme form of the word')
+
+        if len(lexeme_form) > Word.LEXEME_FORM_MAX_LENGTH:
+            raise ValueError(
+                'The lexeme form can not be more than {} characters'.format(Word.LEXEME_FORM_MAX_LENGTH)
+            )
+
+        word = {
+            '_lexeme_form': lexeme_form,
+            '_lexical_class': Word.validate_lexical_class(entry.get('lexical_class'))
+        }
+
+        templates = []
+        for template_data in entry.get('definition_templates') or []:
+            definition = template_data.get('definition')
+            if not definition:
+                raise ValueError('Must provide a definition')
+
+            if len(definition) > DefinitionTemplate.DEFINITION_MAX_LENGTH:
+                raise ValueError(
+                    'The definition can not be more than {} characters'.format(DefinitionTemplate.DEFINITION_MAX_LENGTH)
+                )
+
+            filler_lexical_classes = DefinitionTemplate.validate_filler_lexical_classes(
+                definition, template_data.get('filler_lexical_classes')
+            )
+
+            fillers = [
+                {
+                    '_filler': DefinitionFiller.validate_filler(filler_data.get('filler'), filler_lexical_classes),
+                    '_is_dictionary': self.parse_flag(filler_data.get('is_dictionary'), 'is_dictionary')
+                }
+                for filler_data in template_data.get('definition_fillers') or []
+            ]
+
+            templates.append(({'_definition': definition, '_filler_lexical_classes': filler_lexical_classes}, fillers))
+
+        return word, templates
+
+    def insert_batch(self, batch, counts, batch_size, sequential_ids):
+        # Stamp every row in the batch with the database time, as the column defaults would
+        timestamp = db.session.query(db.func.current_timestamp()).scalar()
+        common_values = {'_is_active': True, '_date_created': timestamp, '_date_modified': timestamp}
+
+        with UnitOfWork():
+            word_ids = self.insert_rows(
+                Word.__table__,
+                [dict(word.items() + common_values.items()) for word, templates in batch],
+                batch_size,
+                sequential_ids
+            )
+
+            template_rows = []
+            template_fillers = []
+            for word_id, (word, templates) in zip(word_ids, batch):
+                for template, fillers in templates:
+                    template_rows.append(dict(template.items() + common_values.items() + [('_word_id', word_id)]))
+                    template_fillers.append(fillers)
+
+            template_ids = self.insert_rows(DefinitionTemplate.__table__, template_rows, batch_size, sequential_ids)
+
+            filler_rows = [
+                dict(filler.items() + common_values.items() + [('_definition_template_id', template_id)])
+                for template_id, fillers in zip(template_ids, template_fillers)
+                for filler in fillers
+            ]
+
+            self.insert_rows(DefinitionFiller.__table__, filler_rows, batch_size, sequential_ids)
+
+        counts['words'] += len(word_ids)
+        counts['definition_templates'] += len(template_ids)
+        counts['definition_fillers'] += len(filler_rows)
+
+    def insert_rows(self, table, rows, batch_size, sequential_ids):
+        """Insert the rows in chunks of batch_size and return their ids, in the same order as the rows"""
+        ids = []
+        for start in range(0, len(rows), batch_size):
+            chunk = rows[start:start + batch_size]
+
+            # A multi-row insert reports the id of its first row, and the rest of the rows follow it
+            if sequential_ids:
+                result = db.session.execute(table.insert().values(chunk))
+                ids.extend(range(result.lastrowid, result.lastrowid + len(chunk)))
+            else:
+                for row in chunk:
+                    ids.append(db.session.execute(table.insert().values(row)).inserted_primary_key[0])
+
+        return ids
+
+    @staticmethod
+    def has_sequential_multi_row_ids():
+        """
+        MySQL assigns consecutive auto increment ids to the rows of a multi-row insert, unless InnoDB is running
+        with interleaved auto increment locking (innodb_autoinc_lock_mode = 2), or the ids are spaced out by an
+        auto_increment_increment other than 1, as in multi-master and Galera clusters. Otherwise, and on other
+        databases, rows are inserted one by one, each reporting its own id.
+        """
+        if db.engine.dialect.name != 'mysql':
+            return False
+
+        lock_mode, increment = db.session.execute(
+            'SELECT @@innodb_autoinc_lock_mode, @@auto_increment_increment'
+        ).first()
+        return lock_mode < 2 and increment == 1
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+
+        return cls._instance
@@ -1,56 +1,139 @@
+import random
+
+from sqlalchemy import and_, inspect
+from sqlalchemy.orm import joinedload, subqueryload
+
+from application import db
 from application.models.Match import Match, match_players
-from application.models.Game import Game
+from application.models.UnitOfWork import UnitOfWork
 from application.services.BaseService import BaseService
-from application.services.TurnsService import TurnsService
-from application.services.PlayersService import PlayersService
 
 
 class MatchesService(BaseService):
+    # Serialized matches include their game and all of their players. The players are loaded with a
+    # second query, rather than a join, so that a page of matches is not multiplied by the match size
+    LOAD_PROFILES = {
+        BaseService.LOAD_SERIALIZED: [joinedload('_game'), subqueryload('_players')]
+    }
+
+    # Number of the oldest open matches a joining player picks from at random, so that a burst of
+    # joiners spreads its claims over several matches instead of queuing on the oldest one
+    CLAIM_CANDIDATE_COUNT = 8
+
     def __init__(self):
         super(MatchesService, self).__init__(Match)
 
-    def get_list_by_game_for_player(self, game_id, player_id, limit, offset):
-        return self.get_class().query.join(
+    def get_list_by_game_for_player(
+            self, game_id, player_id, limit=None, offset=None, after_id=None, before_id=None, load_profile=None
+    ):
+        query = self.get_query(load_profile).join(
             match_players
         ).filter(
             match_players.c.player_id == player_id,
             self.get_class()._game_id == game_id
-        ).order_by(self.get_class()._id).limit(limit).offset(offset).all()
+        )
 
-    def get_opponent_match(self, game_id, player, opponent_id):
-        # TODO return only the matches for this game with null start and cancel dates as a subquery before joining
+        return self.get_page(query, limit, offset, after_id, before_id)
 
-        return self.get_class().query.join(
+    def get_opponent_match_ids(self, game_id, player_id, opponent_id, limit=None):
+        rows = db.session.query(self.get_class()._id).join(
             match_players
         ).filter(
             self.get_class()._game_id == game_id,
-            self.get_class()._date_started == None,
-            self.get_class()._date_canceled == None,
+            self.get_class()._state == Match.STATE_WAITING[0],
+            self.get_class()._seats_open > 0,
             match_players.c.player_id == opponent_id,
-            # TODO replace with sqlalchemy subquery
-            '{} NOT IN (SELECT player_id FROM match_players WHERE match_players.match_id = matches._id)'.format(
-                player.get_id()
-            )
+            ~self.get_class()._id.in_(self.get_joined_match_ids(player_id).subquery())
         ).order_by(
             self.get_class()._date_created.asc()
-        ).with_for_update().first()
+        ).limit(limit).all()
 
-    def get_random_match(self, game_id, player):
-        return self.get_class().query.join(
-            match_players, Game
-        ).filter(
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def get_joined_match_ids(player_id):
+        return db.session.query(match_players.c.match_id).filter(match_players.c.player_id == player_id)
+
+    def get_open_match_ids(self, game_id, player_id, limit=None):
+        rows = db.session.query(self.get_class()._id).filter(
             self.get_class()._game_id == game_id,
-            self.get_class()._date_started == None,
-            self.get_class()._date_canceled == None,
-            # TODO replace with sqlalchemy subquery
-            '{} NOT IN (SELECT player_id FROM match_players WHERE match_players.match_id = matches._id)'.format(
-                player.get_id()
-            ),
-            # TODO replace with sqlalchemy subquery
-            'games._match_size > (SELECT COUNT(*) FROM match_players WHERE match_players.match_id = matches._id)'
+            self.get_class()._state == Match.STATE_WAITING[0],
+            self.get_class()._seats_open > 0,
+            ~self.get_class()._id.in_(self.get_joined_match_ids(player_id).subquery())
         ).order_by(
             self.get_class()._date_created.asc()
-        ).with_for_update().first()
+        ).limit(limit).all()
+
+        return [row[0] for row in rows]
+
+    def claim_seat(self, match_id, player_id):
+        """
+        Take an open seat in a waiting match for the player, starting the match when it fills up.
+        Returns False without waiting on other joiners if the match no longer has an open seat.
+        The claim is made in a savepoint, so a lost claim leaves the rest of the transaction as it was,
+        and it is committed like a save, once the unit of work it is part of ends, if any.
+        """
+        matches = self.get_class().__table__
+
+        db.session.begin_nested()
+        try:
+            # The conditional decrement is the claim, so no lock is held on the match before this point
+            claimed = db.session.execute(
+                matches.update().where(and_(
+                    matches.c._id == match_id,
+                    matches.c._state == Match.STATE_WAITING[0],
+                    matches.c._seats_open > 0
+                )).values(_seats_open=matches.c._seats_open - 1)
+            ).rowcount == 1
+
+            if claimed:
+                db.session.execute(match_players.insert().values(match_id=match_id, player_id=player_id))
+                db.session.execute(
+                    matches.update().where(and_(
+                        matches.c._id == match_id,
+                        matches.c._state == Match.STATE_WAITING[0],
+                        matches.c._seats_open == 0
+                    )).values(_state=Match.STATE_STARTED[0], _date_started=db.func.current_timestamp())
+                )
+        except Exception:
+            db.session.rollback()
+            raise
+
+        if not claimed:
+            db.session.rollback()
+            return False
+
+        # Release the savepoint, then refresh the match if it is already loaded, since it was updated behind its back
+        db.session.commit()
+        match = db.session.identity_map.get(inspect(self.get_class()).identity_key_from_primary_key([match_id]))
+        if match is not None:
+            db.session.expire(match)
+
+        if not UnitOfWork.is_active():
+            db.session.commit()
+
+        return True
+
+    def join_random_match(self, game_id, player):
+        """Claim a seat for the player in one of the oldest open matches, returning None if none are open"""
+        candidate_ids = self.get_open_match_ids(game_id, player.get_id(), self.CLAIM_CANDIDATE_COUNT)
+        random.shuffle(candidate_ids)
+
+        return self.join_first_match(candidate_ids, player)
+
+    def join_opponent_match(self, game_id, player, opponent_id):
+        """Claim a seat for the player in the oldest open match of the opponent, returning None if none are open"""
+        candidate_ids = self.get_opponent_match_ids(game_id, player.get_id(), opponent_id, self.CLAIM_CANDIDATE_COUNT)
+
+        return self.join_first_match(candidate_ids, player)
+
+    def join_first_match(self, match_ids, player):
+        """Claim a seat for the player in the first of the matches that still has one, returning None if none do"""
+        for match_id in match_ids:
+            if self.claim_seat(match_id, player.get_id()):
+                return self.get(match_id, load_profile=self.LOAD_SERIALIZED)
+
+        return None
 
     def get_for_player(self, match_id, player_id):
         return self.get_class().query.join(
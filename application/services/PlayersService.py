@@ -1,6 +1,6 @@
+from application import auth_token_cache, auth_token_generation_cache
 from application.models.Player import Player
 from application.services.BaseService import BaseService
-from application.services.TurnsService import TurnsService
 
 
 class PlayersService(BaseService):
@@ -8,23 +8,54 @@ class PlayersService(BaseService):
         super(PlayersService, self).__init__(Player)
 
     def get_from_auth(self, auth_token):
-        return self.get_class().query.filter_by(_auth_token=auth_token).first()
+        # Serve the player from the auth token cache when possible, so authenticated requests skip the lookup
+        snapshot = auth_token_cache.get(str(auth_token))
+        if snapshot is not None:
+            return self.get_class().from_snapshot(snapshot)
 
-    def get_from_username(self, username):
-        return self.get_class().query.filter_by(_username=username).first()
+        player = self.get_class().query.filter_by(_auth_token=auth_token).first()
+        if player:
+            auth_token_cache.set(str(auth_token), player.get_snapshot())
+
+        return player
+
+    def get_signed_auth_payload(self, auth_token):
+        # Verify the signature without loading the player, rejecting tokens of a revoked generation
+        payload = self.get_class().load_signed_auth_token(auth_token)
+        if not payload or payload.get('id') is None:
+            return None
+
+        generation = self.get_auth_token_generation(payload.get('id'))
+        if generation is None or generation != payload.get('generation'):
+            return None
 
-    def get_next_selector_for_match(self, match):
-        # Get players in order
-        player_ids = [player.get_id() for player in match.get_players()]
+        return payload
 
-        # Get the last selector
-        last_selector_id = TurnsService.get_instance().get_last_selector_id_for_match(match.get_id())
-        last_selector_index = player_ids.index(last_selector_id)
+    def get_auth_token_generation(self, player_id):
+        """Return the player's current signed auth token generation, or None if there is no such player"""
+        generation = auth_token_generation_cache.get(player_id)
+        if generation is not None:
+            return generation
 
-        if not last_selector_index:
+        # Only the generation column is read, by primary key
+        generation = self.get_class().query.with_entities(
+            self.get_class()._auth_token_generation
+        ).filter_by(_id=player_id).scalar()
+        if generation is not None:
+            auth_token_generation_cache.set(player_id, generation)
+
+        return generation
+
+    def get_from_signed_auth_payload(self, payload):
+        player = self.get(payload.get('id'))
+        if not player:
+            return None
+
+        auth_token_generation_cache.set(player.get_id(), player.get_auth_token_generation())
+        if player.get_auth_token_generation() != payload.get('generation'):
             return None
 
-        # Get the next selector in order
-        return self.get(
-            player_ids[(last_selector_index + 1) % len(player_ids)]
-        )
\ No newline at end of file
+        return player
+
+    def get_from_username(self, username):
+        return self.get_class().query.filter_by(_username=username).first()
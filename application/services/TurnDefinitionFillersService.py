@@ -10,3 +10,11 @@ class TurnDefinitionFillersService(BaseService):
         return self.get_class().query.filter(
             self.get_class()._turn_id == turn_id
         ).all()
+
+    def get_list_by_turns(self, turn_ids):
+        if not turn_ids:
+            return []
+
+        return self.get_class().query.filter(
+            self.get_class()._turn_id.in_(turn_ids)
+        ).order_by(self.get_class()._id).all()
@@ -6,6 +6,15 @@ class TurnPlayersService(BaseService):
     def __init__(self):
         super(TurnPlayersService, self).__init__(TurnPlayer)
 
+    def get_list_by_turns_for_player(self, turn_ids, player_id):
+        if not turn_ids:
+            return []
+
+        return self.get_class().query.filter(
+            self.get_class()._turn_id.in_(turn_ids),
+            self.get_class()._player_id == player_id
+        ).all()
+
     def get_for_turn_by_player(self, turn_id, player_id):
         return self.get_class().query.filter(
             self.get_class()._turn_id == turn_id,
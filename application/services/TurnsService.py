@@ -1,12 +1,17 @@
+from collections import defaultdict
+
 from application.models.Turn import Turn
 from application.models.TurnPlayer import TurnPlayer
+from application.models.UnitOfWork import UnitOfWork
 from application.services.BaseService import BaseService
 from application.services.MatchesService import MatchesService
-from application.services.PlayersService import PlayersService
 from application.services.WordsService import WordsService
 from application.services.TurnDefinitionFillersService import TurnDefinitionFillersService
 from application.services.TurnPlayersService import TurnPlayersService
-from application.controllers.Matches import NOT_FOUND_ERROR, TURN_NOT_FOUND_ERROR
+
+# Set some common error constants
+MATCH_NOT_FOUND_ERROR = {'MatchNotFound': ['Unable to find Match']}
+TURN_NOT_FOUND_ERROR = {'TurnNotFound': ['Unable to find an active turn for the specified match']}
 
 
 class TurnsService(BaseService):
@@ -20,29 +25,40 @@ class TurnsService(BaseService):
             self.get_class()._match_id == match_id,
             self.get_class()._date_completed == None,
             self.get_class()._date_canceled == None,
-            self.get_class()._state in [Turn.STATE_SUPPLYING[0], Turn.STATE_SELECTING[0]]
+            self.get_class()._state.in_([Turn.STATE_SUPPLYING[0], Turn.STATE_SELECTING[0]])
         ).order_by(
             self.get_class()._date_created.asc()
         ).all()
 
-    def get_used_word_ids(self, match_id):
-        return self.get_class().select(
-            self.get_class().word_id
-        ).filter(
-            self.get_class()._match_id == match_id
-        ).all()
-
     def get_last_selector_id_for_match(self, match_id):
-        self.get_class().select(TurnPlayer._player_id).join(
+        row = self.get_class().query.join(
             TurnPlayer
+        ).with_entities(
+            TurnPlayer._player_id
         ).filter(
             self.get_class()._match_id == match_id,
-            TurnPlayer._is_selector is True,
-            self.get_class()._sate != Turn.STATE_CANCELED[0]
+            TurnPlayer._is_selector == True,
+            self.get_class()._state != Turn.STATE_CANCELED[0]
         ).order_by(
-            self.get_class()._date_created().desc()
+            self.get_class()._date_created.desc()
         ).first()
 
+        return row[0] if row else None
+
+    def get_next_selector_for_match(self, match):
+        # Get players in order, which are already loaded with the match
+        players = match.get_players()
+        player_ids = [player.get_id() for player in players]
+
+        # Get the last selector, starting with the first player if there is none
+        last_selector_id = self.get_last_selector_id_for_match(match.get_id())
+        if last_selector_id not in player_ids:
+            return players[0]
+
+        # Get the next selector in order
+        last_selector_index = player_ids.index(last_selector_id)
+        return players[(last_selector_index + 1) % len(player_ids)]
+
     def create_new_turn(self, match):
         # TODO Add logic to determine if we should create a new turn or end the game
 
@@ -50,27 +66,49 @@ class TurnsService(BaseService):
         word = WordsService.get_instance().get_new_word_for_match(match.get_id())
 
         # Determine selector for this turn
-        selector = PlayersService.get_instance().get_next_selector_for_match(match)
+        selector = self.get_next_selector_for_match(match)
+
+        # Save the new turn along with a turn player for each player in the match in one transaction
+        with UnitOfWork() as unit_of_work:
+            turn = self.get_class()(match, selector, word)
+            unit_of_work.add(turn)
 
-        # Save the new turn
-        return self.get_class()(match, selector, word).save()
+        return turn
 
     def get_player_turn(self, match_id, player_id):
+        """
+        Returns ((turn, turn_player, turn_definition_fillers), None) for the turn the player currently has to act
+        on, or (None, errors). The player's turn_player rows and the fillers for every active turn are fetched in
+        one query each, and the current turn is then resolved in memory.
+        """
         # Get the match
         match = MatchesService.get_instance().get_for_player(match_id, player_id)
 
         if not match:
-            return None, NOT_FOUND_ERROR
+            return None, MATCH_NOT_FOUND_ERROR
 
         turns = self.get_active_turns(match_id)
 
         if not turns:
-            turns = [self.create_new_turn(match)]
+            return self.get_new_player_turn(match, player_id), None
+
+        turn_ids = [turn.get_id() for turn in turns]
+
+        turn_players = {
+            turn_player.get_turn_id(): turn_player
+            for turn_player in TurnPlayersService.get_instance().get_list_by_turns_for_player(turn_ids, player_id)
+        }
+
+        turn_definition_fillers_by_turn = defaultdict(list)
+        for turn_definition_filler in TurnDefinitionFillersService.get_instance().get_list_by_turns(turn_ids):
+            turn_definition_fillers_by_turn[turn_definition_filler.get_turn_id()].append(turn_definition_filler)
 
         for i, turn in enumerate(turns):
-            turn_definition_fillers = TurnDefinitionFillersService.get_instance().get_list_by_turn(turn.get_id())
+            turn_player = turn_players.get(turn.get_id())
+            turn_definition_fillers = turn_definition_fillers_by_turn[turn.get_id()]
 
-            turn_player = TurnPlayersService.get_instance().get_for_turn_by_player(turn.get_id(), player_id)
+            if not turn_player:
+                continue
 
             # If this player is the selector for this turn
             if turn_player.get_is_selector():
@@ -84,11 +122,11 @@ class TurnsService(BaseService):
                                 for turn_definition_filler in turn_definition_fillers
                             )
                         ):
-                    return turn, None
+                    return (turn, turn_player, turn_definition_fillers), None
 
                 # If this is not the current turn for this player, and there exists no next turn, create one
                 elif i + 1 == len(turns):
-                    turns = [self.create_new_turn(match)]
+                    return self.get_new_player_turn(match, player_id), None
 
             # Otherwise, if:
             #  - this player is a supplier for this turn, and
@@ -101,6 +139,13 @@ class TurnsService(BaseService):
                 turn_definition_filler.get_selector_id() is not None
                 for turn_definition_filler in turn_definition_fillers
             ):
-                return turn, None
+                return (turn, turn_player, turn_definition_fillers), None
 
         return None, TURN_NOT_FOUND_ERROR
+
+    def get_new_player_turn(self, match, player_id):
+        # A new turn has no fillers yet, so it is always the current turn for every player in the match
+        turn = self.create_new_turn(match)
+        turn_player = TurnPlayersService.get_instance().get_for_turn_by_player(turn.get_id(), player_id)
+
+        return turn, turn_player, []
@@ -1,28 +1,47 @@
 import random
 
+from application import db
+from application.models.Turn import Turn
 from application.models.Word import Word
 from application.services.BaseService import BaseService
-from application.services.TurnsService import TurnsService
 
 
 class WordsService(BaseService):
+    # Random word ids drawn at once when picking a word for a match
+    SAMPLE_SIZE = 8
+
     def __init__(self):
         super(WordsService, self).__init__(Word)
 
-    def get_all_active_ids(self):
-        return self.get_class().select(
-            self.get_class()._id
-        ).filter(
-            self.get_class()._is_active is True
-        ).all()
+    def get_used_ids_for_match(self, match_id):
+        return [row[0] for row in db.session.query(Turn._word_id).filter(Turn._match_id == match_id).all()]
 
     def get_new_word_for_match(self, match_id):
-        excluded_word_ids = TurnsService.get_instance().get_used_word_ids(match_id)
-        valid_ids = self.get_all_active_ids()
-        word = None
-
-        while word is None and len(valid_ids) > 0:
-            valid_ids = list(set(valid_ids) - set(excluded_word_ids))
-            word_id = random.choice(valid_ids)
-            word = self.get(word_id)
-            excluded_word_ids = [word_id]
+        """
+        Pick a random active word that has not been used in the match, with every such word equally likely.
+        Rather than loading every active word id, this draws SAMPLE_SIZE random ids between the lowest and highest
+        word ids and takes the first that is an eligible word, which is uniform however the ids are spread. When
+        none of them are, which is likely only once most words are inactive or used, it counts the eligible words
+        and reads one at a random offset instead.
+        """
+        min_id, max_id = db.session.query(db.func.min(self.get_class()._id), db.func.max(self.get_class()._id)).first()
+        if min_id is None:
+            return None
+
+        query = self.get_class().query.filter(self.get_class()._is_active == True)
+
+        excluded_word_ids = self.get_used_ids_for_match(match_id)
+        if excluded_word_ids:
+            query = query.filter(~self.get_class()._id.in_(excluded_word_ids))
+
+        sample_ids = [random.randint(min_id, max_id) for _ in range(self.SAMPLE_SIZE)]
+        words = {word.get_id(): word for word in query.filter(self.get_class()._id.in_(set(sample_ids))).all()}
+        for sample_id in sample_ids:
+            if sample_id in words:
+                return words[sample_id]
+
+        count = query.count()
+        if not count:
+            return None
+
+        return query.order_by(self.get_class()._id).offset(random.randrange(count)).first()
@@ -0,0 +1,56 @@
+# Measures the cold start of a worker process: importing the application, which is all a script or a test module
+# pays, then create_app registering the hooks and blueprints, which previously happened on import, then serving the
+# first request. Each run is a new interpreter, and the first request does not need a database.
+#
+# Usage: APPLICATION_ENV=testing PYTHONPATH=. python benchmarks/cold_start.py
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPEAT = 10
+STAGES = ['import', 'create_app', 'first_request']
+
+
+def measure():
+    """Time each stage of starting this process, in ms"""
+    timings = {}
+
+    started_at = time.time()
+    import application
+    timings['import'] = (time.time() - started_at) * 1000
+
+    started_at = time.time()
+    app = application.create_app()
+    timings['create_app'] = (time.time() - started_at) * 1000
+
+    started_at = time.time()
+    response = app.test_client().get('/', headers={'Content-Type': 'application/json'})
+    timings['first_request'] = (time.time() - started_at) * 1000
+    assert response.status_code == 200
+
+    print json.dumps(timings)
+
+
+def main():
+    if '--measure' in sys.argv:
+        measure()
+        return
+
+    runs = []
+    for _ in range(REPEAT):
+        output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--measure'])
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    print '{:>14} {:>12} {:>12}'.format('stage', 'median (ms)', 'max (ms)')
+    for stage in STAGES + ['total']:
+        if stage == 'total':
+            timings = sorted(sum(run[name] for name in STAGES) for run in runs)
+        else:
+            timings = sorted(run[stage] for run in runs)
+        print '{:>14} {:>12.1f} {:>12.1f}'.format(stage, timings[len(timings) / 2], timings[-1])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# Measures the cost of rendering every candidate definition of a turn, comparing the previous str.format of each
+# template's definition text with joining the fillers in to definitions compiled once per template.
+#
+# Usage: APPLICATION_ENV=testing PYTHONPATH=. python benchmarks/definitions.py
+import timeit
+
+from application.models.DefinitionTemplate import DefinitionTemplate
+
+FILLER_COUNTS = [2, 10, 100, 1000]
+PLACEHOLDER_COUNTS = [1, 3, 8]
+REPEAT = 5
+
+
+def get_definition(placeholder_count):
+    return 'to be marked by ' + ' or '.join(['a {} manner'] * placeholder_count) + ' in speech'
+
+
+def get_fillers(filler_count, placeholder_count):
+    """Build the fillers of a turn, one per player supplying a definition"""
+    return [
+        ['filler_{}_{}'.format(filler_index, slot) for slot in range(placeholder_count)]
+        for filler_index in range(filler_count)
+    ]
+
+
+def render_with_format(definition, fillers):
+    """The strategy replaced by the compiled definitions, kept here as the baseline"""
+    return [definition.format(*filler) for filler in fillers]
+
+
+def render_with_segments(segments, fillers):
+    return [DefinitionTemplate.render_segments(segments, filler) for filler in fillers]
+
+
+def main():
+    print '{:>10} {:>8} {:>16} {:>16} {:>10}'.format('fillers', 'slots', 'format (ms)', 'segments (ms)', 'speedup')
+
+    for placeholder_count in PLACEHOLDER_COUNTS:
+        definition = get_definition(placeholder_count)
+        segments = DefinitionTemplate.compile_definition(definition)
+
+        for filler_count in FILLER_COUNTS:
+            fillers = get_fillers(filler_count, placeholder_count)
+            number = max(1, 10000 / filler_count)
+
+            assert render_with_format(definition, fillers) == render_with_segments(segments, fillers)
+
+            format_time = min(
+                timeit.repeat(lambda: render_with_format(definition, fillers), repeat=REPEAT, number=number)
+            ) / number * 1000
+            segments_time = min(
+                timeit.repeat(lambda: render_with_segments(segments, fillers), repeat=REPEAT, number=number)
+            ) / number * 1000
+
+            print '{:>10} {:>8} {:>16.3f} {:>16.3f} {:>9.1f}x'.format(
+                filler_count, placeholder_count, format_time, segments_time, format_time / segments_time
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+# Measures the requests per second the production server sustains as its worker processes are scaled up to the
+# number of cores. gunicorn is started with gunicorn_config.py, so the SERVER_* settings and the connection pool
+# sizing tied to them are the ones being measured, and it is sent requests from one client connection per request
+# thread it has.
+#
+# Usage: APPLICATION_ENV=testing PYTHONPATH=. python benchmarks/load.py [path]
+import httplib
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from application import app
+
+HOST = '127.0.0.1'
+PORT = 8099
+DURATION = 5
+STARTUP_TIMEOUT = 30
+HEADERS = {'Content-Type': 'application/json'}
+
+
+def get_process_counts():
+    """Powers of two up to the number of cores, and the number of cores itself"""
+    cores = multiprocessing.cpu_count()
+    process_counts = [1]
+    while process_counts[-1] * 2 < cores:
+        process_counts.append(process_counts[-1] * 2)
+
+    return sorted(set(process_counts + [cores]))
+
+
+def start_server(process_count):
+    root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ, SERVER_PROCESSES=str(process_count))
+    server = subprocess.Popen(
+        [
+            sys.executable, '-c', 'from gunicorn.app.wsgiapp import run; run()',
+            '-c', 'gunicorn_config.py', '--bind', '{}:{}'.format(HOST, PORT), '--log-level', 'warning', 'wsgi:app'
+        ],
+        cwd=root_path, env=environment
+    )
+
+    started_at = time.time()
+    while time.time() - started_at < STARTUP_TIMEOUT:
+        try:
+            socket.create_connection((HOST, PORT), 1).close()
+            return server
+        except socket.error:
+            time.sleep(0.1)
+
+    server.terminate()
+    raise RuntimeError('The server did not start within {}s'.format(STARTUP_TIMEOUT))
+
+
+def stop_server(server):
+    # Gracefully, as a deploy would
+    server.send_signal(signal.SIGTERM)
+    server.wait()
+
+
+def send_requests(path):
+    """Send requests over one keep-alive connection for the duration, returning the latency of each in ms"""
+    latencies = []
+    connection = httplib.HTTPConnection(HOST, PORT)
+    finish_at = time.time() + DURATION
+    while time.time() < finish_at:
+        started_at = time.time()
+        connection.request('GET', path, headers=HEADERS)
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 200
+        latencies.append((time.time() - started_at) * 1000)
+
+    connection.close()
+    return latencies
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else '/'
+    threads = app.config.get('SERVER_THREADS')
+
+    print 'GET {} for {}s, {} threads per process'.format(path, DURATION, threads)
+    print '{:>10} {:>12} {:>12} {:>10} {:>10}'.format('processes', 'connections', 'requests/s', 'p50 (ms)', 'p99 (ms)')
+
+    for process_count in get_process_counts():
+        concurrency = process_count * threads
+        server = start_server(process_count)
+        try:
+            clients = multiprocessing.Pool(concurrency)
+            try:
+                latencies = sorted(sum(clients.map(send_requests, [path] * concurrency), []))
+            finally:
+                clients.terminate()
+        finally:
+            stop_server(server)
+
+        print '{:>10} {:>12} {:>12.1f} {:>10.2f} {:>10.2f}'.format(
+            process_count, concurrency, len(latencies) / float(DURATION),
+            latencies[len(latencies) / 2], latencies[int(len(latencies) * 0.99)]
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+# Measures how matchmaking throughput scales with the number of concurrent joiners, comparing the
+# previous SELECT ... FOR UPDATE strategy with claiming seats through MatchesService.join_random_match.
+#
+# Usage: APPLICATION_ENV=testing PYTHONPATH=. python benchmarks/matchmaking.py
+import os
+import sys
+import time
+import threading
+
+from application import db
+from application.models.Game import Game
+from application.models.Match import Match, match_players
+from application.models.Player import Player
+from application.services.MatchesService import MatchesService
+
+JOINERS_PER_THREAD = 25
+THREAD_COUNTS = [1, 2, 4, 8, 16]
+MATCH_SIZE = 2
+
+
+def lock_and_join(game, player):
+    """The strategy replaced by join_random_match, kept here as the baseline"""
+    match = Match.query.join(match_players).filter(
+        Match._game_id == game.get_id(),
+        Match._date_started == None,
+        Match._date_canceled == None,
+        '{} NOT IN (SELECT player_id FROM match_players WHERE match_players.match_id = matches._id)'.format(
+            player.get_id()
+        ),
+        '{} > (SELECT COUNT(*) FROM match_players WHERE match_players.match_id = matches._id)'.format(MATCH_SIZE)
+    ).order_by(Match._date_created.asc()).with_for_update().first()
+
+    if not match:
+        db.session.rollback()
+        return False
+
+    match.add_player(player)
+    match.save()
+    return True
+
+
+def claim_and_join(game, player):
+    return MatchesService.get_instance().join_random_match(game.get_id(), player) is not None
+
+
+def set_up(thread_count):
+    db.drop_all()
+    db.create_all()
+
+    game = Game('benchmark', 'matchmaking benchmark', MATCH_SIZE, 4)
+    game.save()
+
+    joiner_count = thread_count * JOINERS_PER_THREAD
+    for index in range(joiner_count):
+        db.session.add(Player('creator_{}'.format(index), 'password', 'creator_{}@test.com'.format(index), None))
+        db.session.add(Player('joiner_{}'.format(index), 'password', 'joiner_{}@test.com'.format(index), None))
+    db.session.commit()
+
+    # One waiting match per joiner, so every join can succeed
+    for creator in Player.query.filter(Player._username.like('creator_%')).all():
+        db.session.add(Match(game, creator))
+    db.session.commit()
+
+    game_id = game.get_id()
+    joiner_ids = [player.get_id() for player in Player.query.filter(Player._username.like('joiner_%')).all()]
+    db.session.remove()
+
+    return game_id, joiner_ids
+
+
+def run(strategy, thread_count):
+    game_id, joiner_ids = set_up(thread_count)
+    joined = []
+    lock = threading.Lock()
+
+    def worker(player_ids):
+        game = Game.query.get(game_id)
+        count = 0
+        for player_id in player_ids:
+            if strategy(game, Player.query.get(player_id)):
+                count += 1
+        db.session.remove()
+
+        with lock:
+            joined.append(count)
+
+    threads = [
+        threading.Thread(target=worker, args=(joiner_ids[index::thread_count],)) for index in range(thread_count)
+    ]
+
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+
+    return sum(joined), elapsed
+
+
+def main():
+    if os.environ.get('APPLICATION_ENV') != 'testing':
+        sys.exit('The benchmark recreates the database, so it must be run with APPLICATION_ENV=testing')
+
+    print '{:>8} {:>16} {:>8} {:>12}'.format('threads', 'strategy', 'joins', 'joins/sec')
+    for thread_count in THREAD_COUNTS:
+        for name, strategy in [('lock_and_join', lock_and_join), ('claim_and_join', claim_and_join)]:
+            joins, elapsed = run(strategy, thread_count)
+            print '{:>8} {:>16} {:>8} {:>12.1f}'.format(thread_count, name, joins, joins / elapsed)
+
+    db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
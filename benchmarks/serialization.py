@@ -0,0 +1,62 @@
+# Measures the per-response overhead of encoding an index page of players, comparing the previous rendering
+# of the players/index.json template through Jinja's tojson filter with the direct JSON path of render_view.
+#
+# Usage: APPLICATION_ENV=testing PYTHONPATH=. python benchmarks/serialization.py
+import timeit
+
+from application import app
+from application.controllers import render_json, render_template_type, json_encoder
+
+PAGE_SIZES = [10, 100, 1000, 10000]
+REPEAT = 5
+
+
+def get_players(page_size):
+    """Build an index page in the same shape as the players controller's index view"""
+    return {
+        player_id: {
+            'id': player_id,
+            'date_created': '2015-01-01 00:00:00',
+            'date_modified': '2015-01-01 00:00:00',
+            'username': 'player_{}'.format(player_id),
+            'email': 'player_{}@test.com'.format(player_id),
+            'avatar_url': 'http://cdn.balderdash.com/avatars/player_{}.jpg'.format(player_id),
+            'is_active': True,
+            'facebook_id': None
+        }
+        for player_id in range(1, page_size + 1)
+    }
+
+
+def render_with_template(players):
+    return render_template_type('players/index', 'json', 200, 'application/json', {'players': players})
+
+
+def render_directly(players):
+    return render_json('players/index', 200, {'players': players})
+
+
+def main():
+    print 'Direct JSON encoder: {}'.format(json_encoder.__name__)
+    print '{:>10} {:>16} {:>16} {:>10}'.format('records', 'template (ms)', 'direct (ms)', 'speedup')
+
+    with app.test_request_context(content_type='application/json'):
+        for page_size in PAGE_SIZES:
+            players = get_players(page_size)
+            number = max(1, 10000 / page_size)
+
+            results = []
+            for render in [render_with_template, render_directly]:
+                # Render once up front so template compilation is not counted
+                render(players)
+                best = min(timeit.repeat(lambda: render(players), repeat=REPEAT, number=number))
+                results.append(best / number * 1000)
+
+            template_time, direct_time = results
+            print '{:>10} {:>16.3f} {:>16.3f} {:>9.1f}x'.format(
+                page_size, template_time, direct_time, template_time / direct_time
+            )
+
+
+if __name__ == '__main__':
+    main()
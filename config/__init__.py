@@ -5,4 +5,7 @@ env_config = 'config.{}'.format(environment)
 
 
 def env_bool(env_param, default=False):
-    return str(os.environ.get(env_param, default)).lower() in ['true', '1', 'y', 'yes']
\ No newline at end of file
+    return str(os.environ.get(env_param, default)).lower() in ['true', '1', 'y', 'yes']
+
+def env_int(env_param, default=0):
+    return int(os.environ.get(env_param, default))
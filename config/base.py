@@ -1,4 +1,6 @@
-from config import env_bool
+import multiprocessing
+
+from config import env_bool, env_int
 
 # Statement for enabling the development environment
 DEBUG = True
@@ -6,13 +8,82 @@ PRINT_SQL = env_bool('PRINT_SQL', False)
 
 # Define the database - we are working with
 SQLALCHEMY_DATABASE_URI = 'mysql://root@localhost/balderdash'
+# Keyword arguments passed to the database driver's connect()
 DATABASE_CONNECT_OPTIONS = {}
 
-# Application threads. A common general assumption is
-# using 2 per available processor cores - to handle
-# incoming requests using one and performing background
-# operations using the other.
-THREADS_PER_PAGE = 2
+# Auth tokens are either random tokens stored on the player ('database'), or
+# tokens signed with the SECRET_KEY carrying the player id, issue time and token
+# generation ('signed'), which are verified without loading the player.
+# Signing out bumps the generation, revoking every signed token for the player.
+AUTH_TOKEN_MODE = 'database'
+AUTH_TOKEN_MAX_AGE = 60 * 60 * 24 * 30
+
+# Every request with a signed auth token checks the player's current generation,
+# looked up by primary key and cached in-process for this TTL. The TTL bounds
+# how long a token revoked through another process stays valid.
+AUTH_TOKEN_GENERATION_CACHE_TTL = 10
+
+# Authenticated players are cached in-process by auth token so that hot
+# requests do not need to look the player up. Since the cache is per process,
+# the TTL bounds how long a token revoked through another process stays valid.
+AUTH_TOKEN_CACHE_SIZE = 4096
+AUTH_TOKEN_CACHE_TTL = 300
+
+# The serialized form of catalog records (words, definition templates and
+# definition fillers) is cached in-process per record version. Records saved
+# through another process are picked up once their modification date changes,
+# or once the TTL expires. Records whose nested records are not loaded are
+# serialized without the cache, rather than loading them to compare versions.
+SERIALIZATION_CACHE_SIZE = 16384
+SERIALIZATION_CACHE_TTL = 3600
+
+# Definition templates are compiled in to the literal text around their
+# fillers once per template, and kept for as long as the cache has room.
+DEFINITION_SEGMENTS_CACHE_SIZE = 16384
+
+# Records fetched by id through these services are cached with the given size
+# and TTL in seconds, so hot catalog reads skip the database. Saves drop the
+# cached copy in the saving process, and the TTL bounds how long any other
+# process can serve a stale copy. The backend is any BaseCache implementation.
+SERVICE_CACHE_BACKEND = 'application.cache.LRUCache.LRUCache'
+SERVICE_CACHES = {
+    'GamesService': {'size': 256, 'ttl': 300},
+    'WordsService': {'size': 16384, 'ttl': 3600},
+    'DefinitionTemplatesService': {'size': 16384, 'ttl': 3600}
+}
+
+# Each request's SQL statement count and database, JSON encoding and template
+# time are reported in a Server-Timing header, and aggregated per endpoint in
+# the process. The aggregate is served at /stats when its endpoint is enabled,
+# which only development and testing do.
+INSTRUMENTATION_ENABLED = env_bool('INSTRUMENTATION', True)
+INSTRUMENTATION_STATS_ENDPOINT_ENABLED = False
+
+# The production server (gunicorn, see gunicorn_config.py) runs this many
+# worker processes, which scale across cores, each serving requests on this
+# many threads, which overlap each other's database round trips. Preloading
+# imports the application once in the master, ahead of forking the workers.
+# Workers are given the graceful timeout in seconds to finish their requests
+# when the server is reloaded or stopped.
+SERVER_PROCESSES = env_int('SERVER_PROCESSES', multiprocessing.cpu_count() * 2 + 1)
+SERVER_THREADS = env_int('SERVER_THREADS', 2)
+SERVER_PRELOAD = env_bool('SERVER_PRELOAD', True)
+SERVER_GRACEFUL_TIMEOUT = 30
+
+# Every process has its own connection pool, and serves one request per thread
+# at a time, so by default the pool keeps a connection per thread, and may open
+# as many again for code holding a second connection. The server opens at most
+# SERVER_PROCESSES * (pool size + overflow) connections, which MySQL's
+# max_connections must allow. A checkout waits up to the timeout in seconds for
+# a connection once the pool is exhausted. Connections are replaced well ahead
+# of MySQL's wait_timeout closing them, and pre-pinging tests each connection as
+# it is checked out, replacing those the server has closed regardless. The
+# checkouts are reported through the instrumentation.
+SQLALCHEMY_POOL_SIZE = env_int('DATABASE_POOL_SIZE', SERVER_THREADS)
+SQLALCHEMY_MAX_OVERFLOW = env_int('DATABASE_MAX_OVERFLOW', SERVER_THREADS)
+SQLALCHEMY_POOL_TIMEOUT = env_int('DATABASE_POOL_TIMEOUT', 10)
+SQLALCHEMY_POOL_RECYCLE = env_int('DATABASE_POOL_RECYCLE', 3600)
+DATABASE_POOL_PRE_PING = env_bool('DATABASE_POOL_PRE_PING', True)
 
 # Enable protection agains *Cross-site Request Forgery (CSRF)*
 CSRF_ENABLED = False
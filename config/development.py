@@ -1 +1,4 @@
 PORT = 8181
+
+# Publish the request metrics of the development server at /stats
+INSTRUMENTATION_STATS_ENDPOINT_ENABLED = True
@@ -1,3 +1,26 @@
-SQLALCHEMY_DATABASE_URI = 'mysql://root@localhost/test_balderdash'
+import os
+
+from config import env_bool
+
+# Tests sharded across processes each run with their own TEST_WORKER_ID, and so against their own MySQL database.
+# Every process has its own in-memory SQLite database regardless.
+TEST_WORKER_ID = os.environ.get('TEST_WORKER_ID')
+TEST_DATABASE_NAME = 'test_balderdash_{}'.format(TEST_WORKER_ID) if TEST_WORKER_ID else 'test_balderdash'
+
+# Tests run against MySQL, or against an in-memory SQLite database with
+# TEST_DATABASE=sqlite, which skips the tests that need MySQL.
+TEST_DATABASE_URIS = {
+    'mysql': 'mysql://root@localhost/{}'.format(TEST_DATABASE_NAME),
+    'sqlite': 'sqlite://'
+}
+SQLALCHEMY_DATABASE_URI = TEST_DATABASE_URIS.get(os.environ.get('TEST_DATABASE', 'mysql'))
+
+# Each test runs in a transaction that is rolled back, over a schema that is
+# built and seeded once. TEST_TRANSACTIONS=no rebuilds it for every test.
+TEST_TRANSACTIONS = env_bool('TEST_TRANSACTIONS', True)
+
 TESTING = True
 DEBUG = False
+
+# Publish the request metrics at /stats, so that the instrumentation can be tested
+INSTRUMENTATION_STATS_ENDPOINT_ENABLED = True
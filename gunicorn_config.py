@@ -0,0 +1,17 @@
+# Settings of the production server, taken from the application's configuration (SERVER_* in config/base.py).
+# The master imports the application to read them, so its workers, whether preloaded or not, always run the code and
+# settings it started with, and sending it HUP only replaces the workers with identical ones. To deploy new code or
+# settings without downtime, send the master USR2 to start a new master alongside it, then send the old master QUIT
+# once the new one is serving.
+from application import app, db
+
+bind = '{}:{}'.format(app.config.get('HOST'), app.config.get('PORT'))
+workers = app.config.get('SERVER_PROCESSES')
+threads = app.config.get('SERVER_THREADS')
+preload_app = app.config.get('SERVER_PRELOAD')
+graceful_timeout = app.config.get('SERVER_GRACEFUL_TIMEOUT')
+
+
+def post_fork(server, worker):
+    # Workers open their own connections, rather than sharing any the master opened while preloading
+    db.engine.dispose()
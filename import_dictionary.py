@@ -0,0 +1,36 @@
+# Bulk load words, definition templates and definition fillers from an NDJSON or CSV file.
+import argparse
+
+from application.services.DictionaryImportService import DictionaryImportService
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk load words, definition templates and definition fillers')
+    parser.add_argument('path', help='NDJSON file with one word per line, or CSV file with one filler per row')
+    parser.add_argument(
+        '--format', choices=DictionaryImportService.FORMATS, help='Defaults to csv for .csv files, ndjson otherwise'
+    )
+    parser.add_argument('--batch-size', type=int, default=DictionaryImportService.DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    input_format = args.format
+    if input_format is None:
+        input_format = DictionaryImportService.FORMAT_CSV \
+            if args.path.endswith('.csv') else DictionaryImportService.FORMAT_NDJSON
+
+    with open(args.path, 'rb') as lines:
+        imported, errors = DictionaryImportService.get_instance().import_lines(lines, input_format, args.batch_size)
+
+    for error in errors:
+        if 'lines' in error:
+            print 'Stopped at lines {}-{}, which were not imported: {}'.format(error['lines'][0], error['lines'][1],
+                                                                                error['errors'])
+        else:
+            print 'Skipped line {}: {}'.format(error['line'], error['errors'])
+
+    print 'Imported {words} words, {definition_templates} definition templates and ' \
+          '{definition_fillers} definition fillers'.format(**imported)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+# Apply the pending schema migrations, which creates the whole schema on a new database.
+from application import migrations
+
+
+def main():
+    applied = migrations.upgrade()
+    for version, changes in applied:
+        print 'Applied {}'.format(version)
+        for change in changes:
+            print '  {}'.format(change)
+
+    if not applied:
+        print 'The schema is up to date'
+
+
+if __name__ == '__main__':
+    main()
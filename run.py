@@ -1,3 +1,9 @@
 # Run a test server.
-from application import app
+from application import create_app, migrations
+
+app = create_app()
+
+# Bring the development database up to date before serving
+migrations.upgrade()
+
 app.run(host=app.config.get('HOST'), port=app.config.get('PORT'), debug=app.config.get('DEBUG'))
@@ -1,12 +1,30 @@
+import atexit
 import os
 import unittest
 
-from application import db
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import partial
+
+from flask.ext.sqlalchemy import SignallingSession
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.orm import scoped_session
+
+from application import (
+    create_app, db, auth_token_cache, auth_token_generation_cache, serialization_cache, definition_segments_cache
+)
+from application.models.Base import Base
 from application.models.Word import Word
 from application.models.DefinitionTemplate import DefinitionTemplate
 from application.models.DefinitionFiller import DefinitionFiller
+from application.models.UnitOfWork import UnitOfWork
+from application.services.BaseService import BaseService
 
 
+app = create_app()
+
 WORDS = [
     {
         'lexeme_form': 'capricious',
@@ -79,11 +97,94 @@ WORDS = [
 ]
 
 
+# Transaction control statements, such as those isolating each session within a test, which are not counted against
+# query counts
+TRANSACTION_STATEMENTS = ('BEGIN', 'SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+# Stands in for a dummy record between tests, which is loaded again by id in each test's transaction
+DummyRecord = namedtuple('DummyRecord', ['model', 'id'])
+
+
+class ConnectionBoundSession(SignallingSession):
+    """
+    Session that sends every statement through the test's connection, inside a savepoint. Committing or rolling back
+    the session only ends the savepoint, and a new one is started, so the test's transaction is never ended.
+    """
+
+    def __init__(self, db, connection, **options):
+        super(ConnectionBoundSession, self).__init__(db, bind=connection, **options)
+        self._closing = False
+        self.begin_nested()
+
+    def get_bind(self, mapper=None, clause=None):
+        return self.bind
+
+    def close(self):
+        self._closing = True
+        super(ConnectionBoundSession, self).close()
+
+
+@event.listens_for(ConnectionBoundSession, 'after_transaction_end')
+def restart_savepoint(session, transaction):
+    if transaction.nested and not transaction._parent.nested and not session._closing:
+        session.expire_all()
+        session.begin_nested()
+
+
+# The sqlite driver neither begins transactions nor supports savepoints on its own
+if db.engine.dialect.name == 'sqlite':
+    @event.listens_for(db.engine, 'connect')
+    def disable_sqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(db.engine, 'begin')
+    def begin_sqlite_transaction(connection):
+        connection.execute('BEGIN')
+
+
+def execute_on_server(statement):
+    """Execute the statement on the test database's server, outside of any database"""
+    url = make_url(app.config.get('SQLALCHEMY_DATABASE_URI'))
+    url.database = None
+    engine = create_engine(url)
+    try:
+        engine.execute(statement)
+    finally:
+        engine.dispose()
+
+
+def create_worker_database():
+    database = db.engine.dialect.identifier_preparer.quote(app.config.get('TEST_DATABASE_NAME'))
+    execute_on_server('CREATE DATABASE IF NOT EXISTS {}'.format(database))
+    atexit.register(drop_worker_database)
+
+
+def drop_worker_database():
+    db.session.remove()
+    db.engine.dispose()
+    database = db.engine.dialect.identifier_preparer.quote(app.config.get('TEST_DATABASE_NAME'))
+    execute_on_server('DROP DATABASE IF EXISTS {}'.format(database))
+
+
+# Each worker of a sharded test run creates its own database, and drops it once its tests are done
+if app.config.get('TEST_WORKER_ID') and db.engine.dialect.name == 'mysql':
+    create_worker_database()
+
+
 class TestCase(unittest.TestCase):
     NUM_WORDS = 0
     NUM_DEFINITION_TEMPLATES = 0
     NUM_DEFINITION_FILLERS = 0
 
+    # Run each test in a transaction that is rolled back, rather than building and seeding the schema for each test
+    TRANSACTIONAL = True
+    # Skip the test when the tests are run against a database other than MySQL
+    REQUIRES_MYSQL = False
+
+    # Key of the dummy data the database is seeded with, and the attributes it set on the test that seeded it
+    _dummy_data_key = None
+    _dummy_data = None
+
     def run(self, result=None):
         # Abort the test suite on the first failure
         # Taken from http://stackoverflow.com/questions/685424/pyunit-stop-after-first-failing-test
@@ -98,33 +199,137 @@ class TestCase(unittest.TestCase):
         environment = os.environ.get('APPLICATION_ENV', 'testing')
         self.assertEqual(environment, 'testing')
 
+        if self.REQUIRES_MYSQL and db.engine.dialect.name != 'mysql':
+            self.skipTest('Requires MySQL')
+
+        if not self.is_transactional():
+            TestCase._dummy_data_key = None
+            db.drop_all()
+            db.create_all()
+            self.insert_dummy_data()
+            return
+
+        # Build and seed the schema once for each kind of dummy data, rather than for every test
+        if TestCase._dummy_data_key != self.get_dummy_data_key():
+            self.seed_dummy_data()
+
+        self.begin_test_transaction()
+        self.load_dummy_data()
+
+    def is_transactional(self):
+        return self.TRANSACTIONAL and app.config.get('TEST_TRANSACTIONS', False)
+
+    def get_dummy_data_key(self):
+        """Tests share seeded dummy data when they insert it the same way, with the same amounts"""
+        test_class = type(self)
+        return (test_class.insert_dummy_data.im_func,) + tuple(
+            (name, getattr(test_class, name)) for name in sorted(dir(test_class)) if name.startswith('NUM_')
+        )
+
+    def seed_dummy_data(self):
+        db.session.remove()
+        db.drop_all()
         db.create_all()
+
+        attributes = set(vars(self))
         self.insert_dummy_data()
+        db.session.commit()
+
+        dummy_data = {}
+        for name in set(vars(self)) - attributes:
+            value = getattr(self, name)
+            dummy_data[name] = DummyRecord(type(value), value.get_id()) if isinstance(value, Base) else value
 
-    def tearDown(self):
         db.session.remove()
-        db.drop_all()
+        TestCase._dummy_data = dummy_data
+        TestCase._dummy_data_key = self.get_dummy_data_key()
+
+    def load_dummy_data(self):
+        for name, value in TestCase._dummy_data.iteritems():
+            if isinstance(value, DummyRecord):
+                value = db.session.query(value.model).get(value.id) if value.id is not None else None
+            setattr(self, name, value)
+
+    def begin_test_transaction(self):
+        """Send every statement of the test through one connection, in a transaction that is rolled back after it"""
+        self.connection = db.engine.connect()
+        self.transaction = self.connection.begin()
+        self.application_session = db.session
+        db.session = scoped_session(partial(ConnectionBoundSession, db, self.connection))
+
+    def end_test_transaction(self):
+        db.session.remove()
+        db.session = self.application_session
+
+        # Application code that ends the whole transaction leaves the seeded dummy data in an unknown state
+        if not self.transaction.is_active:
+            TestCase._dummy_data_key = None
+        else:
+            self.transaction.rollback()
+
+        self.connection.close()
+
+    @contextmanager
+    def count_queries(self):
+        """Collect the SQL statements issued within the block"""
+        statements = []
+
+        def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+            if not statement.startswith(TRANSACTION_STATEMENTS):
+                statements.append((statement, parameters))
+
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(Engine, 'before_cursor_execute', before_cursor_execute)
+
+    @contextmanager
+    def assertNumQueries(self, num_queries):
+        """Fail unless the block issues exactly num_queries SQL statements, so a path getting cheaper is noticed too"""
+        with self.count_queries() as statements:
+            yield statements
+
+        if len(statements) != num_queries:
+            self.fail('{} queries were issued, instead of {}:\n{}'.format(
+                len(statements), num_queries, '\n'.join(statement for statement, parameters in statements)
+            ))
+
+    def tearDown(self):
+        if hasattr(self, 'transaction'):
+            self.end_test_transaction()
+        else:
+            db.session.remove()
+            if not self.is_transactional():
+                db.drop_all()
+
+        auth_token_cache.clear()
+        auth_token_generation_cache.clear()
+        serialization_cache.clear()
+        definition_segments_cache.clear()
+        BaseService.clear_record_caches()
 
     def insert_dummy_data(self):
         word = None
         definition_template = None
         definition_filler = None
-        for word_data in WORDS:
-            word = Word(word_data.get('lexeme_form'), word_data.get('lexical_class'))
-            word.save()
-            self.NUM_WORDS += 1
-            for template_data in word_data.get('definition_templates', []):
-                definition_template = DefinitionTemplate(
-                    word, template_data.get('definition'), template_data.get('filler_lexical_classes')
-                )
-                definition_template.save()
-                self.NUM_DEFINITION_TEMPLATES += 1
-                for filler_data in template_data.get('definition_fillers', []):
-                    definition_filler = DefinitionFiller(
-                        definition_template, filler_data.get('filler'), filler_data.get('is_dictionary')
+        with UnitOfWork():
+            for word_data in WORDS:
+                word = Word(word_data.get('lexeme_form'), word_data.get('lexical_class'))
+                word.save()
+                self.NUM_WORDS += 1
+                for template_data in word_data.get('definition_templates', []):
+                    definition_template = DefinitionTemplate(
+                        word, template_data.get('definition'), template_data.get('filler_lexical_classes')
                     )
-                    definition_filler.save()
-                    self.NUM_DEFINITION_FILLERS += 1
+                    definition_template.save()
+                    self.NUM_DEFINITION_TEMPLATES += 1
+                    for filler_data in template_data.get('definition_fillers', []):
+                        definition_filler = DefinitionFiller(
+                            definition_template, filler_data.get('filler'), filler_data.get('is_dictionary')
+                        )
+                        definition_filler.save()
+                        self.NUM_DEFINITION_FILLERS += 1
 
         self.word = word
         self.definition_template = definition_template
@@ -0,0 +1,105 @@
+import unittest
+import pickle
+
+from common import NoAuthTest
+from application import db
+from application.models.ColumnTypes import CodedList, JSONEncodedList
+from application.models.DefinitionFiller import DefinitionFiller
+from application.models.DefinitionTemplate import DefinitionTemplate
+from application.models.Word import Word
+
+
+def pickle_legacy(value):
+    """Pickle the value as the old PickleType columns stored it"""
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+class ColumnTypesJSONEncodedList(NoAuthTest):
+
+    def setUp(self):
+        super(ColumnTypesJSONEncodedList, self).setUp()
+        self.column_type = JSONEncodedList()
+        self.dialect = db.engine.dialect
+
+    def round_trip(self, value):
+        return self.column_type.process_result_value(
+            self.column_type.process_bind_param(value, self.dialect), self.dialect
+        )
+
+    def test_encodes_compact_json(self):
+        self.assertEqual('["sudden","unpredictable"]', self.column_type.process_bind_param(
+            ['sudden', 'unpredictable'], self.dialect
+        ))
+
+    def test_round_trips_values(self):
+        for value in [[], ['sudden'], ['sudden', 'unpredictable', 'changes'], [u'caf\xe9', '{}', 'a, b'], None]:
+            self.assertEqual(value, self.round_trip(value))
+
+    def test_reads_legacy_pickled_values(self):
+        for value in [[], ['sudden'], ['sudden', 'unpredictable', 'changes'], [u'caf\xe9', '{}']]:
+            self.assertEqual(value, self.column_type.process_result_value(pickle_legacy(value), self.dialect))
+            self.assertEqual(value, self.column_type.process_result_value(buffer(pickle_legacy(value)), self.dialect))
+
+    def test_round_trips_through_database(self):
+        definition_filler = DefinitionFiller(self.definition_template, ['a', 'b', 'c'], False)
+        definition_filler.save()
+        definition_filler_id = definition_filler.get_id()
+
+        stored = db.session.execute(
+            'SELECT _filler FROM definition_fillers WHERE _id = :id', {'id': definition_filler_id}
+        ).scalar()
+        self.assertEqual('["a","b","c"]', stored)
+
+        db.session.expire(definition_filler)
+        self.assertEqual(['a', 'b', 'c'], definition_filler.get_filler())
+
+
+class ColumnTypesCodedList(NoAuthTest):
+
+    def setUp(self):
+        super(ColumnTypesCodedList, self).setUp()
+        self.column_type = CodedList(Word.LEXICAL_CLASSES, DefinitionTemplate.DEFINITION_MAX_LENGTH)
+        self.dialect = db.engine.dialect
+
+    def round_trip(self, value):
+        return self.column_type.process_result_value(
+            self.column_type.process_bind_param(value, self.dialect), self.dialect
+        )
+
+    def test_encodes_choice_indexes(self):
+        self.assertEqual(
+            ','.join(str(Word.LEXICAL_CLASSES.index(choice)) for choice in ['verb', 'noun', 'verb']),
+            self.column_type.process_bind_param(['verb', 'noun', 'verb'], self.dialect)
+        )
+
+    def test_round_trips_values(self):
+        for value in [[], ['noun'], ['adjective', 'adjective', 'noun'], list(Word.LEXICAL_CLASSES), None]:
+            self.assertEqual(value, self.round_trip(value))
+
+    def test_round_trips_through_database(self):
+        definition_template = DefinitionTemplate(self.word, 'the {} of {}', ['adjective', 'noun'])
+        definition_template.save()
+
+        stored = db.session.execute(
+            'SELECT _filler_lexical_classes FROM definition_templates WHERE _id = :id',
+            {'id': definition_template.get_id()}
+        ).scalar()
+        self.assertEqual(self.column_type.process_bind_param(['adjective', 'noun'], self.dialect), stored)
+
+        db.session.expire(definition_template)
+        self.assertEqual(['adjective', 'noun'], definition_template.get_filler_lexical_classes())
+
+    def test_errors_for_unknown_choice(self):
+        self.assertRaises(KeyError, self.column_type.process_bind_param, ['noun', 'not a class'], self.dialect)
+
+    def test_reads_legacy_pickled_values(self):
+        for value in [[], ['noun'], ['adjective', 'adjective', 'noun']]:
+            self.assertEqual(value, self.column_type.process_result_value(pickle_legacy(value), self.dialect))
+            self.assertEqual(value, self.column_type.process_result_value(buffer(pickle_legacy(value)), self.dialect))
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,10 @@
 import unittest
 import json
 
+from sqlalchemy import inspect
+
 from common import NoAuthTest
+from application import db
 from application.models.DefinitionFiller import DefinitionFiller
 from application.services.DefinitionFillersService import DefinitionFillersService
 
@@ -10,16 +13,61 @@ class DefinitionFillersIndex(NoAuthTest):
 
     def test_index_returns_all_definition_fillers(self):
         index_url = '/definition_fillers'
-        response = self.get(index_url)
+        with self.assertNumQueries(1):
+            response = self.get(index_url)
         self.assertEqual(200, response.status_code)
         definition_fillers = json.loads(response.data)
         self.assertEqual(self.NUM_DEFINITION_FILLERS, len(definition_fillers))
 
+    def test_index_streams_definition_fillers_as_ndjson(self):
+        index_url = '/definition_fillers'
+        with self.assertNumQueries(1):
+            response = self.get(index_url, headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(200, response.status_code)
+        self.assertTrue(response.content_type.startswith('application/x-ndjson'))
+        definition_fillers = [json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual(self.NUM_DEFINITION_FILLERS, len(definition_fillers))
+        self.assertEqual(
+            sorted(definition_filler.get('id') for definition_filler in definition_fillers),
+            [definition_filler.get('id') for definition_filler in definition_fillers]
+        )
+        self.assertIsNotNone(definition_fillers[0].get('definition_template').get('word'))
+
+    def test_index_streams_definition_fillers_across_batches(self):
+        # Stream the dummy fillers in several batches, each with its templates and words joined in
+        self.addCleanup(
+            setattr, DefinitionFillersService, 'STREAM_BATCH_SIZE', DefinitionFillersService.STREAM_BATCH_SIZE
+        )
+        DefinitionFillersService.STREAM_BATCH_SIZE = 2
+        self.assertGreater(self.NUM_DEFINITION_FILLERS, DefinitionFillersService.STREAM_BATCH_SIZE)
+        expected_ids = [
+            definition_filler.get_id() for definition_filler in DefinitionFillersService.get_instance().get_list()
+        ]
+
+        # Each batch is one query, and streaming stops at the first batch to come back short
+        with self.assertNumQueries(self.NUM_DEFINITION_FILLERS // DefinitionFillersService.STREAM_BATCH_SIZE + 1):
+            response = self.get('/definition_fillers', headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(200, response.status_code)
+        definition_fillers = [json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual(expected_ids, [definition_filler.get('id') for definition_filler in definition_fillers])
+        for definition_filler in definition_fillers:
+            self.assertIsNotNone(definition_filler.get('definition_template').get('word'))
+
+    def test_list_eager_loads_serialized_relationships(self):
+        definition_fillers = DefinitionFillersService.get_instance().get_list(
+            load_profile=DefinitionFillersService.LOAD_SERIALIZED
+        )
+        self.assertEqual(self.NUM_DEFINITION_FILLERS, len(definition_fillers))
+        for definition_filler in definition_fillers:
+            self.assertNotIn('_definition_template', inspect(definition_filler).unloaded)
+            self.assertNotIn('_word', inspect(definition_filler.get_definition_template()).unloaded)
+
     def test_index_returns_limited_definition_fillers(self):
         index_url = '/definition_fillers'
         limit = int(self.NUM_DEFINITION_FILLERS / 2)
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_fillers = json.loads(response.data)
         self.assertTrue(len(definition_fillers) > 0)
@@ -29,7 +77,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         offset = int(self.NUM_DEFINITION_FILLERS / 2)
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_fillers = json.loads(response.data)
         self.assertEqual(self.NUM_DEFINITION_FILLERS - offset, len(definition_fillers))
@@ -38,7 +87,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         limit = '2.5'
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -50,7 +100,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         limit = -1
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -62,7 +113,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         offset = '2.5'
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -74,7 +126,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         offset = -1
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -86,7 +139,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         word_id = self.word.get_id()
         query_string = {'word_id': word_id}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_fillers = json.loads(response.data)
         definition_fillers_from_db = DefinitionFillersService.get_instance().get_list_by_word(word_id)
@@ -99,7 +153,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         word_id = 0
         query_string = {'word_id': word_id}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -111,7 +166,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         word_id = -1
         query_string = {'word_id': word_id}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -123,7 +179,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         word_id = '2.5'
         query_string = {'word_id': word_id}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -137,7 +194,8 @@ class DefinitionFillersIndex(NoAuthTest):
         definition_fillers_from_db = DefinitionFillersService.get_instance().get_list_by_word(word_id)
         limit = int(len(definition_fillers_from_db) / 2)
         query_string = {'word_id': word_id, 'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_fillers = json.loads(response.data)
         self.assertTrue(len(definition_fillers) > 0)
@@ -149,7 +207,8 @@ class DefinitionFillersIndex(NoAuthTest):
         definition_fillers_from_db = DefinitionFillersService.get_instance().get_list_by_word(word_id)
         offset = int(len(definition_fillers_from_db) / 2)
         query_string = {'word_id': word_id, 'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_fillers = json.loads(response.data)
         self.assertEqual(len(definition_fillers_from_db) - offset, len(definition_fillers))
@@ -158,7 +217,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         definition_template_id = self.definition_template.get_id()
         query_string = {'definition_template_id': definition_template_id}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_fillers = json.loads(response.data)
         definition_fillers_from_db = DefinitionFillersService.get_instance().get_list_by_definition_template(definition_template_id)
@@ -171,7 +231,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         definition_template_id = 0
         query_string = {'definition_template_id': definition_template_id}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -183,7 +244,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         definition_template_id = -1
         query_string = {'definition_template_id': definition_template_id}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -195,7 +257,8 @@ class DefinitionFillersIndex(NoAuthTest):
         index_url = '/definition_fillers'
         definition_template_id = '2.5'
         query_string = {'definition_template_id': definition_template_id}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -209,7 +272,8 @@ class DefinitionFillersIndex(NoAuthTest):
         definition_fillers_from_db = DefinitionFillersService.get_instance().get_list_by_definition_template(definition_template_id)
         limit = int(len(definition_fillers_from_db) / 2)
         query_string = {'definition_template_id': definition_template_id, 'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_fillers = json.loads(response.data)
         self.assertTrue(len(definition_fillers) > 0)
@@ -221,12 +285,73 @@ class DefinitionFillersIndex(NoAuthTest):
         definition_fillers_from_db = DefinitionFillersService.get_instance().get_list_by_definition_template(definition_template_id)
         offset = int(len(definition_fillers_from_db) / 2)
         query_string = {'definition_template_id': definition_template_id, 'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_fillers = json.loads(response.data)
         self.assertEqual(len(definition_fillers_from_db) - offset, len(definition_fillers))
 
 
+class DefinitionFillersSerializationCache(NoAuthTest):
+
+    def setUp(self):
+        super(DefinitionFillersSerializationCache, self).setUp()
+        self.definition_filler_id = self.definition_filler.get_id()
+        self.definition_template_id = self.definition_template.get_id()
+
+    def get_definition_filler(self, load_profile=None):
+        """Read the filler in to an empty session, along with its template and word when eagerly loading"""
+        db.session.expunge_all()
+        return DefinitionFillersService.get_instance().get(self.definition_filler_id, load_profile=load_profile)
+
+    def test_cached_serialization_of_loaded_filler_issues_no_queries(self):
+        serialized = self.get_definition_filler(DefinitionFillersService.LOAD_SERIALIZED).serialized
+
+        definition_filler = self.get_definition_filler(DefinitionFillersService.LOAD_SERIALIZED)
+        with self.assertNumQueries(0):
+            self.assertEqual(serialized, definition_filler.serialized)
+
+    def test_version_of_filler_without_loaded_template_issues_no_queries(self):
+        self.get_definition_filler(DefinitionFillersService.LOAD_SERIALIZED).serialized
+
+        # The template is neither loaded on the filler nor in the session, so the cache is skipped
+        definition_filler = self.get_definition_filler()
+        with self.assertNumQueries(0):
+            self.assertIn(None, definition_filler.get_serialization_version())
+        self.assertEqual(
+            self.definition_template_id, definition_filler.serialized.get('definition_template').get('id')
+        )
+
+    def test_version_reads_template_and_word_from_session(self):
+        definition_filler = self.get_definition_filler()
+        definition_template = definition_filler.get_definition_template()
+        definition_template.get_word()
+        db.session.expire(definition_filler, ['_definition_template'])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                (
+                    definition_filler.get_date_modified(),
+                    definition_template.get_date_modified(),
+                    definition_template.get_word().get_date_modified()
+                ),
+                definition_filler.get_serialization_version()
+            )
+
+    def test_cached_serialization_is_copied_for_each_caller(self):
+        definition_filler = self.get_definition_filler(DefinitionFillersService.LOAD_SERIALIZED)
+        serialized = definition_filler.serialized
+        expected = json.loads(json.dumps(serialized))
+
+        serialized['filler'].append('changed')
+        serialized['definition_template']['word']['lexeme_form'] = 'changed'
+        cached = definition_filler.serialized
+        self.assertEqual(expected, json.loads(json.dumps(cached)))
+
+        cached['definition_template']['definition'] = 'changed'
+        self.assertEqual(expected, json.loads(json.dumps(definition_filler.serialized)))
+
+
 class DefinitionFillersCreate(NoAuthTest):
 
     def test_create_returns_error_from_missing_definition_template_id(self):
@@ -235,7 +360,8 @@ class DefinitionFillersCreate(NoAuthTest):
         definition_filler_data = {
             'filler': filler
         }
-        response = self.post(create_url, data=definition_filler_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -253,7 +379,8 @@ class DefinitionFillersCreate(NoAuthTest):
             'definition_template_id': definition_template_id,
             'filler': filler
         }
-        response = self.post(create_url, data=definition_filler_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -271,7 +398,8 @@ class DefinitionFillersCreate(NoAuthTest):
             'definition_template_id': definition_template_id,
             'filler': filler
         }
-        response = self.post(create_url, data=definition_filler_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -289,7 +417,8 @@ class DefinitionFillersCreate(NoAuthTest):
             'definition_template_id': definition_template_id,
             'filler': filler
         }
-        response = self.post(create_url, data=definition_filler_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -307,7 +436,8 @@ class DefinitionFillersCreate(NoAuthTest):
             'definition_template_id': definition_template_id,
             'filler': filler
         }
-        response = self.post(create_url, data=definition_filler_data)
+        with self.assertNumQueries(1):
+            response = self.post(create_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -323,7 +453,8 @@ class DefinitionFillersCreate(NoAuthTest):
         definition_filler_data = {
             'definition_template_id': definition_template_id
         }
-        response = self.post(create_url, data=definition_filler_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -341,7 +472,8 @@ class DefinitionFillersCreate(NoAuthTest):
             'definition_template_id': definition_template_id,
             'filler': filler
         }
-        response = self.post(create_url, data=definition_filler_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -359,7 +491,8 @@ class DefinitionFillersCreate(NoAuthTest):
             'definition_template_id': definition_template_id,
             'filler': filler
         }
-        response = self.post(create_url, data=definition_filler_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -378,7 +511,8 @@ class DefinitionFillersCreate(NoAuthTest):
             'definition_template_id': definition_template_id,
             'filler': filler
         }
-        response = self.post(create_url, data=definition_filler_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -399,7 +533,8 @@ class DefinitionFillersCreate(NoAuthTest):
             'filler': filler,
             'is_dictionary': is_dictionary
         }
-        response = self.post(create_url, data=definition_filler_data)
+        with self.assertNumQueries(4):
+            response = self.post(create_url, data=definition_filler_data)
         self.assertEqual(201, response.status_code)
         definition_filler = json.loads(response.data)
         self.assertIsNotNone(definition_filler.get('id'))
@@ -426,7 +561,8 @@ class DefinitionFillersShow(NoAuthTest):
     def test_show_errors_for_nonexistent_definition_filler(self):
         definition_filler_id = self.NUM_DEFINITION_FILLERS + 1
         show_url = '/definition_fillers/{}'.format(definition_filler_id)
-        response = self.get(show_url)
+        with self.assertNumQueries(1):
+            response = self.get(show_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -436,7 +572,8 @@ class DefinitionFillersShow(NoAuthTest):
 
     def test_show_returns_definition_filler(self):
         show_url = '/definition_fillers/{}'.format(self.definition_filler.get_id())
-        response = self.get(show_url)
+        with self.assertNumQueries(1):
+            response = self.get(show_url)
         self.assertEqual(200, response.status_code)
         definition_filler = json.loads(response.data)
         self.assertEqual(self.definition_filler.get_id(), definition_filler.get('id'))
@@ -457,7 +594,8 @@ class DefinitionFillersUpdate(NoAuthTest):
         definition_filler_data = {
             'is_active': is_active
         }
-        response = self.put(update_url, data=definition_filler_data)
+        with self.assertNumQueries(1):
+            response = self.put(update_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -473,7 +611,8 @@ class DefinitionFillersUpdate(NoAuthTest):
             'definition_template_id': definition_template_id,
             'filler': filler
         }
-        response = self.put(update_url, data=definition_filler_data)
+        with self.assertNumQueries(0):
+            response = self.put(update_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -491,7 +630,8 @@ class DefinitionFillersUpdate(NoAuthTest):
             'definition_template_id': definition_template_id,
             'filler': filler
         }
-        response = self.put(update_url, data=definition_filler_data)
+        with self.assertNumQueries(0):
+            response = self.put(update_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -509,7 +649,8 @@ class DefinitionFillersUpdate(NoAuthTest):
             'definition_template_id': definition_template_id,
             'filler': filler
         }
-        response = self.put(update_url, data=definition_filler_data)
+        with self.assertNumQueries(0):
+            response = self.put(update_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -527,7 +668,8 @@ class DefinitionFillersUpdate(NoAuthTest):
             'definition_template_id': definition_template_id,
             'filler': filler
         }
-        response = self.put(update_url, data=definition_filler_data)
+        with self.assertNumQueries(3):
+            response = self.put(update_url, data=definition_filler_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -543,7 +685,8 @@ class DefinitionFillersUpdate(NoAuthTest):
         definition_filler_data = {
             'is_active': is_active
         }
-        response = self.put(update_url, data=definition_filler_data)
+        with self.assertNumQueries(4):
+            response = self.put(update_url, data=definition_filler_data)
         self.assertEqual(200, response.status_code)
         definition_filler = json.loads(response.data)
         self.assertIsNotNone(definition_filler.get('id'))
@@ -571,7 +714,8 @@ class DefinitionFillersUpdate(NoAuthTest):
             'definition_template_id': definition_template_id,
             'filler': filler
         }
-        response = self.put(update_url, data=definition_filler_data)
+        with self.assertNumQueries(7):
+            response = self.put(update_url, data=definition_filler_data)
         self.assertEqual(200, response.status_code)
         definition_filler = json.loads(response.data)
         self.assertIsNotNone(definition_filler.get('id'))
@@ -602,7 +746,8 @@ class DefinitionFillersDelete(NoAuthTest):
     def test_delete_errors_for_nonexistent_definition_filler(self):
         definition_filler_id = self.NUM_DEFINITION_FILLERS + 1
         delete_url = '/definition_fillers/{}'.format(definition_filler_id)
-        response = self.delete(delete_url)
+        with self.assertNumQueries(1):
+            response = self.delete(delete_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -613,7 +758,8 @@ class DefinitionFillersDelete(NoAuthTest):
     def test_delete_deletes_definition_filler(self):
         delete_url = '/definition_fillers/{}'.format(self.definition_filler.get_id())
         self.assertEqual(True, self.definition_filler.get_is_active())
-        response = self.delete(delete_url)
+        with self.assertNumQueries(4):
+            response = self.delete(delete_url)
         self.assertEqual(200, response.status_code)
         definition_filler = json.loads(response.data)
         self.assertIsNotNone(definition_filler.get('id'))
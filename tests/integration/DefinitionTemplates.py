@@ -2,7 +2,10 @@ import unittest
 import json
 
 from common import NoAuthTest
+from application import definition_segments_cache
 from application.models.DefinitionTemplate import DefinitionTemplate
+from application.models.TurnDefinitionFiller import TurnDefinitionFiller
+from application.services.DefinitionFillersService import DefinitionFillersService
 from application.services.DefinitionTemplatesService import DefinitionTemplatesService
 
 
@@ -10,7 +13,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
 
     def test_index_returns_all_definition_templates(self):
         index_url = '/definition_templates'
-        response = self.get(index_url)
+        with self.assertNumQueries(1):
+            response = self.get(index_url)
         self.assertEqual(200, response.status_code)
         definition_templates = json.loads(response.data)
         self.assertEqual(self.NUM_DEFINITION_TEMPLATES, len(definition_templates))
@@ -19,7 +23,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
         index_url = '/definition_templates'
         limit = int(self.NUM_DEFINITION_TEMPLATES / 2)
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_templates = json.loads(response.data)
         self.assertTrue(len(definition_templates) > 0)
@@ -29,7 +34,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
         index_url = '/definition_templates'
         offset = int(self.NUM_DEFINITION_TEMPLATES / 2)
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_templates = json.loads(response.data)
         self.assertEqual(self.NUM_DEFINITION_TEMPLATES - offset, len(definition_templates))
@@ -38,7 +44,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
         index_url = '/definition_templates'
         limit = '2.5'
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -50,7 +57,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
         index_url = '/definition_templates'
         limit = -1
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -62,7 +70,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
         index_url = '/definition_templates'
         offset = '2.5'
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -74,7 +83,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
         index_url = '/definition_templates'
         offset = -1
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -86,7 +96,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
         index_url = '/definition_templates'
         word_id = self.word.get_id()
         query_string = {'word_id': word_id}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_templates = json.loads(response.data)
         definition_templates_from_db = DefinitionTemplatesService.get_instance().get_list_by_word(word_id)
@@ -99,7 +110,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
         index_url = '/definition_templates'
         word_id = 0
         query_string = {'word_id': word_id}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -111,7 +123,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
         index_url = '/definition_templates'
         word_id = -1
         query_string = {'word_id': word_id}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -123,7 +136,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
         index_url = '/definition_templates'
         word_id = '2.5'
         query_string = {'word_id': word_id}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -137,7 +151,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
         definition_templates_from_db = DefinitionTemplatesService.get_instance().get_list_by_word(word_id)
         limit = int(len(definition_templates_from_db) / 2)
         query_string = {'word_id': word_id, 'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_templates = json.loads(response.data)
         self.assertTrue(len(definition_templates) > 0)
@@ -149,7 +164,8 @@ class DefinitionTemplatesIndex(NoAuthTest):
         definition_templates_from_db = DefinitionTemplatesService.get_instance().get_list_by_word(word_id)
         offset = int(len(definition_templates_from_db) / 2)
         query_string = {'word_id': word_id, 'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         definition_templates = json.loads(response.data)
         self.assertEqual(len(definition_templates_from_db) - offset, len(definition_templates))
@@ -165,7 +181,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -185,7 +202,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -205,7 +223,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -225,7 +244,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -245,7 +265,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(1):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -263,7 +284,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'word_id': word_id,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -283,7 +305,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -301,7 +324,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'word_id': word_id,
             'definition': definition
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -321,7 +345,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -341,7 +366,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -362,7 +388,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -383,7 +410,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -404,7 +432,8 @@ class DefinitionTemplatesCreate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.post(create_url, data=definition_template_data)
+        with self.assertNumQueries(3):
+            response = self.post(create_url, data=definition_template_data)
         self.assertEqual(201, response.status_code)
         definition_template = json.loads(response.data)
         self.assertIsNotNone(definition_template.get('id'))
@@ -431,7 +460,8 @@ class DefinitionTemplatesShow(NoAuthTest):
     def test_show_errors_for_nonexistent_definition_template(self):
         definition_template_id = self.NUM_DEFINITION_TEMPLATES + 1
         show_url = '/definition_templates/{}'.format(definition_template_id)
-        response = self.get(show_url)
+        with self.assertNumQueries(1):
+            response = self.get(show_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -441,7 +471,8 @@ class DefinitionTemplatesShow(NoAuthTest):
 
     def test_show_returns_definition_template(self):
         show_url = '/definition_templates/{}'.format(self.definition_template.get_id())
-        response = self.get(show_url)
+        with self.assertNumQueries(1):
+            response = self.get(show_url)
         self.assertEqual(200, response.status_code)
         definition_template = json.loads(response.data)
         self.assertEqual(self.definition_template.get_id(), definition_template.get('id'))
@@ -462,7 +493,8 @@ class DefinitionTemplatesUpdate(NoAuthTest):
         definition_template_data = {
             'is_active': is_active
         }
-        response = self.put(update_url, data=definition_template_data)
+        with self.assertNumQueries(1):
+            response = self.put(update_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -480,7 +512,8 @@ class DefinitionTemplatesUpdate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.put(update_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.put(update_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -500,7 +533,8 @@ class DefinitionTemplatesUpdate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.put(update_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.put(update_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -520,7 +554,8 @@ class DefinitionTemplatesUpdate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.put(update_url, data=definition_template_data)
+        with self.assertNumQueries(0):
+            response = self.put(update_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -540,7 +575,8 @@ class DefinitionTemplatesUpdate(NoAuthTest):
             'definition': definition,
             'filler_lexical_classes': filler_lexical_classes
         }
-        response = self.put(update_url, data=definition_template_data)
+        with self.assertNumQueries(3):
+            response = self.put(update_url, data=definition_template_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -556,7 +592,8 @@ class DefinitionTemplatesUpdate(NoAuthTest):
         definition_template_data = {
             'is_active': is_active
         }
-        response = self.put(update_url, data=definition_template_data)
+        with self.assertNumQueries(3):
+            response = self.put(update_url, data=definition_template_data)
         self.assertEqual(200, response.status_code)
         definition_template = json.loads(response.data)
         self.assertIsNotNone(definition_template.get('id'))
@@ -585,7 +622,8 @@ class DefinitionTemplatesUpdate(NoAuthTest):
             'word_id': word_id,
             'definition': definition
         }
-        response = self.put(update_url, data=definition_template_data)
+        with self.assertNumQueries(6):
+            response = self.put(update_url, data=definition_template_data)
         self.assertEqual(200, response.status_code)
         definition_template = json.loads(response.data)
         self.assertIsNotNone(definition_template.get('id'))
@@ -617,7 +655,8 @@ class DefinitionTemplatesDelete(NoAuthTest):
     def test_delete_errors_for_nonexistent_definition_template(self):
         definition_template_id = self.NUM_DEFINITION_TEMPLATES + 1
         delete_url = '/definition_templates/{}'.format(definition_template_id)
-        response = self.delete(delete_url)
+        with self.assertNumQueries(1):
+            response = self.delete(delete_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -628,7 +667,8 @@ class DefinitionTemplatesDelete(NoAuthTest):
     def test_delete_deletes_definition_template(self):
         delete_url = '/definition_templates/{}'.format(self.definition_template.get_id())
         self.assertEqual(True, self.definition_template.get_is_active())
-        response = self.delete(delete_url)
+        with self.assertNumQueries(3):
+            response = self.delete(delete_url)
         self.assertEqual(200, response.status_code)
         definition_template = json.loads(response.data)
         self.assertIsNotNone(definition_template.get('id'))
@@ -650,6 +690,80 @@ class DefinitionTemplatesDelete(NoAuthTest):
         self.assertEqual(saved_definition_template.get_is_active(), definition_template.get('is_active'))
 
 
+class DefinitionTemplatesSegments(NoAuthTest):
+    # Definitions with fillers, compared with the str.format of the definition text they were rendered with before
+    DEFINITIONS = [
+        ('tending to make {} and {} {}', ['sudden', 'unpredictable', 'changes']),
+        ('{} at the start', ['placed']),
+        ('at the end {}', ['placed']),
+        ('{}{} adjacent', ['side', 'by']),
+        ('filled with {} and {}', ['{}', 'a {} brace']),
+        ('no fillers at all', []),
+        ('', [])
+    ]
+
+    def test_compile_definition_splits_on_placeholders(self):
+        self.assertEqual(('tending to make ', ' and ', ' ', ''), DefinitionTemplate.compile_definition(
+            'tending to make {} and {} {}'
+        ))
+        self.assertEqual(('', ' at the start'), DefinitionTemplate.compile_definition('{} at the start'))
+        self.assertEqual(('', '', ' adjacent'), DefinitionTemplate.compile_definition('{}{} adjacent'))
+        self.assertEqual(('no fillers at all',), DefinitionTemplate.compile_definition('no fillers at all'))
+
+    def test_compile_definition_of_empty_template(self):
+        self.assertEqual(('',), DefinitionTemplate.compile_definition(''))
+
+    def test_render_segments_matches_format(self):
+        for definition, filler in self.DEFINITIONS:
+            self.assertEqual(
+                definition.format(*filler),
+                DefinitionTemplate.render_segments(DefinitionTemplate.compile_definition(definition), filler)
+            )
+
+    def test_render_segments_keeps_placeholders_in_fillers(self):
+        segments = DefinitionTemplate.compile_definition('filled with {} and {}')
+        self.assertEqual('filled with {} and a {} brace', DefinitionTemplate.render_segments(segments, ['{}', 'a {} brace']))
+
+    def test_render_segments_of_empty_template(self):
+        self.assertEqual('', DefinitionTemplate.render_segments(DefinitionTemplate.compile_definition(''), []))
+
+    def test_render_segments_errors_for_wrong_filler_count(self):
+        segments = DefinitionTemplate.compile_definition('tending to make {} and {} {}')
+        self.assertRaises(AttributeError, DefinitionTemplate.render_segments, segments, ['sudden', 'changes'])
+        self.assertRaises(AttributeError, DefinitionTemplate.render_segments, segments, ['a', 'b', 'c', 'd'])
+
+    def test_get_definition_segments_of_unsaved_template_is_not_cached(self):
+        definition_template = DefinitionTemplate(self.word, 'the {} of {}', ['noun', 'noun'])
+        self.assertEqual(('the ', ' of ', ''), definition_template.get_definition_segments())
+        self.assertIsNone(definition_segments_cache.get(None))
+
+    def test_get_definition_segments_of_saved_template_is_cached(self):
+        definition_template_id = self.definition_template.get_id()
+        definition_segments_cache.clear()
+        segments = self.definition_template.get_definition_segments()
+        self.assertEqual(DefinitionTemplate.compile_definition(self.definition_template.get_definition()), segments)
+        self.assertEqual(segments, definition_segments_cache.get(definition_template_id))
+
+    def test_render_definition_matches_format(self):
+        definition_fillers = DefinitionFillersService.get_instance().get_list_by_definition_template(
+            self.definition_template.get_id()
+        )
+        self.assertNotEqual(0, len(definition_fillers))
+        for definition_filler in definition_fillers:
+            filler = definition_filler.get_filler()
+            self.assertEqual(
+                self.definition_template.get_definition().format(*filler),
+                self.definition_template.render_definition(filler)
+            )
+
+    def test_turn_definition_filler_definition_matches_format(self):
+        # A turn definition filler always has a filler, so the definitions without placeholders are left out
+        for definition, filler in self.DEFINITIONS[:-2]:
+            definition_template = DefinitionTemplate(self.word, definition, ['noun'] * len(filler))
+            turn_definition_filler = TurnDefinitionFiller(None, definition_template, filler, False)
+            self.assertEqual(definition.format(*filler), turn_definition_filler.get_definition())
+
+
 def main():
     unittest.main()
 
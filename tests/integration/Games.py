@@ -2,6 +2,7 @@ import unittest
 import json
 
 from common import NoAuthTest, get_incremental_game_name, get_incremental_game_description
+from application import db
 from application.models.Game import Game
 from application.services.GamesService import GamesService
 
@@ -10,7 +11,8 @@ class GamesIndex(NoAuthTest):
 
     def test_index_returns_all_games(self):
         index_url = '/games'
-        response = self.get(index_url)
+        with self.assertNumQueries(1):
+            response = self.get(index_url)
         self.assertEqual(200, response.status_code)
         games = json.loads(response.data)
         self.assertEqual(self.NUM_GAMES, len(games))
@@ -19,7 +21,8 @@ class GamesIndex(NoAuthTest):
         index_url = '/games'
         limit = int(self.NUM_GAMES / 2)
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         games = json.loads(response.data)
         self.assertTrue(len(games) > 0)
@@ -29,7 +32,8 @@ class GamesIndex(NoAuthTest):
         index_url = '/games'
         offset = int(self.NUM_GAMES / 2)
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         games = json.loads(response.data)
         self.assertEqual(self.NUM_GAMES - offset, len(games))
@@ -38,7 +42,8 @@ class GamesIndex(NoAuthTest):
         index_url = '/games'
         limit = 2.5
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -50,7 +55,8 @@ class GamesIndex(NoAuthTest):
         index_url = '/games'
         limit = -1
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -62,7 +68,8 @@ class GamesIndex(NoAuthTest):
         index_url = '/games'
         offset = 2.5
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -74,7 +81,8 @@ class GamesIndex(NoAuthTest):
         index_url = '/games'
         offset = -1
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -93,7 +101,8 @@ class GamesCreate(NoAuthTest):
             'description': description,
             'match_size': 2
         }
-        response = self.post(create_url, data=game_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=game_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -113,7 +122,8 @@ class GamesCreate(NoAuthTest):
             'description': description,
             'match_size': 2
         }
-        response = self.post(create_url, data=game_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=game_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -134,7 +144,8 @@ class GamesCreate(NoAuthTest):
             'description': description,
             'match_size': 2
         }
-        response = self.post(create_url, data=game_data)
+        with self.assertNumQueries(1):
+            response = self.post(create_url, data=game_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -152,7 +163,8 @@ class GamesCreate(NoAuthTest):
             'name': name,
             'match_size': 2
         }
-        response = self.post(create_url, data=game_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=game_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -172,7 +184,8 @@ class GamesCreate(NoAuthTest):
             'description': description,
             'match_size': 2
         }
-        response = self.post(create_url, data=game_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=game_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -193,7 +206,8 @@ class GamesCreate(NoAuthTest):
             'description': description,
             'match_size': match_size
         }
-        response = self.post(create_url, data=game_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=game_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -214,7 +228,8 @@ class GamesCreate(NoAuthTest):
             'description': description,
             'match_size': match_size
         }
-        response = self.post(create_url, data=game_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=game_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -234,7 +249,8 @@ class GamesCreate(NoAuthTest):
             'description': description,
             'match_size': 2
         }
-        response = self.post(create_url, data=game_data)
+        with self.assertNumQueries(2):
+            response = self.post(create_url, data=game_data)
         self.assertEqual(201, response.status_code)
         game = json.loads(response.data)
         self.assertIsNotNone(game.get('id'))
@@ -261,7 +277,8 @@ class GamesShow(NoAuthTest):
     def test_show_errors_for_nonexistent_game(self):
         game_id = self.NUM_GAMES + 1
         show_url = '/games/{}'.format(game_id)
-        response = self.get(show_url)
+        with self.assertNumQueries(1):
+            response = self.get(show_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -271,7 +288,8 @@ class GamesShow(NoAuthTest):
 
     def test_show_returns_game(self):
         show_url = '/games/{}'.format(self.game.get_id())
-        response = self.get(show_url)
+        with self.assertNumQueries(0):
+            response = self.get(show_url)
         self.assertEqual(200, response.status_code)
         game = json.loads(response.data)
         self.assertEqual(self.game.get_id(), game.get('id'))
@@ -292,7 +310,8 @@ class GamesUpdate(NoAuthTest):
         game_data = {
             'name': name
         }
-        response = self.put(update_url, data=game_data)
+        with self.assertNumQueries(1):
+            response = self.put(update_url, data=game_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -307,7 +326,8 @@ class GamesUpdate(NoAuthTest):
         game_data = {
             'name': name
         }
-        response = self.put(update_url, data=game_data)
+        with self.assertNumQueries(0):
+            response = self.put(update_url, data=game_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -326,7 +346,8 @@ class GamesUpdate(NoAuthTest):
         game_data = {
             'name': name,
         }
-        response = self.put(update_url, data=game_data)
+        with self.assertNumQueries(1):
+            response = self.put(update_url, data=game_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -344,7 +365,8 @@ class GamesUpdate(NoAuthTest):
         game_data = {
             'description': description
         }
-        response = self.put(update_url, data=game_data)
+        with self.assertNumQueries(0):
+            response = self.put(update_url, data=game_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -361,7 +383,8 @@ class GamesUpdate(NoAuthTest):
         game_data = {
             'match_size': match_size
         }
-        response = self.put(update_url, data=game_data)
+        with self.assertNumQueries(0):
+            response = self.put(update_url, data=game_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -372,6 +395,21 @@ class GamesUpdate(NoAuthTest):
         self.assertEqual(False, errors.get('inputs').get('is_active'))
         self.assertEqual(None, errors.get('inputs').get('match_size'))
 
+    def test_update_replaces_cached_game(self):
+        game_id = self.game.get_id()
+        record_cache = GamesService.get_instance().get_record_cache()
+        # Records already in the session are used without going through the record cache
+        db.session.expunge_all()
+        GamesService.get_instance().get(game_id)
+        self.assertIn(game_id, record_cache)
+
+        description = get_incremental_game_description(game_id * 100)
+        self.game.update(**{'description': description})
+        self.assertNotIn(game_id, record_cache)
+        db.session.expunge_all()
+        self.assertEqual(description, GamesService.get_instance().get(game_id).get_description())
+        self.assertIn(game_id, record_cache)
+
     def test_update_updates_game(self):
         update_url = '/games/{}'.format(self.game.get_id())
         game_number = self.game.get_id() * 100
@@ -383,7 +421,8 @@ class GamesUpdate(NoAuthTest):
             'description': description,
             'is_active': False
         }
-        response = self.put(update_url, data=game_data)
+        with self.assertNumQueries(2):
+            response = self.put(update_url, data=game_data)
         self.assertEqual(200, response.status_code)
         game = json.loads(response.data)
         self.assertIsNotNone(game.get('id'))
@@ -410,7 +449,8 @@ class GamesDelete(NoAuthTest):
     def test_delete_errors_for_nonexistent_game(self):
         game_id = self.NUM_GAMES + 1
         delete_url = '/games/{}'.format(game_id)
-        response = self.delete(delete_url)
+        with self.assertNumQueries(1):
+            response = self.delete(delete_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -421,7 +461,8 @@ class GamesDelete(NoAuthTest):
     def test_delete_deletes_game(self):
         delete_url = '/games/{}'.format(self.game.get_id())
         self.assertEqual(True, self.game.get_is_active())
-        response = self.delete(delete_url)
+        with self.assertNumQueries(2):
+            response = self.delete(delete_url)
         self.assertEqual(200, response.status_code)
         game = json.loads(response.data)
         self.assertIsNotNone(game.get('id'))
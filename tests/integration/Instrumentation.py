@@ -0,0 +1,175 @@
+import unittest
+import json
+import sqlite3
+
+from sqlalchemy.exc import TimeoutError
+
+from common import NoAuthTest, AuthTokenTest
+from application.Database import ping_connection
+from application.instrumentation import SERVER_TIMING_HEADER, endpoint_stats, pool_stats
+from application.instrumentation.InstrumentedQueuePool import InstrumentedQueuePool
+
+
+class InstrumentationTest(NoAuthTest):
+
+    def setUp(self):
+        super(InstrumentationTest, self).setUp()
+        endpoint_stats.clear()
+        pool_stats.clear()
+
+    def tearDown(self):
+        endpoint_stats.clear()
+        pool_stats.clear()
+        super(InstrumentationTest, self).tearDown()
+
+    def get_pool(self, **kwargs):
+        """Build a pool of in-memory SQLite connections, limited to one connection and one overflow by default"""
+        options = {'pool_size': 1, 'max_overflow': 1, 'timeout': 0.01}
+        options.update(kwargs)
+        return InstrumentedQueuePool(lambda: sqlite3.connect(':memory:'), **options)
+
+
+class ServerTiming(InstrumentationTest):
+
+    def test_response_reports_query_count_and_timings(self):
+        with self.assertNumQueries(1):
+            response = self.get('/games')
+        self.assertEqual(200, response.status_code)
+        server_timing = response.headers.get(SERVER_TIMING_HEADER)
+        self.assertIsNotNone(server_timing)
+
+        timings = dict(timing.split(';')[0:2] for timing in server_timing.split(', '))
+        self.assertEqual(set(['db', 'pool', 'serialize', 'template', 'total']), set(timings.keys()))
+        self.assertRegexpMatches(timings.get('db'), r'^dur=[0-9.]+$')
+        self.assertRegexpMatches(server_timing, r'desc="[1-9][0-9]* queries"')
+
+    def test_missing_route_reports_timings(self):
+        with self.assertNumQueries(0):
+            response = self.get('/not_a_route')
+        self.assertEqual(404, response.status_code)
+        self.assertIsNotNone(response.headers.get(SERVER_TIMING_HEADER))
+
+
+class StatsIndex(InstrumentationTest):
+
+    def test_index_aggregates_requests_by_endpoint(self):
+        for _ in range(3):
+            with self.assertNumQueries(1):
+                self.get('/games')
+        with self.assertNumQueries(1):
+            self.get('/games/{}'.format(self.game.get_id()))
+
+        with self.assertNumQueries(0):
+            response = self.get('/stats')
+        self.assertEqual(200, response.status_code)
+        stats = json.loads(response.data)
+
+        games_stats = stats.get('GET /games')
+        self.assertIsNotNone(games_stats)
+        self.assertEqual(3, games_stats.get('requests'))
+        self.assertTrue(games_stats.get('max_queries') > 0)
+        self.assertTrue(games_stats.get('mean_total_ms') >= games_stats.get('mean_db_ms'))
+
+        game_stats = stats.get('GET /games/<int:game_id>')
+        self.assertIsNotNone(game_stats)
+        self.assertEqual(1, game_stats.get('requests'))
+
+    def test_delete_errors_for_unauthenticated_player(self):
+        with self.assertNumQueries(1):
+            self.get('/games')
+        with self.assertNumQueries(0):
+            response = self.delete('/stats')
+        self.assertEqual(422, response.status_code)
+        self.assertIsNotNone(json.loads(response.data).get('errors').get('UnauthorizedAccess'))
+
+        with self.assertNumQueries(0):
+            stats = json.loads(self.get('/stats').data)
+        self.assertIsNotNone(stats.get('GET /games'))
+
+
+class AuthStatsDelete(InstrumentationTest, AuthTokenTest):
+
+    def test_delete_resets_the_aggregate(self):
+        with self.assertNumQueries(2):
+            self.get('/games')
+        with self.assertNumQueries(0):
+            response = self.delete('/stats')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({}, json.loads(response.data))
+
+        with self.assertNumQueries(0):
+            stats = json.loads(self.get('/stats').data)
+        self.assertIsNone(stats.get('GET /games'))
+
+    def test_delete_stats_resets_checkouts(self):
+        self.get_pool().connect().close()
+        with self.assertNumQueries(1):
+            response = self.delete('/stats')
+        self.assertEqual(200, response.status_code)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(0, json.loads(self.get('/stats/pool').data).get('checkouts'))
+
+
+class PoolCheckouts(InstrumentationTest):
+
+    def test_checkouts_record_connections_in_use_and_overflows(self):
+        pool = self.get_pool()
+        connection = pool.connect()
+        stats = pool_stats.get_stats(pool)
+        self.assertEqual(1, stats.get('checkouts'))
+        self.assertEqual(1, stats.get('checked_out'))
+        self.assertEqual(0, stats.get('overflows'))
+
+        overflow_connection = pool.connect()
+        stats = pool_stats.get_stats(pool)
+        self.assertEqual(2, stats.get('checkouts'))
+        self.assertEqual(2, stats.get('max_checked_out'))
+        self.assertEqual(1, stats.get('overflows'))
+        self.assertEqual(1, stats.get('overflow'))
+
+        overflow_connection.close()
+        connection.close()
+        stats = pool_stats.get_stats(pool)
+        self.assertEqual(0, stats.get('checked_out'))
+        self.assertEqual(2, stats.get('max_checked_out'))
+
+    def test_exhausted_pool_records_timeout(self):
+        pool = self.get_pool(max_overflow=0)
+        connection = pool.connect()
+        self.assertRaises(TimeoutError, pool.connect)
+
+        stats = pool_stats.get_stats(pool)
+        self.assertEqual(1, stats.get('checkouts'))
+        self.assertEqual(1, stats.get('timeouts'))
+        self.assertTrue(stats.get('max_wait_ms') >= 10)
+        connection.close()
+
+    def test_pre_ping_replaces_closed_connection(self):
+        pool = self.get_pool(events=[(ping_connection, 'checkout')])
+        connection = pool.connect()
+        dbapi_connection = connection.connection
+        connection.close()
+
+        # The server closing the idle connection
+        dbapi_connection.close()
+
+        connection = pool.connect()
+        self.assertIsNot(dbapi_connection, connection.connection)
+        connection.cursor().execute('SELECT 1')
+        connection.close()
+
+    def test_stats_pool_reports_checkouts(self):
+        with self.assertNumQueries(0):
+            response = self.get('/stats/pool')
+        self.assertEqual(200, response.status_code)
+        stats = json.loads(response.data)
+        for name in ['checkouts', 'mean_wait_ms', 'max_wait_ms', 'max_checked_out', 'overflows', 'timeouts']:
+            self.assertIn(name, stats)
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
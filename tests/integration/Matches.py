@@ -0,0 +1,285 @@
+import unittest
+import json
+
+from common import NoAuthTest, AuthTokenTest, get_incremental_username, get_incremental_game_name
+from application import db
+from application.models.Game import Game
+from application.models.Match import Match, match_players
+from application.models.UnitOfWork import UnitOfWork
+from application.services.MatchesService import MatchesService
+from application.services.PlayersService import PlayersService
+
+
+class MatchTest(NoAuthTest):
+
+    def get_dummy_player(self, increment):
+        return PlayersService.get_instance().get_from_username(get_incremental_username(increment))
+
+    def create_match(self, game, *players):
+        match = Match(game, players[0])
+        for player in players[1:]:
+            match.add_player(player)
+        match.save()
+        return match
+
+    def get_match_player_ids(self, match_id):
+        return [
+            row[0] for row in db.session.query(match_players.c.player_id).filter(match_players.c.match_id == match_id)
+        ]
+
+
+class MatchesClaimSeat(MatchTest):
+
+    def test_claim_takes_open_seat(self):
+        match = self.create_match(self.large_game, self.get_dummy_player(1))
+        match_id = match.get_id()
+        self.assertTrue(MatchesService.get_instance().claim_seat(match_id, self.get_dummy_player(2).get_id()))
+
+        match = MatchesService.get_instance().get(match_id)
+        self.assertEqual(2, match.get_seats_open())
+        self.assertEqual(Match.STATE_WAITING[0], match.get_state())
+        self.assertEqual(
+            sorted([self.get_dummy_player(1).get_id(), self.get_dummy_player(2).get_id()]),
+            sorted(self.get_match_player_ids(match_id))
+        )
+
+    def test_claim_of_last_seat_starts_match(self):
+        match = self.create_match(self.game, self.get_dummy_player(1))
+        match_id = match.get_id()
+        self.assertTrue(MatchesService.get_instance().claim_seat(match_id, self.get_dummy_player(2).get_id()))
+
+        match = MatchesService.get_instance().get(match_id)
+        self.assertEqual(0, match.get_seats_open())
+        self.assertEqual(Match.STATE_STARTED[0], match.get_state())
+        self.assertIsNotNone(match.get_date_started())
+
+    def test_claim_of_full_match_fails(self):
+        match = self.create_match(self.game, self.get_dummy_player(1), self.get_dummy_player(2))
+        match_id = match.get_id()
+        self.assertFalse(MatchesService.get_instance().claim_seat(match_id, self.get_dummy_player(3).get_id()))
+
+        match = MatchesService.get_instance().get(match_id)
+        self.assertEqual(0, match.get_seats_open())
+        self.assertEqual(2, len(self.get_match_player_ids(match_id)))
+
+    def test_claim_lost_in_race_keeps_pending_changes(self):
+        match = self.create_match(self.game, self.get_dummy_player(1))
+        match_id = match.get_id()
+
+        # Both joiners saw the open seat, and the other one claimed it first
+        self.assertIn(match_id, MatchesService.get_instance().get_open_match_ids(
+            self.game.get_id(), self.get_dummy_player(3).get_id()
+        ))
+        self.assertTrue(MatchesService.get_instance().claim_seat(match_id, self.get_dummy_player(2).get_id()))
+
+        game = Game(get_incremental_game_name(100), 'pending', 2, 4)
+        db.session.add(game)
+        self.assertFalse(MatchesService.get_instance().claim_seat(match_id, self.get_dummy_player(3).get_id()))
+
+        # The savepoint flushed the pending game before the claim, and rolling the claim back keeps it
+        self.assertIn(game, db.session)
+        self.assertIsNotNone(db.session.query(Game).filter_by(_id=game.get_id()).first())
+        self.assertNotIn(self.get_dummy_player(3).get_id(), self.get_match_player_ids(match_id))
+
+    def test_claim_within_unit_of_work_is_rolled_back_with_it(self):
+        match = self.create_match(self.game, self.get_dummy_player(1))
+        match_id = match.get_id()
+
+        try:
+            with UnitOfWork():
+                self.assertTrue(MatchesService.get_instance().claim_seat(match_id, self.get_dummy_player(2).get_id()))
+                raise ValueError('Abandon the unit of work')
+        except ValueError:
+            pass
+
+        match = MatchesService.get_instance().get(match_id)
+        self.assertEqual(1, match.get_seats_open())
+        self.assertEqual(Match.STATE_WAITING[0], match.get_state())
+        self.assertEqual([self.get_dummy_player(1).get_id()], self.get_match_player_ids(match_id))
+
+
+class MatchesJoinOpponent(MatchTest):
+
+    def join_after_claim(self, game, opponent, claimer, player):
+        """Join the opponent's match as the player, with the claimer taking a seat just after the opponent lookup"""
+        get_opponent_match_ids = MatchesService.get_instance().get_opponent_match_ids
+
+        def get_opponent_match_ids_then_claim(*args, **kwargs):
+            match_ids = get_opponent_match_ids(*args, **kwargs)
+            for match_id in match_ids:
+                self.assertTrue(MatchesService.get_instance().claim_seat(match_id, claimer.get_id()))
+            return match_ids
+
+        self.addCleanup(delattr, MatchesService.get_instance(), 'get_opponent_match_ids')
+        MatchesService.get_instance().get_opponent_match_ids = get_opponent_match_ids_then_claim
+        return MatchesService.get_instance().join_opponent_match(game.get_id(), player, opponent.get_id())
+
+    def test_join_claims_seat_in_opponents_match(self):
+        match_id = self.create_match(self.game, self.get_dummy_player(1)).get_id()
+
+        match = MatchesService.get_instance().join_opponent_match(
+            self.game.get_id(), self.get_dummy_player(2), self.get_dummy_player(1).get_id()
+        )
+        self.assertEqual(match_id, match.get_id())
+        self.assertEqual(0, match.get_seats_open())
+        self.assertEqual(Match.STATE_STARTED[0], match.get_state())
+        self.assertEqual(
+            sorted([self.get_dummy_player(1).get_id(), self.get_dummy_player(2).get_id()]),
+            sorted(self.get_match_player_ids(match_id))
+        )
+
+    def test_join_without_opponents_match_returns_none(self):
+        self.create_match(self.game, self.get_dummy_player(3))
+        self.assertIsNone(MatchesService.get_instance().join_opponent_match(
+            self.game.get_id(), self.get_dummy_player(2), self.get_dummy_player(1).get_id()
+        ))
+
+    def test_join_after_claim_of_last_seat_returns_none(self):
+        match_id = self.create_match(self.game, self.get_dummy_player(1)).get_id()
+
+        self.assertIsNone(self.join_after_claim(
+            self.game, self.get_dummy_player(1), self.get_dummy_player(3), self.get_dummy_player(2)
+        ))
+
+        # The concurrent claim filled the match, and the join neither overwrote it nor added a third player
+        db.session.expire_all()
+        match = MatchesService.get_instance().get(match_id)
+        self.assertEqual(0, match.get_seats_open())
+        self.assertEqual(
+            sorted([self.get_dummy_player(1).get_id(), self.get_dummy_player(3).get_id()]),
+            sorted(self.get_match_player_ids(match_id))
+        )
+
+    def test_join_after_claim_counts_both_seats(self):
+        match_id = self.create_match(self.large_game, self.get_dummy_player(1)).get_id()
+
+        match = self.join_after_claim(
+            self.large_game, self.get_dummy_player(1), self.get_dummy_player(3), self.get_dummy_player(2)
+        )
+        self.assertEqual(match_id, match.get_id())
+        self.assertEqual(1, match.get_seats_open())
+        self.assertEqual(3, len(self.get_match_player_ids(match_id)))
+
+
+class MatchesSeatsOpen(MatchTest):
+
+    def assertSeatsOpenMatchPlayers(self, match_id):
+        """Assert the stored open seats of the match agree with the players stored for it"""
+        db.session.expire_all()
+        match = MatchesService.get_instance().get(match_id)
+        self.assertGreaterEqual(match.get_seats_open(), 0)
+        self.assertEqual(
+            match.get_game().get_match_size() - len(self.get_match_player_ids(match_id)), match.get_seats_open()
+        )
+        return match
+
+    def test_created_match_has_all_seats_but_its_creators_open(self):
+        for game in [self.game, self.large_game]:
+            match = self.create_match(game, self.get_dummy_player(1))
+            self.assertEqual(game.get_match_size() - 1, match.get_seats_open())
+            self.assertSeatsOpenMatchPlayers(match.get_id())
+
+    def test_claimed_seats_are_closed(self):
+        match = self.create_match(self.large_game, self.get_dummy_player(1))
+        match_id = match.get_id()
+
+        for increment in range(2, self.large_game.get_match_size() + 1):
+            self.assertTrue(MatchesService.get_instance().claim_seat(match_id, self.get_dummy_player(increment).get_id()))
+            match = self.assertSeatsOpenMatchPlayers(match_id)
+            self.assertEqual(self.large_game.get_match_size() - increment, match.get_seats_open())
+
+        self.assertFalse(MatchesService.get_instance().claim_seat(match_id, self.get_dummy_player(9).get_id()))
+        self.assertEqual(0, self.assertSeatsOpenMatchPlayers(match_id).get_seats_open())
+
+    def test_opponent_match_closes_opponent_seat_without_starting(self):
+        match = Match(self.game, self.get_dummy_player(1))
+        match.add_player(self.get_dummy_player(2), should_start=False)
+        match.save()
+
+        match = self.assertSeatsOpenMatchPlayers(match.get_id())
+        self.assertEqual(0, match.get_seats_open())
+        self.assertEqual(Match.STATE_WAITING[0], match.get_state())
+
+        # The full match waiting on its opponent is not offered to other joiners
+        self.assertNotIn(match.get_id(), MatchesService.get_instance().get_open_match_ids(
+            self.game.get_id(), self.get_dummy_player(3).get_id()
+        ))
+
+    def test_opponent_match_of_large_game_keeps_other_seats_open(self):
+        match = Match(self.large_game, self.get_dummy_player(1))
+        match.add_player(self.get_dummy_player(2), should_start=False)
+        match.save()
+        match_id = match.get_id()
+        self.assertEqual(2, self.assertSeatsOpenMatchPlayers(match_id).get_seats_open())
+
+        for increment in [3, 4]:
+            self.assertTrue(MatchesService.get_instance().claim_seat(match_id, self.get_dummy_player(increment).get_id()))
+
+        match = self.assertSeatsOpenMatchPlayers(match_id)
+        self.assertEqual(0, match.get_seats_open())
+        self.assertEqual(Match.STATE_STARTED[0], match.get_state())
+
+    def test_adding_player_to_full_match_errors(self):
+        match = self.create_match(self.game, self.get_dummy_player(1), self.get_dummy_player(2))
+        self.assertRaises(AttributeError, match.add_player, self.get_dummy_player(3))
+        self.assertEqual(0, match.get_seats_open())
+        self.assertEqual(2, len(match.get_players()))
+
+
+class AuthMatchesCreate(AuthTokenTest, MatchTest):
+
+    def setUp(self):
+        super(AuthMatchesCreate, self).setUp()
+        # Read the ids first, since requests remove the session
+        self.player_id = self.player.get_id()
+        self.game_id = self.game.get_id()
+        self.opponent_id = PlayersService.get_instance().get_from_username(get_incremental_username(1)).get_id()
+        self.missing_id = max(player.get_id() for player in PlayersService.get_instance().get_list()) + 1
+
+    def test_create_with_missing_opponent_errors(self):
+        with self.assertNumQueries(2):
+            response = self.post('/matches', data={'game_id': self.game_id, 'opponent_id': self.missing_id})
+        self.assertEqual(422, response.status_code)
+        errors = json.loads(response.data)
+        self.assertIsNotNone(errors.get('errors').get('OpponentNotFound'))
+        self.assertEqual(self.missing_id, errors.get('inputs').get('opponent_id'))
+
+    def test_create_with_opponent_waits_for_opponent(self):
+        with self.assertNumQueries(8):
+            response = self.post('/matches', data={'game_id': self.game_id, 'opponent_id': self.opponent_id})
+        self.assertEqual(201, response.status_code)
+        match = json.loads(response.data)
+
+        self.assertEqual(Match.STATE_WAITING[0], MatchesService.get_instance().get(match.get('id')).get_state())
+        self.assertEqual(
+            sorted([self.player_id, self.opponent_id]), sorted(self.get_match_player_ids(match.get('id')))
+        )
+
+    def test_create_with_opponent_joins_opponents_match(self):
+        match_id = self.create_match(self.game, PlayersService.get_instance().get(self.opponent_id)).get_id()
+
+        # Authentication, both players, the game and the candidate lookup, the claim's three statements, then the joined
+        # match read back with its players, and serialized with its game and players
+        with self.assertNumQueries(12):
+            response = self.post('/matches', data={'game_id': self.game_id, 'opponent_id': self.opponent_id})
+        self.assertEqual(201, response.status_code)
+        match = json.loads(response.data)
+        self.assertEqual(match_id, match.get('id'))
+        self.assertEqual(0, match.get('seats_open'))
+        self.assertEqual(
+            sorted([self.player_id, self.opponent_id]), sorted(self.get_match_player_ids(match_id))
+        )
+
+    def test_create_without_opponent_waits_for_one(self):
+        with self.assertNumQueries(7):
+            response = self.post('/matches', data={'game_id': self.game_id})
+        self.assertEqual(201, response.status_code)
+        match = json.loads(response.data)
+        self.assertEqual([self.player_id], self.get_match_player_ids(match.get('id')))
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
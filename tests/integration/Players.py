@@ -1,8 +1,9 @@
 import unittest
 import json
 
-from common import NoAuthTest, AuthTokenTest, get_incremental_username, \
+from common import NoAuthTest, AuthTokenTest, SignedAuthTokenTest, get_incremental_username, \
     get_incremental_email, get_incremental_avatar_url
+from application import auth_token_cache, auth_token_generation_cache
 from application.models.Player import Player
 from application.services.PlayersService import PlayersService
 
@@ -11,7 +12,8 @@ class NoAuthPlayersIndex(NoAuthTest):
 
     def test_index_returns_all_players(self):
         index_url = '/players'
-        response = self.get(index_url)
+        with self.assertNumQueries(1):
+            response = self.get(index_url)
         self.assertEqual(200, response.status_code)
         players = json.loads(response.data)
         self.assertEqual(self.NUM_PLAYERS, len(players))
@@ -20,7 +22,8 @@ class NoAuthPlayersIndex(NoAuthTest):
         index_url = '/players'
         limit = int(self.NUM_PLAYERS / 2)
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         players = json.loads(response.data)
         self.assertTrue(len(players) > 0)
@@ -30,16 +33,74 @@ class NoAuthPlayersIndex(NoAuthTest):
         index_url = '/players'
         offset = int(self.NUM_PLAYERS / 2)
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         players = json.loads(response.data)
         self.assertEqual(self.NUM_PLAYERS - offset, len(players))
 
+    def test_index_returns_players_after_id(self):
+        index_url = '/players'
+        after_id = int(self.NUM_PLAYERS / 2)
+        query_string = {'after_id': after_id}
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
+        self.assertEqual(200, response.status_code)
+        players = json.loads(response.data)
+        self.assertEqual(self.NUM_PLAYERS - after_id, len(players))
+        self.assertTrue(all(int(player_id) > after_id for player_id in players))
+
+    def test_index_returns_players_before_id(self):
+        index_url = '/players'
+        before_id = self.NUM_PLAYERS
+        limit = 2
+        query_string = {'before_id': before_id, 'limit': limit}
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
+        self.assertEqual(200, response.status_code)
+        players = json.loads(response.data)
+        self.assertEqual(limit, len(players))
+        self.assertEqual({str(before_id - 2), str(before_id - 1)}, set(players.keys()))
+
+    def test_index_returns_next_cursor_for_full_page(self):
+        index_url = '/players'
+        limit = int(self.NUM_PLAYERS / 2)
+        query_string = {'limit': limit}
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
+        self.assertEqual(200, response.status_code)
+        first_page = json.loads(response.data)
+        cursor = response.headers.get('X-Next-Cursor')
+        self.assertIsNotNone(cursor)
+
+        query_string = {'limit': limit, 'cursor': cursor}
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
+        self.assertEqual(200, response.status_code)
+        second_page = json.loads(response.data)
+        self.assertEqual(limit, len(second_page))
+        self.assertTrue(min(int(player_id) for player_id in second_page) >
+                        max(int(player_id) for player_id in first_page))
+
+    def test_index_returns_error_from_invalid_cursor(self):
+        index_url = '/players'
+        cursor = 'not a cursor'
+        query_string = {'cursor': cursor}
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
+        self.assertEqual(422, response.status_code)
+        errors = json.loads(response.data)
+        self.assertIsNotNone(errors.get('errors'))
+        self.assertIsNotNone(errors.get('errors').get('cursor'))
+        self.assertIsNotNone(errors.get('inputs'))
+        self.assertEqual(cursor, errors.get('inputs').get('cursor'))
+
     def test_index_returns_error_from_invalid_limit(self):
         index_url = '/players'
         limit = 2.5
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -51,7 +112,8 @@ class NoAuthPlayersIndex(NoAuthTest):
         index_url = '/players'
         limit = -1
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -63,7 +125,8 @@ class NoAuthPlayersIndex(NoAuthTest):
         index_url = '/players'
         offset = 2.5
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -75,7 +138,8 @@ class NoAuthPlayersIndex(NoAuthTest):
         index_url = '/players'
         offset = -1
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -95,7 +159,8 @@ class NoAuthPlayersCreate(NoAuthTest):
             'confirm': self.PLAYER_PASSWORD,
             'email': email
         }
-        response = self.post(create_url, data=player_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -118,7 +183,8 @@ class NoAuthPlayersCreate(NoAuthTest):
             'confirm': self.PLAYER_PASSWORD,
             'email': email
         }
-        response = self.post(create_url, data=player_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -142,7 +208,8 @@ class NoAuthPlayersCreate(NoAuthTest):
             'confirm': self.PLAYER_PASSWORD,
             'email': email
         }
-        response = self.post(create_url, data=player_data)
+        with self.assertNumQueries(1):
+            response = self.post(create_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -163,7 +230,8 @@ class NoAuthPlayersCreate(NoAuthTest):
             'password': self.PLAYER_PASSWORD,
             'confirm': self.PLAYER_PASSWORD
         }
-        response = self.post(create_url, data=player_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -186,7 +254,8 @@ class NoAuthPlayersCreate(NoAuthTest):
             'confirm': self.PLAYER_PASSWORD,
             'email': email
         }
-        response = self.post(create_url, data=player_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -210,7 +279,8 @@ class NoAuthPlayersCreate(NoAuthTest):
             'confirm': self.PLAYER_PASSWORD,
             'email': email
         }
-        response = self.post(create_url, data=player_data)
+        with self.assertNumQueries(1):
+            response = self.post(create_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -232,7 +302,8 @@ class NoAuthPlayersCreate(NoAuthTest):
             'confirm': self.PLAYER_PASSWORD,
             'email': email
         }
-        response = self.post(create_url, data=player_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -254,7 +325,8 @@ class NoAuthPlayersCreate(NoAuthTest):
             'password': self.PLAYER_PASSWORD,
             'email': email
         }
-        response = self.post(create_url, data=player_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -277,7 +349,8 @@ class NoAuthPlayersCreate(NoAuthTest):
             'confirm': 'password1',
             'email': email
         }
-        response = self.post(create_url, data=player_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -303,7 +376,8 @@ class NoAuthPlayersCreate(NoAuthTest):
             'email': email,
             'avatar_url': avatar_url
         }
-        response = self.post(create_url, data=player_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -328,7 +402,8 @@ class NoAuthPlayersCreate(NoAuthTest):
             'email': email,
             'avatar_url': avatar_url
         }
-        response = self.post(create_url, data=player_data)
+        with self.assertNumQueries(2):
+            response = self.post(create_url, data=player_data)
         self.assertEqual(201, response.status_code)
         player = json.loads(response.data)
         self.assertIsNotNone(player.get('id'))
@@ -357,7 +432,8 @@ class NoAuthPlayersShow(NoAuthTest):
 
     def test_show_errors_without_auth(self):
         show_url = '/players/{}'.format(self.player.get_id())
-        response = self.get(show_url)
+        with self.assertNumQueries(0):
+            response = self.get(show_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -370,7 +446,8 @@ class AuthPlayersShow(AuthTokenTest):
     def test_show_errors_for_nonexistent_player(self):
         player_id = self.NUM_PLAYERS + 1
         show_url = '/players/{}'.format(player_id)
-        response = self.get(show_url)
+        with self.assertNumQueries(2):
+            response = self.get(show_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -380,7 +457,8 @@ class AuthPlayersShow(AuthTokenTest):
 
     def test_show_returns_player(self):
         show_url = '/players/{}'.format(self.player.get_id())
-        response = self.get(show_url)
+        with self.assertNumQueries(1):
+            response = self.get(show_url)
         self.assertEqual(200, response.status_code)
         player = json.loads(response.data)
         self.assertEqual(self.player.get_id(), player.get('id'))
@@ -394,6 +472,50 @@ class AuthPlayersShow(AuthTokenTest):
         self.assertIsNone(player.get('auth_token'))
 
 
+class PlayersGetMany(NoAuthTest):
+
+    def setUp(self):
+        super(PlayersGetMany, self).setUp()
+        self.player_ids = [
+            PlayersService.get_instance().get_from_username(get_incremental_username(increment)).get_id()
+            for increment in [3, 1, 2]
+        ]
+        self.missing_id = max(player.get_id() for player in PlayersService.get_instance().get_list()) + 1
+
+    def test_returns_players_in_requested_order(self):
+        players, missing_ids = PlayersService.get_instance().get_many(self.player_ids)
+        self.assertEqual(self.player_ids, [player.get_id() for player in players])
+        self.assertEqual([], missing_ids)
+
+    def test_returns_missing_ids_in_requested_order(self):
+        requested_ids = [self.missing_id + 1, self.player_ids[0], self.missing_id, self.player_ids[1]]
+        players, missing_ids = PlayersService.get_instance().get_many(requested_ids)
+        self.assertEqual(self.player_ids[:2], [player.get_id() for player in players])
+        self.assertEqual([self.missing_id + 1, self.missing_id], missing_ids)
+
+    def test_returns_repeated_missing_id_once(self):
+        requested_ids = [self.missing_id, self.player_ids[0], self.missing_id, self.player_ids[0]]
+        players, missing_ids = PlayersService.get_instance().get_many(requested_ids)
+        self.assertEqual([self.player_ids[0]] * 2, [player.get_id() for player in players])
+        self.assertEqual([self.missing_id], missing_ids)
+
+    def test_returns_all_ids_missing(self):
+        players, missing_ids = PlayersService.get_instance().get_many([self.missing_id, self.missing_id + 1])
+        self.assertEqual([], players)
+        self.assertEqual([self.missing_id, self.missing_id + 1], missing_ids)
+
+    def test_returns_nothing_for_no_ids(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(([], []), PlayersService.get_instance().get_many([]))
+
+    def test_loaded_players_are_not_queried_again(self):
+        PlayersService.get_instance().get_many(self.player_ids)
+        with self.assertNumQueries(1):
+            players, missing_ids = PlayersService.get_instance().get_many(self.player_ids + [self.missing_id])
+        self.assertEqual(self.player_ids, [player.get_id() for player in players])
+        self.assertEqual([self.missing_id], missing_ids)
+
+
 class NoAuthPlayersUpdate(NoAuthTest):
 
     def test_update_errors_without_auth(self):
@@ -402,7 +524,8 @@ class NoAuthPlayersUpdate(NoAuthTest):
         player_data = {
             'username': username
         }
-        response = self.put(update_url, data=player_data)
+        with self.assertNumQueries(0):
+            response = self.put(update_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -419,7 +542,8 @@ class AuthPlayersUpdate(AuthTokenTest):
         player_data = {
             'username': username
         }
-        response = self.put(update_url, data=player_data)
+        with self.assertNumQueries(2):
+            response = self.put(update_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -434,7 +558,8 @@ class AuthPlayersUpdate(AuthTokenTest):
         player_data = {
             'username': username
         }
-        response = self.put(update_url, data=player_data)
+        with self.assertNumQueries(1):
+            response = self.put(update_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -454,7 +579,8 @@ class AuthPlayersUpdate(AuthTokenTest):
         player_data = {
             'username': username,
         }
-        response = self.put(update_url, data=player_data)
+        with self.assertNumQueries(2):
+            response = self.put(update_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -473,7 +599,8 @@ class AuthPlayersUpdate(AuthTokenTest):
         player_data = {
             'email': email
         }
-        response = self.put(update_url, data=player_data)
+        with self.assertNumQueries(1):
+            response = self.put(update_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -493,7 +620,8 @@ class AuthPlayersUpdate(AuthTokenTest):
         player_data = {
             'email': email
         }
-        response = self.put(update_url, data=player_data)
+        with self.assertNumQueries(2):
+            response = self.put(update_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -512,7 +640,8 @@ class AuthPlayersUpdate(AuthTokenTest):
         player_data = {
             'avatar_url': avatar_url
         }
-        response = self.put(update_url, data=player_data)
+        with self.assertNumQueries(1):
+            response = self.put(update_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -539,7 +668,8 @@ class AuthPlayersUpdate(AuthTokenTest):
             'avatar_url': avatar_url,
             'is_active': False
         }
-        response = self.put(update_url, data=player_data)
+        with self.assertNumQueries(3):
+            response = self.put(update_url, data=player_data)
         self.assertEqual(200, response.status_code)
         player = json.loads(response.data)
         self.assertIsNotNone(player.get('id'))
@@ -566,7 +696,8 @@ class NoAuthPlayersDelete(NoAuthTest):
 
     def test_delete_errors_without_auth(self):
         delete_url = '/players/{}'.format(self.player.get_id())
-        response = self.delete(delete_url)
+        with self.assertNumQueries(0):
+            response = self.delete(delete_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -579,7 +710,8 @@ class AuthPlayersDelete(AuthTokenTest):
     def test_delete_errors_for_nonexistent_player(self):
         player_id = self.NUM_PLAYERS + 1
         delete_url = '/players/{}'.format(player_id)
-        response = self.delete(delete_url)
+        with self.assertNumQueries(2):
+            response = self.delete(delete_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -590,7 +722,8 @@ class AuthPlayersDelete(AuthTokenTest):
     def test_delete_deletes_player(self):
         delete_url = '/players/{}'.format(self.player.get_id())
         self.assertEqual(True, self.player.get_is_active())
-        response = self.delete(delete_url)
+        with self.assertNumQueries(3):
+            response = self.delete(delete_url)
         self.assertEqual(200, response.status_code)
         player = json.loads(response.data)
         self.assertIsNotNone(player.get('id'))
@@ -620,7 +753,8 @@ class NoAuthPlayersSignin(NoAuthTest):
         player_data = {
             'password': password
         }
-        response = self.post(signin_url, data=player_data)
+        with self.assertNumQueries(0):
+            response = self.post(signin_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -637,7 +771,8 @@ class NoAuthPlayersSignin(NoAuthTest):
             'username': username,
             'password': password
         }
-        response = self.post(signin_url, data=player_data)
+        with self.assertNumQueries(1):
+            response = self.post(signin_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -652,7 +787,8 @@ class NoAuthPlayersSignin(NoAuthTest):
         player_data = {
             'username': username
         }
-        response = self.post(signin_url, data=player_data)
+        with self.assertNumQueries(0):
+            response = self.post(signin_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -669,7 +805,8 @@ class NoAuthPlayersSignin(NoAuthTest):
             'username': username,
             'password': password
         }
-        response = self.post(signin_url, data=player_data)
+        with self.assertNumQueries(1):
+            response = self.post(signin_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -688,7 +825,8 @@ class NoAuthPlayersSignin(NoAuthTest):
             'username': username,
             'password': password
         }
-        response = self.post(signin_url, data=player_data)
+        with self.assertNumQueries(1):
+            response = self.post(signin_url, data=player_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -705,7 +843,8 @@ class NoAuthPlayersSignin(NoAuthTest):
             'username': username,
             'password': password
         }
-        response = self.post(signin_url, data=player_data)
+        with self.assertNumQueries(3):
+            response = self.post(signin_url, data=player_data)
         self.assertEqual(200, response.status_code)
         player = json.loads(response.data)
         self.assertEqual(self.player.get_id(), player.get('id'))
@@ -732,7 +871,8 @@ class NoAuthPlayersSignout(NoAuthTest):
 
     def test_signout_errors_without_auth(self):
         signout_url = '/players/signout'
-        response = self.post(signout_url)
+        with self.assertNumQueries(0):
+            response = self.post(signout_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -746,7 +886,8 @@ class AuthPlayersSignout(AuthTokenTest):
         player_id = self.player.get_id()
         self.assertEqual(True, self.player.get_is_active())
         signout_url = '/players/signout'
-        response = self.post(signout_url)
+        with self.assertNumQueries(2):
+            response = self.post(signout_url)
         self.assertEqual(200, response.status_code)
         player = json.loads(response.data)
         self.assertIsNotNone(player.get('Success'))
@@ -755,6 +896,86 @@ class AuthPlayersSignout(AuthTokenTest):
         saved_player = PlayersService.get_instance().get(player_id)
         self.assertEqual(saved_player.get_auth_token(), None)
 
+    def test_signout_invalidates_cached_auth_token(self):
+        show_url = '/players/{}'.format(self.player.get_id())
+        with self.assertNumQueries(1):
+            response = self.get(show_url)
+        self.assertEqual(200, response.status_code)
+
+        signout_url = '/players/signout'
+        with self.assertNumQueries(1):
+            response = self.post(signout_url)
+        self.assertEqual(200, response.status_code)
+
+        # Make sure the token is no longer accepted, even though it was cached by the first request
+        with self.assertNumQueries(1):
+            response = self.get(show_url)
+        self.assertEqual(422, response.status_code)
+        errors = json.loads(response.data)
+        self.assertIsNotNone(errors.get('errors'))
+        self.assertIsNotNone(errors.get('errors').get('UnauthorizedAccess'))
+
+
+class SignedAuthPlayersSignout(SignedAuthTokenTest):
+
+    def test_show_returns_player_with_signed_auth_token(self):
+        show_url = '/players/{}'.format(self.player.get_id())
+        with self.assertNumQueries(1):
+            response = self.get(show_url)
+        self.assertEqual(200, response.status_code)
+        player = json.loads(response.data)
+        self.assertEqual(self.player.get_id(), player.get('id'))
+
+        # Make sure the signed auth token was not stored on the player
+        saved_player = PlayersService.get_instance().get(self.player.get_id())
+        self.assertIsNone(saved_player._auth_token)
+
+    def test_show_errors_for_tampered_signed_auth_token(self):
+        show_url = '/players/{}'.format(self.player.get_id())
+        with self.assertNumQueries(0):
+            response = self.get(show_url, query_string={'auth_token': self.player.get_auth_token() + 'x'})
+        self.assertEqual(422, response.status_code)
+        errors = json.loads(response.data)
+        self.assertIsNotNone(errors.get('errors'))
+        self.assertIsNotNone(errors.get('errors').get('UnauthorizedAccess'))
+
+    def test_signout_revokes_signed_auth_token(self):
+        generation = self.player.get_auth_token_generation()
+        signout_url = '/players/signout'
+        with self.assertNumQueries(3):
+            response = self.post(signout_url)
+        self.assertEqual(200, response.status_code)
+        player = json.loads(response.data)
+        self.assertIsNotNone(player.get('Success'))
+
+        # Make sure the generation was bumped in the database
+        saved_player = PlayersService.get_instance().get(self.player.get_id())
+        self.assertEqual(generation + 1, saved_player.get_auth_token_generation())
+
+        # Make sure the revoked token is no longer accepted
+        show_url = '/players/{}'.format(self.player.get_id())
+        with self.assertNumQueries(0):
+            response = self.get(show_url)
+        self.assertEqual(422, response.status_code)
+        errors = json.loads(response.data)
+        self.assertIsNotNone(errors.get('errors'))
+        self.assertIsNotNone(errors.get('errors').get('UnauthorizedAccess'))
+
+    def test_token_revoked_by_another_process_is_rejected(self):
+        self.assertTrue(self.player.revoke_signed_auth_tokens())
+
+        # Another process never saw the revocation
+        auth_token_cache.clear()
+        auth_token_generation_cache.clear()
+
+        # Handlers that never load the current player, such as show, reject the token too
+        with self.assertNumQueries(1):
+            response = self.get('/players/{}'.format(self.player.get_id()))
+        self.assertEqual(422, response.status_code)
+        errors = json.loads(response.data)
+        self.assertIsNotNone(errors.get('errors'))
+        self.assertIsNotNone(errors.get('errors').get('UnauthorizedAccess'))
+
 
 def main():
     unittest.main()
@@ -0,0 +1,319 @@
+import unittest
+import random
+
+from sqlalchemy import MetaData, Table, Column, PickleType, select
+
+from common import NoAuthTest
+from application import db, migrations
+from application.models.ColumnTypes import is_pickled
+from application.models.DefinitionFiller import DefinitionFiller
+from application.models.DefinitionTemplate import DefinitionTemplate
+from application.models.Match import Match
+from application.models.Player import Player
+from application.services.BaseService import BaseService
+from application.services.DefinitionFillersService import DefinitionFillersService
+from application.services.DefinitionTemplatesService import DefinitionTemplatesService
+from application.services.MatchesService import MatchesService
+from application.services.PlayersService import PlayersService
+from application.services.TurnDefinitionFillersService import TurnDefinitionFillersService
+from application.services.TurnPlayersService import TurnPlayersService
+from application.services.TurnsService import TurnsService
+from application.services.WordsService import WordsService
+
+
+class QueryPlanTest(NoAuthTest):
+    REQUIRES_MYSQL = True
+
+    def setUp(self):
+        super(QueryPlanTest, self).setUp()
+        BaseService.clear_record_caches()
+        db.session.expunge_all()
+
+    def get_plans(self, function, *args):
+        """Call the function, returning the EXPLAIN rows of every SELECT it issued"""
+        with self.count_queries() as statements:
+            function(*args)
+
+        statements = [
+            (statement, parameters) for statement, parameters in statements
+            if statement.lstrip().upper().startswith('SELECT')
+        ]
+        self.assertTrue(len(statements) > 0)
+
+        plans = []
+        connection = db.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            for statement, parameters in statements:
+                cursor.execute('EXPLAIN ' + statement, parameters)
+                columns = [column[0] for column in cursor.description]
+                plans.extend(dict(zip(columns, row)) for row in cursor.fetchall())
+        finally:
+            connection.close()
+
+        return plans
+
+    def assertCanUseIndex(self, plans, table_name, index_name):
+        possible_keys = [
+            (plan.get('possible_keys') or '').split(',') for plan in plans if plan.get('table') == table_name
+        ]
+        self.assertTrue(len(possible_keys) > 0, 'No query read from {}'.format(table_name))
+        self.assertTrue(
+            all(index_name in keys for keys in possible_keys),
+            'A query read from {} without being able to use {}'.format(table_name, index_name)
+        )
+
+
+class PlayersQueryPlans(QueryPlanTest):
+
+    def test_get_from_auth_uses_auth_token_index(self):
+        plans = self.get_plans(PlayersService.get_instance().get_from_auth, 'not_a_token')
+        self.assertCanUseIndex(plans, 'players', 'ix_players_auth_token')
+
+    def test_get_from_username_uses_username_index(self):
+        plans = self.get_plans(PlayersService.get_instance().get_from_username, self.player.get_username())
+        self.assertCanUseIndex(plans, 'players', '_username')
+
+    def test_get_uses_primary_key(self):
+        plans = self.get_plans(PlayersService.get_instance().get, self.player.get_id())
+        self.assertCanUseIndex(plans, 'players', 'PRIMARY')
+
+
+class MatchesQueryPlans(QueryPlanTest):
+
+    def test_get_for_player_uses_match_players_index(self):
+        plans = self.get_plans(MatchesService.get_instance().get_for_player, 1, self.player.get_id())
+        self.assertCanUseIndex(plans, 'match_players', 'ix_match_players_match_player')
+
+    def test_get_open_match_ids_uses_open_seats_index(self):
+        plans = self.get_plans(
+            MatchesService.get_instance().get_open_match_ids, self.game.get_id(), self.player.get_id(), 8
+        )
+        self.assertCanUseIndex(plans, 'matches', 'ix_matches_open_seats')
+
+    def test_get_opponent_match_ids_uses_open_seats_and_match_players_indexes(self):
+        plans = self.get_plans(
+            MatchesService.get_instance().get_opponent_match_ids, self.game.get_id(), self.player.get_id(), 1, 8
+        )
+        self.assertCanUseIndex(plans, 'matches', 'ix_matches_open_seats')
+        self.assertCanUseIndex(plans, 'match_players', 'ix_match_players_match_player')
+
+    def test_get_list_by_game_for_player_uses_game_state_index(self):
+        plans = self.get_plans(
+            MatchesService.get_instance().get_list_by_game_for_player, self.game.get_id(), self.player.get_id()
+        )
+        self.assertCanUseIndex(plans, 'matches', 'ix_matches_game_state')
+
+
+class TurnsQueryPlans(QueryPlanTest):
+
+    def test_get_active_turns_uses_match_state_index(self):
+        plans = self.get_plans(TurnsService.get_instance().get_active_turns, 1)
+        self.assertCanUseIndex(plans, 'turns', 'ix_turns_match_state')
+
+    def test_get_last_selector_id_for_match_uses_match_state_index(self):
+        plans = self.get_plans(TurnsService.get_instance().get_last_selector_id_for_match, 1)
+        self.assertCanUseIndex(plans, 'turns', 'ix_turns_match_state')
+
+    def test_get_list_by_turns_for_player_uses_turn_player_index(self):
+        plans = self.get_plans(
+            TurnPlayersService.get_instance().get_list_by_turns_for_player, [1, 2], self.player.get_id()
+        )
+        self.assertCanUseIndex(plans, 'turn_player', 'ix_turn_player_turn_player')
+
+    def test_get_for_turn_by_player_uses_turn_player_index(self):
+        plans = self.get_plans(TurnPlayersService.get_instance().get_for_turn_by_player, 1, self.player.get_id())
+        self.assertCanUseIndex(plans, 'turn_player', 'ix_turn_player_turn_player')
+
+    def test_get_list_by_turn_uses_turn_index(self):
+        plans = self.get_plans(TurnDefinitionFillersService.get_instance().get_list_by_turn, 1)
+        self.assertCanUseIndex(plans, 'turn_definition_fillers', 'ix_turn_definition_fillers_turn')
+
+    def test_get_list_by_turns_uses_turn_index(self):
+        plans = self.get_plans(TurnDefinitionFillersService.get_instance().get_list_by_turns, [1, 2])
+        self.assertCanUseIndex(plans, 'turn_definition_fillers', 'ix_turn_definition_fillers_turn')
+
+    def test_get_used_ids_for_match_uses_match_state_index(self):
+        plans = self.get_plans(WordsService.get_instance().get_used_ids_for_match, 1)
+        self.assertCanUseIndex(plans, 'turns', 'ix_turns_match_state')
+
+
+class CatalogQueryPlans(QueryPlanTest):
+
+    def test_get_new_word_for_match_uses_active_words_index(self):
+        plans = self.get_plans(WordsService.get_instance().get_new_word_for_match, 1)
+        self.assertCanUseIndex(plans, 'words', 'ix_words_active')
+
+    def test_get_new_word_for_match_by_offset_uses_active_words_index(self):
+        # Draw only ids past the highest word id, so the word is read at a random offset of the counted words
+        self.addCleanup(setattr, random, 'randint', random.randint)
+        random.randint = lambda a, b: b + 1
+
+        plans = self.get_plans(WordsService.get_instance().get_new_word_for_match, 1)
+        self.assertCanUseIndex(plans, 'words', 'ix_words_active')
+
+    def test_get_templates_by_word_uses_word_active_index(self):
+        plans = self.get_plans(
+            DefinitionTemplatesService.get_instance().get_list_by_word, self.definition_template.get_word().get_id()
+        )
+        self.assertCanUseIndex(plans, 'definition_templates', 'ix_definition_templates_word_active')
+
+    def test_get_fillers_by_word_uses_word_active_index(self):
+        plans = self.get_plans(
+            DefinitionFillersService.get_instance().get_list_by_word, self.definition_template.get_word().get_id()
+        )
+        self.assertCanUseIndex(plans, 'definition_templates', 'ix_definition_templates_word_active')
+
+
+class MigrationsUpgrade(NoAuthTest):
+    # The schema is dropped and rebuilt through the migrations, which cannot happen inside a transaction
+    TRANSACTIONAL = False
+    REQUIRES_MYSQL = True
+
+    def setUp(self):
+        super(MigrationsUpgrade, self).setUp()
+        db.session.remove()
+        db.drop_all()
+        migrations.schema_migrations.drop(db.engine, checkfirst=True)
+
+    def tearDown(self):
+        migrations.schema_migrations.drop(db.engine, checkfirst=True)
+        super(MigrationsUpgrade, self).tearDown()
+
+    def test_upgrade_creates_the_schema_with_its_indexes(self):
+        self.assertEqual(migrations.MIGRATIONS, [version for version, changes in migrations.upgrade()])
+        self.assertEqual([], migrations.get_pending_versions())
+
+        for table in db.Model.metadata.sorted_tables:
+            index_names = migrations.get_index_names(table.name)
+            for index in table.indexes:
+                self.assertIn(index.name, index_names)
+
+    def test_upgrade_creates_missing_indexes(self):
+        migrations.upgrade()
+        db.engine.execute('DROP INDEX ix_turns_match_state ON turns')
+        db.engine.execute(migrations.schema_migrations.delete().where(
+            migrations.schema_migrations.c.version == 'v002_create_indexes'
+        ))
+
+        self.assertEqual(
+            [('v002_create_indexes', ['Created index ix_turns_match_state on turns'])], migrations.upgrade()
+        )
+        self.assertIn('ix_turns_match_state', migrations.get_index_names('turns'))
+
+
+class MigrationsLegacyUpgrade(NoAuthTest):
+    """Upgrade a database created before the migrations existed, as it was left by the earlier schema changes"""
+    TRANSACTIONAL = False
+
+    # Columns the earlier schema did not have, and the columns it stored with PickleType
+    MISSING_COLUMNS = {'players': ['_auth_token_generation'], 'matches': ['_seats_open']}
+    PICKLED_COLUMNS = {
+        'definition_templates': ['_filler_lexical_classes'],
+        'definition_fillers': ['_filler'],
+        'turn_definition_fillers': ['_filler']
+    }
+
+    def setUp(self):
+        super(MigrationsLegacyUpgrade, self).setUp()
+        db.session.remove()
+        db.drop_all()
+        migrations.schema_migrations.drop(db.engine, checkfirst=True)
+        self.tables = self.create_legacy_schema()
+        self.insert_legacy_data()
+
+    def tearDown(self):
+        migrations.schema_migrations.drop(db.engine, checkfirst=True)
+        super(MigrationsLegacyUpgrade, self).tearDown()
+
+    def create_legacy_schema(self):
+        metadata = MetaData()
+        for table in db.Model.metadata.sorted_tables:
+            columns = []
+            for column in table.columns:
+                if column.name in self.MISSING_COLUMNS.get(table.name, []):
+                    continue
+                if column.name in self.PICKLED_COLUMNS.get(table.name, []):
+                    column = Column(column.name, PickleType, nullable=column.nullable)
+                else:
+                    column = column.copy()
+                columns.append(column)
+            Table(table.name, metadata, *columns)
+
+        metadata.create_all(db.engine)
+        return metadata.tables
+
+    def insert_legacy_data(self):
+        def insert(table_name, **values):
+            return db.engine.execute(self.tables[table_name].insert().values(**values)).inserted_primary_key[0]
+
+        word_id = insert('words', _lexeme_form='legacy', _lexical_class='noun', _is_active=True)
+        self.definition_template_id = insert(
+            'definition_templates', _word_id=word_id, _definition='a {} of old', _filler_lexical_classes=['noun'],
+            _is_active=True
+        )
+        self.definition_filler_id = insert(
+            'definition_fillers', _definition_template_id=self.definition_template_id, _filler=['thing'],
+            _is_dictionary=True, _is_active=True
+        )
+
+        player_ids = [
+            insert('players', _username=name, _email='{}@test.com'.format(name), _password='password', _is_active=True)
+            for name in ['legacy_1', 'legacy_2']
+        ]
+        self.player_id = player_ids[0]
+        game_id = insert(
+            'games', _name='legacy', _description='legacy', _match_size=3, _definition_filler_count=5, _is_active=True
+        )
+
+        self.waiting_match_id = insert('matches', _game_id=game_id, _state=Match.STATE_WAITING[0])
+        self.started_match_id = insert('matches', _game_id=game_id, _state=Match.STATE_STARTED[0])
+        match_players = self.tables['match_players']
+        db.engine.execute(match_players.insert().values(match_id=self.waiting_match_id, player_id=player_ids[0]))
+        for player_id in player_ids:
+            db.engine.execute(match_players.insert().values(match_id=self.started_match_id, player_id=player_id))
+
+    def test_upgrade_brings_the_legacy_schema_up_to_date(self):
+        self.assertEqual(migrations.MIGRATIONS, [version for version, changes in migrations.upgrade()])
+        self.assertEqual([], migrations.get_pending_versions())
+
+        self.assertIn('_auth_token_generation', migrations.get_column_names('players'))
+        self.assertIn('_seats_open', migrations.get_column_names('matches'))
+        self.assertIn('ix_matches_open_seats', migrations.get_index_names('matches'))
+
+        self.assertEqual(0, Player.query.get(self.player_id).get_auth_token_generation())
+        self.assertEqual(2, Match.query.get(self.waiting_match_id).get_seats_open())
+        self.assertEqual(0, Match.query.get(self.started_match_id).get_seats_open())
+
+    def get_raw_values(self, table_name, column_name):
+        raw_column = db.literal_column('{}.{}'.format(table_name, column_name))
+        return [str(value) for value, in db.engine.execute(select([raw_column]).select_from(self.tables[table_name]))]
+
+    def test_upgrade_reencodes_pickled_fillers(self):
+        self.assertTrue(is_pickled(self.get_raw_values('definition_fillers', '_filler')[0]))
+        migrations.upgrade()
+
+        for table_name, column_names in self.PICKLED_COLUMNS.iteritems():
+            for column_name in column_names:
+                for value in self.get_raw_values(table_name, column_name):
+                    self.assertFalse(is_pickled(value))
+
+        definition_template = DefinitionTemplate.query.get(self.definition_template_id)
+        self.assertEqual(['noun'], definition_template.get_filler_lexical_classes())
+        self.assertEqual(['thing'], DefinitionFiller.query.get(self.definition_filler_id).get_filler())
+
+    def test_models_read_pickled_fillers_before_upgrade(self):
+        definition_template = DefinitionTemplate.query.get(self.definition_template_id)
+        self.assertEqual(['noun'], definition_template.get_filler_lexical_classes())
+        self.assertEqual(['thing'], DefinitionFiller.query.get(self.definition_filler_id).get_filler())
+
+    def test_upgrade_applies_nothing_twice(self):
+        migrations.upgrade()
+        self.assertEqual([], migrations.upgrade())
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
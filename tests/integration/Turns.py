@@ -0,0 +1,146 @@
+import unittest
+import random
+from datetime import datetime, timedelta
+
+from common import NoAuthTest, get_incremental_username
+from application.models.Match import Match
+from application.models.Turn import Turn
+from application.models.TurnDefinitionFiller import TurnDefinitionFiller
+from application.services.PlayersService import PlayersService
+from application.services.WordsService import WordsService
+from application.services.TurnsService import TurnsService, MATCH_NOT_FOUND_ERROR
+
+
+class TurnsPlayerTurn(NoAuthTest):
+    # The match, the active turns, the player's turn players and the fillers of the active turns
+    TURN_QUERIES = 4
+
+    def setUp(self):
+        super(TurnsPlayerTurn, self).setUp()
+        self.selector = self.get_dummy_player(1)
+        self.supplier = self.get_dummy_player(2)
+
+        self.match = Match(self.game, self.selector)
+        self.match.add_player(self.supplier)
+        self.match.save()
+
+    def get_dummy_player(self, increment):
+        return PlayersService.get_instance().get_from_username(get_incremental_username(increment))
+
+    def create_turn(self, selector, minutes_ago=0, state=Turn.STATE_SUPPLYING):
+        turn = Turn(self.match, selector, self.word)
+        turn._set_state(state[0])
+        # Turns created within the same second are otherwise ordered arbitrarily
+        turn._date_created = datetime.utcnow() - timedelta(minutes=minutes_ago)
+        turn.save()
+        return turn
+
+    def supply_filler(self, turn, supplier):
+        turn_definition_filler = TurnDefinitionFiller(
+            turn, self.definition_template, ['a', 'b', 'c'], False, supplier
+        )
+        turn_definition_filler.save()
+        return turn_definition_filler
+
+    def get_player_turn(self, player, num_queries=TURN_QUERIES):
+        # Read the ids first, since the records were expired when they were saved
+        match_id = self.match.get_id()
+        player_id = player.get_id()
+        with self.assertNumQueries(num_queries):
+            return TurnsService.get_instance().get_player_turn(match_id, player_id)
+
+    def test_errors_for_match_without_player(self):
+        turn_state, errors = TurnsService.get_instance().get_player_turn(
+            self.match.get_id(), self.get_dummy_player(3).get_id()
+        )
+        self.assertIsNone(turn_state)
+        self.assertEqual(MATCH_NOT_FOUND_ERROR, errors)
+
+    def test_creates_turn_when_none_are_active(self):
+        self.create_turn(self.selector, 10, Turn.STATE_COMPLETED)
+
+        # Draw an unused word, so the word is picked from the sample rather than by counting the words
+        unused_word_id = [word.get_id() for word in WordsService.get_instance().get_list() if word is not self.word][0]
+        self.addCleanup(setattr, random, 'randint', random.randint)
+        random.randint = lambda a, b: unused_word_id
+
+        # Creating the turn also picks its word and its selector, then inserts the turn with a turn player for each
+        # player and reads back this player's
+        (turn, turn_player, turn_definition_fillers), errors = self.get_player_turn(self.supplier, 12)
+        self.assertEqual(unused_word_id, turn.get_word().get_id())
+        self.assertIsNone(errors)
+        self.assertEqual(Turn.STATE_SUPPLYING[0], turn.get_state())
+        self.assertEqual(self.match.get_id(), turn.get_match().get_id())
+        self.assertEqual(self.supplier.get_id(), turn_player.get_player().get_id())
+        self.assertEqual(turn.get_id(), turn_player.get_turn_id())
+        # The last selector was the first player, so the second selects next
+        self.assertTrue(turn_player.get_is_selector())
+        self.assertEqual([], turn_definition_fillers)
+        self.assertEqual(1, len(TurnsService.get_instance().get_active_turns(self.match.get_id())))
+
+    def test_returns_selectors_turn(self):
+        turn = self.create_turn(self.selector)
+        filler = self.supply_filler(turn, self.supplier)
+
+        (player_turn, turn_player, turn_definition_fillers), errors = self.get_player_turn(self.selector)
+        self.assertIsNone(errors)
+        self.assertEqual(turn.get_id(), player_turn.get_id())
+        self.assertEqual(self.selector.get_id(), turn_player.get_player().get_id())
+        self.assertTrue(turn_player.get_is_selector())
+        self.assertEqual([filler.get_id()], [filler.get_id() for filler in turn_definition_fillers])
+
+    def test_returns_suppliers_turn(self):
+        turn = self.create_turn(self.selector)
+
+        (player_turn, turn_player, turn_definition_fillers), errors = self.get_player_turn(self.supplier)
+        self.assertIsNone(errors)
+        self.assertEqual(turn.get_id(), player_turn.get_id())
+        self.assertEqual(self.supplier.get_id(), turn_player.get_player().get_id())
+        self.assertFalse(turn_player.get_is_selector())
+        self.assertEqual([], turn_definition_fillers)
+
+    def test_returns_current_of_several_active_turns(self):
+        first_turn = self.create_turn(self.selector, 20, Turn.STATE_SELECTING)
+        first_filler = self.supply_filler(first_turn, self.supplier)
+        second_turn = self.create_turn(self.supplier, 10)
+        third_turn = self.create_turn(self.selector)
+
+        # The selector has yet to select from the oldest turn
+        (player_turn, turn_player, turn_definition_fillers), errors = self.get_player_turn(self.selector)
+        self.assertIsNone(errors)
+        self.assertEqual(first_turn.get_id(), player_turn.get_id())
+        self.assertTrue(turn_player.get_is_selector())
+        self.assertEqual([first_filler.get_id()], [filler.get_id() for filler in turn_definition_fillers])
+
+        # The supplier has supplied the oldest turn, so is waiting on the next, which they select
+        (player_turn, turn_player, turn_definition_fillers), errors = self.get_player_turn(self.supplier)
+        self.assertIsNone(errors)
+        self.assertEqual(second_turn.get_id(), player_turn.get_id())
+        self.assertTrue(turn_player.get_is_selector())
+        self.assertEqual([], turn_definition_fillers)
+
+        # Once the oldest turn has its selection, the selector moves on to supplying the next
+        first_filler.set_selector(self.selector)
+        first_filler.save()
+        (player_turn, turn_player, turn_definition_fillers), errors = self.get_player_turn(self.selector)
+        self.assertIsNone(errors)
+        self.assertEqual(second_turn.get_id(), player_turn.get_id())
+        self.assertFalse(turn_player.get_is_selector())
+        self.assertNotEqual(third_turn.get_id(), player_turn.get_id())
+
+    def test_queries_do_not_grow_with_active_turns(self):
+        for minutes_ago in range(10, 0, -1):
+            turn = self.create_turn(self.selector, minutes_ago)
+            self.supply_filler(turn, self.supplier)
+
+        # The supplier has supplied every turn, so every turn is considered
+        turn_state, errors = self.get_player_turn(self.supplier)
+        self.assertIsNone(turn_state)
+        self.assertIsNotNone(errors)
+
+
+def main():
+    unittest.main()
+
+if __name__ == '__main__':
+    main()
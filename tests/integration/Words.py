@@ -1,25 +1,93 @@
 import unittest
 import json
+import random
 
-from common import NoAuthTest
+from common import NoAuthTest, AuthTokenTest
+from application import db
+from application.models.Match import Match
+from application.models.Turn import Turn
+from application.models.DefinitionFiller import DefinitionFiller
 from application.models.Word import Word
+from application.models.UnitOfWork import UnitOfWork
 from application.services.WordsService import WordsService
+from application.services.DefinitionTemplatesService import DefinitionTemplatesService
+from application.services.DefinitionFillersService import DefinitionFillersService
+from application.services.DictionaryImportService import DictionaryImportService
 
 
 class WordsIndex(NoAuthTest):
 
     def test_index_returns_all_words(self):
         index_url = '/words'
-        response = self.get(index_url)
+        with self.assertNumQueries(1):
+            response = self.get(index_url)
         self.assertEqual(200, response.status_code)
         words = json.loads(response.data)
         self.assertEqual(self.NUM_WORDS, len(words))
 
+    def test_index_streams_limited_words_as_ndjson(self):
+        index_url = '/words'
+        limit = int(self.NUM_WORDS / 2)
+        query_string = {'limit': limit}
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string, headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(200, response.status_code)
+        words = [json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual(limit, len(words))
+        self.assertIsNotNone(words[0].get('lexeme_form'))
+
+    def insert_words(self, count):
+        db.session.execute(Word.__table__.insert(), [
+            {'_lexeme_form': 'streamed{}'.format(i), '_lexical_class': 'noun', '_is_active': True} for i in range(count)
+        ])
+        self.NUM_WORDS += count
+
+    def test_index_streams_more_words_than_a_batch(self):
+        self.insert_words(WordsService.STREAM_BATCH_SIZE * 2)
+        expected_ids = [word.get_id() for word in WordsService.get_instance().get_list()]
+
+        # Each batch is one query, and streaming stops at the first batch to come back short
+        with self.assertNumQueries(self.NUM_WORDS // WordsService.STREAM_BATCH_SIZE + 1):
+            response = self.get('/words', headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(200, response.status_code)
+        word_ids = [json.loads(line).get('id') for line in response.data.splitlines()]
+        self.assertEqual(expected_ids, word_ids)
+
+    def test_streamed_list_matches_list_across_batches(self):
+        self.addCleanup(setattr, WordsService, 'STREAM_BATCH_SIZE', WordsService.STREAM_BATCH_SIZE)
+        WordsService.STREAM_BATCH_SIZE = 3
+        self.insert_words(WordsService.STREAM_BATCH_SIZE * 4)
+        word_ids = [word.get_id() for word in WordsService.get_instance().get_list()]
+
+        # Pages ending on a batch boundary, within a batch and past the last word, seeking and skipping
+        for limit, offset, after_id in [
+            (None, None, None), (6, None, None), (7, 2, None), (None, 1, word_ids[4]), (5, None, word_ids[-3]),
+            (None, None, word_ids[-1])
+        ]:
+            streamed_ids = [
+                word.get_id() for word in WordsService.get_instance().get_list(limit, offset, after_id, stream=True)
+            ]
+            listed_ids = [word.get_id() for word in WordsService.get_instance().get_list(limit, offset, after_id)]
+            self.assertEqual(listed_ids, streamed_ids)
+
+    def test_streamed_list_allows_queries_between_records(self):
+        self.insert_words(WordsService.STREAM_BATCH_SIZE + 1)
+
+        word_ids = []
+        for word in WordsService.get_instance().get_list(stream=True):
+            # Any other query on the session, such as a lazy load, must not disturb the records still to come
+            self.assertEqual(word.get_id(), WordsService.get_instance().get(word.get_id()).get_id())
+            word_ids.append(word.get_id())
+
+        self.assertEqual(self.NUM_WORDS, len(word_ids))
+        self.assertEqual(sorted(set(word_ids)), word_ids)
+
     def test_index_returns_limited_words(self):
         index_url = '/words'
         limit = int(self.NUM_WORDS / 2)
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         words = json.loads(response.data)
         self.assertTrue(len(words) > 0)
@@ -29,7 +97,8 @@ class WordsIndex(NoAuthTest):
         index_url = '/words'
         offset = int(self.NUM_WORDS / 2)
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(1):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(200, response.status_code)
         words = json.loads(response.data)
         self.assertEqual(self.NUM_WORDS - offset, len(words))
@@ -38,7 +107,8 @@ class WordsIndex(NoAuthTest):
         index_url = '/words'
         limit = '2.5'
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -50,7 +120,8 @@ class WordsIndex(NoAuthTest):
         index_url = '/words'
         limit = -1
         query_string = {'limit': limit}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -62,7 +133,8 @@ class WordsIndex(NoAuthTest):
         index_url = '/words'
         offset = '2.5'
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -74,7 +146,8 @@ class WordsIndex(NoAuthTest):
         index_url = '/words'
         offset = -1
         query_string = {'offset': offset}
-        response = self.get(index_url, query_string=query_string)
+        with self.assertNumQueries(0):
+            response = self.get(index_url, query_string=query_string)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -91,7 +164,8 @@ class WordsCreate(NoAuthTest):
         word_data = {
             'lexical_class': lexical_class
         }
-        response = self.post(create_url, data=word_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=word_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -108,7 +182,8 @@ class WordsCreate(NoAuthTest):
             'lexeme_form': lexeme_form,
             'lexical_class': lexical_class
         }
-        response = self.post(create_url, data=word_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=word_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -123,7 +198,8 @@ class WordsCreate(NoAuthTest):
         word_data = {
             'lexeme_form': lexeme_form
         }
-        response = self.post(create_url, data=word_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=word_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -140,7 +216,8 @@ class WordsCreate(NoAuthTest):
             'lexeme_form': lexeme_form,
             'lexical_class': lexical_class
         }
-        response = self.post(create_url, data=word_data)
+        with self.assertNumQueries(0):
+            response = self.post(create_url, data=word_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -157,7 +234,8 @@ class WordsCreate(NoAuthTest):
             'lexeme_form': lexeme_form,
             'lexical_class': lexical_class
         }
-        response = self.post(create_url, data=word_data)
+        with self.assertNumQueries(2):
+            response = self.post(create_url, data=word_data)
         self.assertEqual(201, response.status_code)
         word = json.loads(response.data)
         self.assertIsNotNone(word.get('id'))
@@ -177,12 +255,249 @@ class WordsCreate(NoAuthTest):
         self.assertEqual(saved_word.get_is_active(), word.get('is_active'))
 
 
+class WordsImport(AuthTokenTest):
+
+    @staticmethod
+    def get_import_queries(row_count):
+        """
+        Authenticating the player and the batch timestamp, along with the auto increment settings check on MySQL,
+        then one insert per table, or per row without sequential ids
+        """
+        if db.engine.dialect.name != 'mysql':
+            return 2 + row_count
+
+        if DictionaryImportService.has_sequential_multi_row_ids():
+            return 6
+
+        return 3 + row_count
+
+    def setUp(self):
+        super(WordsImport, self).setUp()
+        # The imported words follow the dummy words
+        self.last_word_id = self.word.get_id()
+
+    def post_import(self, lines, content_type='application/x-ndjson', query_string=None):
+        return self.client.post(
+            '/words/import',
+            data='\n'.join(lines),
+            query_string=self.get_params(query_string),
+            headers={'Content-Type': content_type}
+        )
+
+    def test_import_creates_words_from_ndjson(self):
+        entries = [
+            {
+                'lexeme_form': 'foo',
+                'lexical_class': 'noun',
+                'definition_templates': [
+                    {
+                        'definition': 'a {} {}',
+                        'filler_lexical_classes': ['adjective', 'noun'],
+                        'definition_fillers': [
+                            {'filler': ['small', 'bar'], 'is_dictionary': True},
+                            {'filler': ['large', 'baz'], 'is_dictionary': False}
+                        ]
+                    }
+                ]
+            },
+            {
+                'lexeme_form': 'qux',
+                'lexical_class': 'verb'
+            }
+        ]
+        with self.assertNumQueries(self.get_import_queries(5)):
+            response = self.post_import([json.dumps(entry) for entry in entries])
+        self.assertEqual(201, response.status_code)
+        result = json.loads(response.data)
+        self.assertEqual({'words': 2, 'definition_templates': 1, 'definition_fillers': 2}, result.get('imported'))
+        self.assertEqual([], result.get('errors'))
+
+        # Make sure the words, definition templates and fillers were actually saved to the database
+        words = WordsService.get_instance().get_list(after_id=self.last_word_id)
+        self.assertEqual(['foo', 'qux'], [word.get_lexeme_form() for word in words])
+        self.assertTrue(all(word.get_is_active() for word in words))
+        definition_templates = DefinitionTemplatesService.get_instance().get_list_by_word(words[0].get_id())
+        self.assertEqual(1, len(definition_templates))
+        self.assertEqual(['adjective', 'noun'], definition_templates[0].get_filler_lexical_classes())
+        definition_fillers = DefinitionFillersService.get_instance().get_list_by_definition_template(
+            definition_templates[0].get_id()
+        )
+        self.assertEqual([['small', 'bar'], ['large', 'baz']], [filler.get_filler() for filler in definition_fillers])
+        self.assertEqual([True, False], [filler.get_is_dictionary() for filler in definition_fillers])
+
+    def test_import_creates_words_from_csv(self):
+        rows = [
+            'lexeme_form,lexical_class,definition,filler_lexical_classes,filler,is_dictionary',
+            'foo,noun,a {} {},adjective|noun,small|bar,true',
+            'foo,noun,a {} {},adjective|noun,large|baz,false',
+            'foo,noun,to {},verb,,',
+            'qux,verb,,,,'
+        ]
+        with self.assertNumQueries(self.get_import_queries(6)):
+            response = self.post_import(rows, 'text/csv')
+        self.assertEqual(201, response.status_code)
+        result = json.loads(response.data)
+        self.assertEqual({'words': 2, 'definition_templates': 2, 'definition_fillers': 2}, result.get('imported'))
+        self.assertEqual([], result.get('errors'))
+
+    def test_import_skips_invalid_entries(self):
+        lines = [
+            json.dumps({'lexeme_form': 'foo', 'lexical_class': 'noun'}),
+            'not json',
+            json.dumps({'lexeme_form': 'bar', 'lexical_class': 'not a lexical class'}),
+            json.dumps({
+                'lexeme_form': 'baz',
+                'lexical_class': 'noun',
+                'definition_templates': [{'definition': 'a {}', 'filler_lexical_classes': ['noun', 'noun']}]
+            }),
+            json.dumps({
+                'lexeme_form': 'qux',
+                'lexical_class': 'noun',
+                'definition_templates': [
+                    {
+                        'definition': 'a {}',
+                        'filler_lexical_classes': ['noun'],
+                        'definition_fillers': [{'filler': ['one', 'two']}]
+                    }
+                ]
+            })
+        ]
+        response = self.post_import(lines)
+        self.assertEqual(201, response.status_code)
+        result = json.loads(response.data)
+        self.assertEqual({'words': 1, 'definition_templates': 0, 'definition_fillers': 0}, result.get('imported'))
+        self.assertEqual([2, 3, 4, 5], [error.get('line') for error in result.get('errors')])
+        self.assertIsNotNone(result.get('errors')[1].get('errors').get('AttributeError'))
+
+    def test_import_errors_for_unauthenticated_player(self):
+        response = self.post_import(
+            [json.dumps({'lexeme_form': 'foo', 'lexical_class': 'noun'})], query_string={'auth_token': 'invalid'}
+        )
+        self.assertEqual(422, response.status_code)
+        self.assertIsNotNone(json.loads(response.data).get('errors').get('UnauthorizedAccess'))
+        self.assertEqual([], WordsService.get_instance().get_list(after_id=self.last_word_id))
+
+    def test_import_parses_dictionary_flags(self):
+        fillers = [
+            {'filler': ['small', 'bar'], 'is_dictionary': 'false'},
+            {'filler': ['large', 'baz'], 'is_dictionary': 'true'},
+            {'filler': ['round', 'qux'], 'is_dictionary': 0},
+            {'filler': ['square', 'quux']}
+        ]
+        entry = {
+            'lexeme_form': 'foo',
+            'lexical_class': 'noun',
+            'definition_templates': [
+                {
+                    'definition': 'a {} {}',
+                    'filler_lexical_classes': ['adjective', 'noun'],
+                    'definition_fillers': fillers
+                }
+            ]
+        }
+        response = self.post_import([json.dumps(entry)])
+        self.assertEqual(201, response.status_code)
+        self.assertEqual([], json.loads(response.data).get('errors'))
+
+        word = WordsService.get_instance().get_list(after_id=self.last_word_id)[0]
+        definition_template = DefinitionTemplatesService.get_instance().get_list_by_word(word.get_id())[0]
+        definition_fillers = DefinitionFillersService.get_instance().get_list_by_definition_template(
+            definition_template.get_id()
+        )
+        self.assertEqual([False, True, False, False], [filler.get_is_dictionary() for filler in definition_fillers])
+
+    def test_import_skips_entries_with_invalid_dictionary_flag(self):
+        entry = {
+            'lexeme_form': 'foo',
+            'lexical_class': 'noun',
+            'definition_templates': [
+                {
+                    'definition': 'a {}',
+                    'filler_lexical_classes': ['noun'],
+                    'definition_fillers': [{'filler': ['bar'], 'is_dictionary': 'maybe'}]
+                }
+            ]
+        }
+        response = self.post_import([json.dumps(entry)])
+        self.assertEqual(201, response.status_code)
+        result = json.loads(response.data)
+        self.assertEqual({'words': 0, 'definition_templates': 0, 'definition_fillers': 0}, result.get('imported'))
+        self.assertIsNotNone(result.get('errors')[0].get('errors').get('ValueError'))
+
+    def fail_on_filler(self, failing_filler):
+        """Fail the batch with the filler once its words and templates have been written, when its fillers are"""
+        insert_rows = DictionaryImportService.insert_rows
+        self.addCleanup(setattr, DictionaryImportService, 'insert_rows', insert_rows)
+
+        def fail_on_fillers(service, table, rows, batch_size, sequential_ids):
+            if table is DefinitionFiller.__table__ and any(row['_filler'] == failing_filler for row in rows):
+                raise ValueError('Unable to insert the definition fillers')
+            return insert_rows(service, table, rows, batch_size, sequential_ids)
+
+        DictionaryImportService.insert_rows = fail_on_fillers
+
+    @staticmethod
+    def get_filled_entry(lexeme_form, filler):
+        return {
+            'lexeme_form': lexeme_form,
+            'lexical_class': 'noun',
+            'definition_templates': [
+                {'definition': 'a {}', 'filler_lexical_classes': ['noun'], 'definition_fillers': [{'filler': filler}]}
+            ]
+        }
+
+    def test_import_is_rolled_back_when_it_fails(self):
+        self.fail_on_filler(['bar'])
+
+        response = self.post_import([
+            json.dumps(self.get_filled_entry('foo', ['bar'])),
+            json.dumps({'lexeme_form': 'qux', 'lexical_class': 'verb'})
+        ])
+        self.assertEqual(422, response.status_code)
+        result = json.loads(response.data)
+        self.assertEqual({'words': 0, 'definition_templates': 0, 'definition_fillers': 0}, result.get('imported'))
+        self.assertEqual(1, len(result.get('errors')))
+        self.assertEqual([1, 2], result.get('errors')[0].get('lines'))
+        self.assertIsNotNone(result.get('errors')[0].get('errors').get('ValueError'))
+        self.assertEqual([], WordsService.get_instance().get_list(after_id=self.last_word_id))
+
+    def test_import_keeps_batches_committed_before_failed_batch(self):
+        self.fail_on_filler(['baz'])
+
+        lines = [
+            json.dumps(self.get_filled_entry('foo', ['bar'])),
+            'not json',
+            json.dumps(self.get_filled_entry('qux', ['baz'])),
+            json.dumps({'lexeme_form': 'quux', 'lexical_class': 'verb'})
+        ]
+        imported, errors = DictionaryImportService.get_instance().import_lines(lines, batch_size=1)
+        self.assertEqual({'words': 1, 'definition_templates': 1, 'definition_fillers': 1}, imported)
+        self.assertEqual([2, None], [error.get('line') for error in errors])
+        self.assertEqual([3, 3], errors[1].get('lines'))
+        self.assertTrue(DictionaryImportService.has_failed_batch(errors))
+
+        # The first batch was committed, the failed one rolled back, and the import stopped before the last
+        words = WordsService.get_instance().get_list(after_id=self.last_word_id)
+        self.assertEqual(['foo'], [word.get_lexeme_form() for word in words])
+
+    def test_import_within_unit_of_work_is_rolled_back_as_a_whole(self):
+        self.fail_on_filler(['baz'])
+
+        lines = [json.dumps(self.get_filled_entry('foo', ['bar'])), json.dumps(self.get_filled_entry('qux', ['baz']))]
+        with self.assertRaises(ValueError):
+            with UnitOfWork():
+                DictionaryImportService.get_instance().import_lines(lines, batch_size=1)
+
+        self.assertEqual([], WordsService.get_instance().get_list(after_id=self.last_word_id))
+
+
 class WordsShow(NoAuthTest):
 
     def test_show_errors_for_nonexistent_word(self):
         word_id = self.NUM_WORDS + 1
         show_url = '/words/{}'.format(word_id)
-        response = self.get(show_url)
+        with self.assertNumQueries(1):
+            response = self.get(show_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -190,9 +505,17 @@ class WordsShow(NoAuthTest):
         self.assertIsNotNone(errors.get('inputs'))
         self.assertEqual(word_id, errors.get('inputs').get('id'))
 
+    def test_get_many_returns_words_in_requested_order(self):
+        word_ids = [word.get_id() for word in reversed(WordsService.get_instance().get_list())]
+        missing_id = max(word_ids) + 1
+        words, missing_ids = WordsService.get_instance().get_many(word_ids + [missing_id])
+        self.assertEqual(word_ids, [word.get_id() for word in words])
+        self.assertEqual([missing_id], missing_ids)
+
     def test_show_returns_word(self):
         show_url = '/words/{}'.format(self.word.get_id())
-        response = self.get(show_url)
+        with self.assertNumQueries(0):
+            response = self.get(show_url)
         self.assertEqual(200, response.status_code)
         word = json.loads(response.data)
         self.assertEqual(self.word.get_id(), word.get('id'))
@@ -212,7 +535,8 @@ class WordsUpdate(NoAuthTest):
         word_data = {
             'is_active': is_active
         }
-        response = self.put(update_url, data=word_data)
+        with self.assertNumQueries(1):
+            response = self.put(update_url, data=word_data)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -226,7 +550,8 @@ class WordsUpdate(NoAuthTest):
         word_data = {
             'is_active': is_active
         }
-        response = self.put(update_url, data=word_data)
+        with self.assertNumQueries(2):
+            response = self.put(update_url, data=word_data)
         self.assertEqual(200, response.status_code)
         word = json.loads(response.data)
         self.assertIsNotNone(word.get('id'))
@@ -253,7 +578,8 @@ class WordsUpdate(NoAuthTest):
             'lexeme_form': lexeme_form,
             'lexical_class': lexical_class
         }
-        response = self.put(update_url, data=word_data)
+        with self.assertNumQueries(4):
+            response = self.put(update_url, data=word_data)
         self.assertEqual(200, response.status_code)
         word = json.loads(response.data)
         self.assertIsNotNone(word.get('id'))
@@ -280,10 +606,25 @@ class WordsUpdate(NoAuthTest):
 
 class WordsDelete(NoAuthTest):
 
+    def test_delete_replaces_cached_serialized_word(self):
+        show_url = '/words/{}'.format(self.word.get_id())
+        with self.assertNumQueries(0):
+            response = self.get(show_url)
+        self.assertEqual(True, json.loads(response.data).get('is_active'))
+
+        # The word is saved within the same second it was cached, so its modification date may not change
+        with self.assertNumQueries(3):
+            response = self.delete(show_url)
+        self.assertEqual(200, response.status_code)
+        with self.assertNumQueries(1):
+            response = self.get(show_url)
+        self.assertEqual(False, json.loads(response.data).get('is_active'))
+
     def test_delete_errors_for_nonexistent_word(self):
         word_id = self.NUM_WORDS + 1
         delete_url = '/words/{}'.format(word_id)
-        response = self.delete(delete_url)
+        with self.assertNumQueries(1):
+            response = self.delete(delete_url)
         self.assertEqual(422, response.status_code)
         errors = json.loads(response.data)
         self.assertIsNotNone(errors.get('errors'))
@@ -294,7 +635,8 @@ class WordsDelete(NoAuthTest):
     def test_delete_deletes_word(self):
         delete_url = '/words/{}'.format(self.word.get_id())
         self.assertEqual(True, self.word.get_is_active())
-        response = self.delete(delete_url)
+        with self.assertNumQueries(2):
+            response = self.delete(delete_url)
         self.assertEqual(200, response.status_code)
         word = json.loads(response.data)
         self.assertIsNotNone(word.get('id'))
@@ -314,6 +656,72 @@ class WordsDelete(NoAuthTest):
         self.assertEqual(saved_word.get_is_active(), word.get('is_active'))
 
 
+class WordsNewForMatch(NoAuthTest):
+    # Words added to the dummy words, every other one of which is deactivated so the ids of the eligible words
+    # are spread unevenly
+    NUM_NEW_WORDS = 10
+
+    def setUp(self):
+        super(WordsNewForMatch, self).setUp()
+        self.match = Match(self.game, self.player)
+        self.match.save()
+
+        for i in range(self.NUM_NEW_WORDS):
+            word = Word('sample{}'.format(i), 'noun')
+            word.set_is_active(i % 2 == 0)
+            word.save()
+
+        self.active_word_ids = [word.get_id() for word in Word.query.filter(Word._is_active == True)]
+        self.max_word_id = db.session.query(db.func.max(Word._id)).scalar()
+
+    def use_words(self, word_ids):
+        for word_id in word_ids:
+            Turn(self.match, self.player, WordsService.get_instance().get(word_id)).save()
+
+    def draw_ids(self, *ids):
+        """Make the random ids drawn by the sampling the given ids, repeating the last"""
+        ids = list(ids)
+        self.addCleanup(setattr, random, 'randint', random.randint)
+        random.randint = lambda a, b: ids.pop(0) if len(ids) > 1 else ids[0]
+
+    def test_picks_drawn_eligible_word(self):
+        inactive_id = self.active_word_ids[-1] - 1
+        self.draw_ids(inactive_id, self.active_word_ids[1])
+        self.assertEqual(self.active_word_ids[1], WordsService.get_instance().get_new_word_for_match(
+            self.match.get_id()
+        ).get_id())
+
+    def test_wraps_around_to_words_before_drawn_ids(self):
+        # Only the lowest word is eligible, and every id drawn is above it
+        self.use_words(self.active_word_ids[1:])
+        self.draw_ids(self.max_word_id)
+        self.assertEqual(self.active_word_ids[0], WordsService.get_instance().get_new_word_for_match(
+            self.match.get_id()
+        ).get_id())
+
+    def test_excludes_used_words(self):
+        used_word_ids = self.active_word_ids[:-1]
+        self.use_words(used_word_ids)
+        for _ in range(20):
+            word = WordsService.get_instance().get_new_word_for_match(self.match.get_id())
+            self.assertEqual(self.active_word_ids[-1], word.get_id())
+
+    def test_returns_none_once_used_words_empty_the_pool(self):
+        self.use_words(self.active_word_ids)
+        self.assertIsNone(WordsService.get_instance().get_new_word_for_match(self.match.get_id()))
+
+    def test_picks_every_eligible_word_equally_often(self):
+        random.seed(1)
+        samples = 100 * len(self.active_word_ids)
+        counts = {word_id: 0 for word_id in self.active_word_ids}
+        for _ in range(samples):
+            counts[WordsService.get_instance().get_new_word_for_match(self.match.get_id()).get_id()] += 1
+
+        # A pivot on the ids picks a word after a run of inactive ids about twice as often as the others
+        for word_id, count in counts.items():
+            self.assertTrue(70 <= count <= 130, 'Word {} was picked {} times in {}'.format(word_id, count, samples))
+
+
 def main():
     unittest.main()
 
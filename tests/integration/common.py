@@ -4,6 +4,7 @@ from tests.TestCase import TestCase
 from application import app
 from application.models.Player import Player
 from application.models.Game import Game
+from application.models.UnitOfWork import UnitOfWork
 
 
 def get_incremental_username(increment):
@@ -40,8 +41,13 @@ class NoAuthTest(TestCase):
     def insert_dummy_data(self):
         super(NoAuthTest, self).insert_dummy_data()
 
-        self.insert_dummy_players()
-        self.insert_dummy_games()
+        with UnitOfWork():
+            self.insert_dummy_players()
+            self.insert_dummy_games()
+
+    def get_dummy_data_key(self):
+        # Players are created with an auth token unless signed auth tokens are in use
+        return super(NoAuthTest, self).get_dummy_data_key() + (('AUTH_TOKEN_MODE', app.config.get('AUTH_TOKEN_MODE')),)
 
     def insert_dummy_players(self):
         player = None
@@ -60,13 +66,17 @@ class NoAuthTest(TestCase):
         for game_index in range(1, self.NUM_GAMES + 1):
             name = get_incremental_game_name(game_index)
             description = get_incremental_game_description(game_index)
+            # The dictionary definition, one per player and one generated definition
+            definition_filler_count = None
             if game_index % 2 == 0:
                 match_size = 4
-                large_game = Game(name, description, match_size)
+                definition_filler_count = match_size + 2
+                large_game = Game(name, description, match_size, definition_filler_count)
                 large_game.save()
             else:
                 match_size = 2
-                game = Game(name, description, match_size)
+                definition_filler_count = match_size + 2
+                game = Game(name, description, match_size, definition_filler_count)
                 game.save()
 
         self.game = game
@@ -90,25 +100,30 @@ class NoAuthTest(TestCase):
 
         return headers
 
+    def request(self, method, *args, **kwargs):
+        """Send the request, reading streamed bodies in full, so their queries are counted with the request's"""
+        kwargs['buffered'] = True
+        return method(*args, **kwargs)
+
     def get(self, *args, **kwargs):
         kwargs['query_string'] = self.get_params(kwargs.get('query_string'))
         kwargs['headers'] = self.get_headers(kwargs.get('headers'))
-        return self.client.get(*args, **kwargs)
+        return self.request(self.client.get, *args, **kwargs)
 
     def post(self, *args, **kwargs):
         kwargs['data'] = self.get_data(kwargs.get('data'))
         kwargs['headers'] = self.get_headers(kwargs.get('headers'))
-        return self.client.post(*args, **kwargs)
+        return self.request(self.client.post, *args, **kwargs)
 
     def put(self, *args, **kwargs):
         kwargs['data'] = self.get_data(kwargs.get('data'))
         kwargs['headers'] = self.get_headers(kwargs.get('headers'))
-        return self.client.put(*args, **kwargs)
+        return self.request(self.client.put, *args, **kwargs)
 
     def delete(self, *args, **kwargs):
         kwargs['data'] = self.get_data(kwargs.get('data'))
         kwargs['headers'] = self.get_headers(kwargs.get('headers'))
-        return self.client.delete(*args, **kwargs)
+        return self.request(self.client.delete, *args, **kwargs)
 
 
 class AuthTokenTest(NoAuthTest):
@@ -119,3 +134,14 @@ class AuthTokenTest(NoAuthTest):
 
         # Add auth token to params
         self.params = self.get_params({'auth_token': self.player.get_auth_token()})
+
+
+class SignedAuthTokenTest(AuthTokenTest):
+    def setUp(self):
+        self.auth_token_mode = app.config.get('AUTH_TOKEN_MODE')
+        app.config['AUTH_TOKEN_MODE'] = Player.AUTH_TOKEN_MODE_SIGNED
+        super(SignedAuthTokenTest, self).setUp()
+
+    def tearDown(self):
+        app.config['AUTH_TOKEN_MODE'] = self.auth_token_mode
+        super(SignedAuthTokenTest, self).tearDown()
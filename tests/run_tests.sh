@@ -4,13 +4,59 @@ current_path=`pwd`
 # Add current project path to python path
 export PYTHONPATH="$current_path":$PYTHONPATH
 
-# Run all tests
+# Test files, largest first, so that sharding them round robin spreads the tests evenly across workers
 # TODO replace with loop through all files in integration/unit, skipping 'common'
-APPLICATION_ENV=testing python $current_path/tests/integration/Players.py
-APPLICATION_ENV=testing python $current_path/tests/integration/Games.py
-APPLICATION_ENV=testing python $current_path/tests/integration/DefinitionFillers.py
-APPLICATION_ENV=testing python $current_path/tests/integration/DefinitionTemplates.py
-APPLICATION_ENV=testing python $current_path/tests/integration/Words.py
+test_files="Players DefinitionFillers DefinitionTemplates Games Words QueryPlans ColumnTypes Matches Turns Instrumentation"
+
+# Number of processes to shard the test files across, each with its own worker id and test database
+workers=${TEST_WORKERS:-1}
+
+run_worker() {
+    worker_id=$1
+    status=0
+    index=0
+    for test_file in $test_files; do
+        if [ $((index % workers)) -eq $worker_id ]; then
+            if [ $workers -gt 1 ]; then
+                TEST_WORKER_ID=$worker_id APPLICATION_ENV=testing python $current_path/tests/integration/$test_file.py || status=1
+            else
+                APPLICATION_ENV=testing python $current_path/tests/integration/$test_file.py || status=1
+            fi
+        fi
+        index=$((index + 1))
+    done
+    return $status
+}
+
+# Run all tests
+status=0
+if [ $workers -gt 1 ]; then
+    # Run the workers in parallel, printing the output of each once they have all finished
+    log_path=`mktemp -d`
+    pids=""
+    worker_id=0
+    while [ $worker_id -lt $workers ]; do
+        run_worker $worker_id > $log_path/$worker_id.log 2>&1 &
+        pids="$pids $!"
+        worker_id=$((worker_id + 1))
+    done
+
+    for pid in $pids; do
+        wait $pid || status=1
+    done
+
+    worker_id=0
+    while [ $worker_id -lt $workers ]; do
+        echo "Worker $worker_id:"
+        cat $log_path/$worker_id.log
+        worker_id=$((worker_id + 1))
+    done
+    rm -rf $log_path
+else
+    run_worker 0 || status=1
+fi
 
 # Reset the python path
 export PYTHONPATH="$old_python_path"
+
+exit $status
@@ -0,0 +1,5 @@
+# Production WSGI entry point, served by gunicorn with the settings of gunicorn_config.py:
+#   APPLICATION_ENV=production gunicorn -c gunicorn_config.py wsgi:app
+from application import create_app
+
+app = create_app()